@@ -6,11 +6,10 @@ import time
 import numpy as np
 import os
 
-# Import from the modularized backend
-from backend.sound import play_sound_async
-from backend.audio import start_audio_recording, stop_audio_recording_and_process
-from backend.hotkeys import update_hotkey_from_config, start_keyboard_listener
-from backend.ai import load_asr_model, initialize_mistral_client, initialize_gemini_client, transcribe_and_refine_audio_data
+# Only Tk/customtkinter and the lightweight UI modules are imported up front so the
+# window can be drawn immediately. Backend modules that pull in heavy SDKs
+# (NeMo/torch, LLM clients, sounddevice, pynput, pyautogui) are imported inside the
+# methods below, and the slow ones are initialized in background threads.
 
 # Import from the modularized UI
 from ui.drag_handler import on_drag_start, on_drag_motion
@@ -19,10 +18,6 @@ from ui.streaming_widget import StreamingWidget
 
 # Import from the modularized settings
 from settings.config_manager import load_config, save_config
-from settings.settings_window import open_settings_dialog
-
-# Image handling for icons
-from PIL import Image
 
 # --- Global Constants ---
 ASSETS_DIR = "assets"
@@ -61,7 +56,6 @@ class AxoApp:
         self.current_state = "loading_model"
         self.animation_step = 0
         self.is_window_visible = True
-        self.current_normalized_amplitude = 0.0
         self.num_audio_bars = 9
         self.bar_target_heights = np.zeros(self.num_audio_bars)
         self.bar_current_heights = np.zeros(self.num_audio_bars)
@@ -70,15 +64,10 @@ class AxoApp:
         self.mistral_api_key = self.config.get("api_keys", {}).get("mistral")
         self.gemini_api_key = self.config.get("api_keys", {}).get("gemini")
 
+        # LLM clients are created in background threads once the window is up
         self.mistral_client = None
-        initialize_mistral_client(self)
-
         self.gemini_model_instance = None
-        initialize_gemini_client(self)
-
-        # Initialize Ollama manager
-        from backend.ai import initialize_ollama_manager
-        initialize_ollama_manager(self)
+        self.llm_providers = {}
 
         try:
             current_theme = ctk.ThemeManager.get_theme()
@@ -102,13 +91,16 @@ class AxoApp:
         self._update_ui_elements()
 
         self.asr_model = None
+        self.asr_load_metrics = {}
+        self.asr_residency = None
         self.is_recording = False
-        self.audio_frames = []
         self.audio_stream = None
+        self.streaming_transcriber = None
+        self.speculative_refiner = None
+        self.spectral_visualizer = None
         self.model_loaded_event = threading.Event()
 
         self.currently_pressed_keys = set()
-        self._update_hotkey_from_config()
         self.settings_hotkey_char = 'h'
         self.hotkey_active_for_release = False
         self.settings_window = None
@@ -131,9 +123,18 @@ class AxoApp:
             widget_to_bind.bind("<ButtonPress-1>", self._on_drag_start)
             widget_to_bind.bind("<B1-Motion>", self._on_drag_motion)
 
+        # Start the heavy subsystems only after the first frame has been drawn
+        self.master.after_idle(self._start_background_initialization)
+
+    def _start_background_initialization(self):
+        """Load the ASR model, LLM clients and the hotkey listener concurrently."""
+        from backend.ai import initialize_mistral_client, initialize_gemini_client, initialize_ollama_manager
+
         print("Loading ASR model...")
         threading.Thread(target=self._load_asr_model, daemon=True).start()
         threading.Thread(target=self._start_keyboard_listener, daemon=True).start()
+        for initializer in (initialize_mistral_client, initialize_gemini_client, initialize_ollama_manager):
+            threading.Thread(target=initializer, args=(self,), daemon=True).start()
 
     def _on_drag_start(self, event):
         on_drag_start(self, event)
@@ -145,28 +146,36 @@ class AxoApp:
         save_config(self)
 
     def _play_sound_async(self, sound_file_name_only):
+        from backend.sound import play_sound_async
         play_sound_async(sound_file_name_only)
 
     def _update_hotkey_from_config(self):
+        from backend.hotkeys import update_hotkey_from_config
         update_hotkey_from_config(self)
 
     def _start_keyboard_listener(self):
+        from backend.hotkeys import start_keyboard_listener
+        self._update_hotkey_from_config()
         start_keyboard_listener(self)
 
     def _update_ui_elements(self):
         update_ui_elements(self)
 
     def _load_asr_model(self):
+        from backend.ai import load_asr_model
         load_asr_model(self)
 
     def _start_audio_recording(self):
+        from backend.audio import start_audio_recording
         start_audio_recording(self)
 
     def _stop_audio_recording_and_process(self):
+        from backend.audio import stop_audio_recording_and_process
         stop_audio_recording_and_process(self)
 
-    def start_transcription_thread(self, frames_to_process):
-        threading.Thread(target=transcribe_and_refine_audio_data, args=(self, frames_to_process), daemon=True).start()
+    def start_transcription_thread(self, audio_data):
+        from backend.ai import transcribe_and_refine_audio_data
+        threading.Thread(target=transcribe_and_refine_audio_data, args=(self, audio_data), daemon=True).start()
 
     def _trigger_recording_start(self):
         if not self.master.winfo_viewable(): self.master.deiconify()
@@ -210,6 +219,7 @@ class AxoApp:
             print("UI Shown.")
 
     def _open_settings_dialog(self):
+        from settings.settings_window import open_settings_dialog
         open_settings_dialog(self)
 
 if __name__ == "__main__":
@@ -1,300 +1,488 @@
-import nemo.collections.asr as nemo_asr
-from mistralai import Mistral
-import google.generativeai as genai
+# Heavy SDKs (NeMo, mistralai, google.generativeai, pyautogui, pyperclip) are
+# imported where they are first used so importing this module stays cheap.
 import numpy as np
-import wave
-import pyperclip
-import pyautogui
 import time
 import os
 import json
 import re
 from typing import Generator, Dict, Any, Optional, List
 import threading
-from .prompts import get_prompt_instructions, generate_dynamic_prompt as generate_prompt_template
+from .vad import DEFAULT_THRESHOLD_DB, speech_segments, trim_silence
+from .model_cache import load_asr_model_cached, populate_cache
+from .metrics import latency
+from .output_sink import IncrementalPasteSink, incremental_output_enabled, stream_to_focused_window, untyped_remainder
+from .llm_providers import (
+    DEFAULT_MISTRAL_MODEL_NAME, DEFAULT_GEMINI_MODEL_NAME, MistralProvider, GeminiProvider, OllamaProvider,
+    register_provider, unregister_provider, get_provider, services_in_use, refine_transcript, stream_refinement
+)
 
 MODEL_NAME = "nvidia/parakeet-tdt-0.6b-v3" # "nvidia/parakeet-tdt-0.6b-v2"
 ASSETS_DIR = "assets"
-TEMP_AUDIO_FILENAME = os.path.join(ASSETS_DIR, "temp_axo_audio.wav")
 SAMPLE_RATE = 16000
 CHANNELS = 1
-DEFAULT_MISTRAL_MODEL_NAME = "mistral-medium-latest"
-DEFAULT_GEMINI_MODEL_NAME = "gemini-2.0-flash"
+# Serializes initialize_ollama_manager() between the startup thread, dictations and the settings window
+_ollama_init_lock = threading.Lock()
 
 def initialize_mistral_client(app):
     config_models = app.config.get("models_config", {})
-    text_processing_service = config_models.get("text_processing_service")
     current_mistral_key = app.config.get("api_keys", {}).get("mistral")
 
-    if text_processing_service == "Mistral" and current_mistral_key:
-        if not app.mistral_client or getattr(app.mistral_client, 'api_key', None) != current_mistral_key:
+    if "Mistral" in services_in_use(app) and current_mistral_key:
+        provider = get_provider(app, "Mistral")
+        if not app.mistral_client or provider is None or provider.api_key != current_mistral_key:
             try:
-                app.mistral_client = Mistral(api_key=current_mistral_key)
+                provider = MistralProvider(current_mistral_key, config_models.get("mistral_model_name", DEFAULT_MISTRAL_MODEL_NAME))
+                register_provider(app, provider)
+                app.mistral_client = provider.client
                 print(f"Mistral client initialized/re-initialized.")
             except Exception as e:
                 print(f"Error initializing Mistral client: {e}")
                 app.mistral_client = None
+                unregister_provider(app, "Mistral")
     else:
         if app.mistral_client:
             print("Mistral service not selected or API key removed. De-initializing Mistral client.")
         app.mistral_client = None
+        unregister_provider(app, "Mistral")
 
 def initialize_gemini_client(app):
     config_models = app.config.get("models_config", {})
-    text_processing_service = config_models.get("text_processing_service")
     current_gemini_key = app.config.get("api_keys", {}).get("gemini")
     gemini_model_name = config_models.get("gemini_model_name", DEFAULT_GEMINI_MODEL_NAME)
 
-    if text_processing_service == "Gemini" and current_gemini_key:
-        current_internal_model_name = app.gemini_model_instance.model_name if app.gemini_model_instance else None
-        if not app.gemini_model_instance or current_internal_model_name != gemini_model_name:
+    if "Gemini" in services_in_use(app) and current_gemini_key:
+        provider = get_provider(app, "Gemini")
+        if (not app.gemini_model_instance or provider is None or provider.model_name != gemini_model_name
+                or provider.api_key != current_gemini_key):
             try:
-                genai.configure(api_key=current_gemini_key)
-                safety_settings = [
-                    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
-                    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
-                    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
-                    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
-                ]
-                app.gemini_model_instance = genai.GenerativeModel(
-                    model_name=gemini_model_name,
-                    safety_settings=safety_settings
+                cache_config = app.config.get("provider_cache_config", {})
+                provider = GeminiProvider(
+                    current_gemini_key, gemini_model_name,
+                    context_cache=cache_config.get("gemini_context_cache", False),
+                    cache_ttl_minutes=cache_config.get("gemini_cache_ttl_minutes", 60)
                 )
+                register_provider(app, provider)
+                app.gemini_model_instance = provider.model
                 print(f"Gemini client initialized/re-initialized with model: {gemini_model_name}.")
             except Exception as e:
                 print(f"Error initializing Gemini client with model {gemini_model_name}: {e}")
                 app.gemini_model_instance = None
+                unregister_provider(app, "Gemini")
     else:
         if app.gemini_model_instance:
             print("Gemini service not selected or API key removed. De-initializing Gemini client.")
         app.gemini_model_instance = None
+        unregister_provider(app, "Gemini")
+
+
+def load_asr_backend(app):
+    """
+    Attach the configured inference backend to the loaded NeMo model.
+
+    "nemo" runs the PyTorch model directly; "onnx" runs an int8-quantized
+    ONNX export through onnxruntime (CPU-only machines). Falls back to NeMo
+    if the ONNX backend cannot be set up.
+    """
+    asr_config = app.config.get("asr_config", {})
+    app.asr_backend = None
+    if asr_config.get("backend", "nemo") == "onnx":
+        try:
+            from .asr_onnx import OnnxParakeetBackend
+            app.asr_backend = OnnxParakeetBackend.load(
+                app.asr_model, MODEL_NAME,
+                intra_op_threads=asr_config.get("onnx_intra_op_threads") or None
+            )
+            print("Using ONNX Runtime (int8) ASR backend.")
+        except Exception as e:
+            print(f"Could not initialize ONNX ASR backend, using NeMo: {e}")
+            app.asr_backend = None
+
+
+class ASRResidencyManager:
+    """
+    Keeps the ASR model warm while Axo is in use and gives its memory back when idle.
+
+    After load, a synthetic utterance is decoded once so CUDA/cuDNN autotuning
+    and lazy allocations happen before the first real dictation. When no
+    transcription has run for idle_offload_minutes, the model is moved from the
+    GPU to system RAM, or, when it already runs on the CPU, released entirely
+    and later restored from the local model cache. prefetch() starts bringing
+    it back as soon as the hotkey modifiers are pressed; ensure_resident()
+    blocks until it is usable again. An offload waits for a model cache write
+    in progress (save_to_cache()), which reads the weights in place.
+    """
+
+    RESIDENT, OFFLOADED, RELEASED = "resident", "offloaded", "released"
+
+    def __init__(self, app):
+        residency_config = app.config.get("residency_config", {})
+        self.app = app
+        self.idle_offload_seconds = float(residency_config.get("idle_offload_minutes", 15)) * 60
+        self.release_on_cpu = residency_config.get("release_on_cpu", True)
+        self.home_device = app.asr_model.device
+        self.state = self.RESIDENT
+        self.last_used = time.monotonic()
+        self._lock = threading.Lock()
+        self._prefetch_thread: Optional[threading.Thread] = None
+        # Cleared while save_to_cache() writes the model out
+        self._save_done = threading.Event()
+        self._save_done.set()
+
+    def warm_up(self):
+        """Decode one second of synthetic low-level noise to prime kernels and allocators."""
+        started = time.perf_counter()
+        try:
+            synthetic = (np.random.default_rng(0).standard_normal(SAMPLE_RATE) * 0.01).astype(np.float32)
+            run_asr(self.app, [synthetic])
+            self.app.asr_load_metrics["warmup_seconds"] = time.perf_counter() - started
+            print(f"ASR warm-up finished in {self.app.asr_load_metrics['warmup_seconds']:.2f}s.")
+        except Exception as e:
+            print(f"ASR warm-up failed (first dictation may be slower): {e}")
+
+    def start(self):
+        """Start the idle monitor (no-op if idle offloading is disabled)."""
+        if self.idle_offload_seconds > 0:
+            threading.Thread(target=self._monitor_idle, daemon=True).start()
+
+    def _monitor_idle(self):
+        check_interval = min(60.0, max(1.0, self.idle_offload_seconds / 10))
+        while True:
+            time.sleep(check_interval)
+            idle_seconds = time.monotonic() - self.last_used
+            if (self.state == self.RESIDENT and idle_seconds >= self.idle_offload_seconds
+                    and not self.app.is_recording and self.app.current_state == "initial"):
+                self.offload()
+
+    def offload(self):
+        with self._lock:
+            # Moving or releasing the weights under a running save_to() would corrupt the cache entry
+            self._save_done.wait()
+            # A transcription may have started since the idle monitor looked
+            if self.state != self.RESIDENT or time.monotonic() - self.last_used < self.idle_offload_seconds:
+                return
+            app = self.app
+            try:
+                if self.home_device.type == "cuda":
+                    import torch
+                    app.asr_model.to("cpu")
+                    torch.cuda.empty_cache()
+                    self.state = self.OFFLOADED
+                    print("ASR model idle: moved from GPU to system memory.")
+                elif self.release_on_cpu:
+                    import gc
+                    app.asr_backend = None
+                    app.asr_model = None
+                    gc.collect()
+                    self.state = self.RELEASED
+                    print("ASR model idle: released from memory (will reload from cache).")
+            except Exception as e:
+                print(f"Error offloading ASR model: {e}")
+
+    def ensure_resident(self):
+        """Bring the model back if it was offloaded; blocks until it can transcribe."""
+        with self._lock:
+            # Checked under the lock so an idle offload cannot run in between
+            self.last_used = time.monotonic()
+            if self.state == self.RESIDENT:
+                return
+            app = self.app
+            started = time.perf_counter()
+            if self.state == self.OFFLOADED:
+                app.asr_model.to(self.home_device)
+            else:
+                app.asr_model, _ = load_asr_model_cached(MODEL_NAME)
+                load_asr_backend(app)
+            self.state = self.RESIDENT
+            self.last_used = time.monotonic()
+            print(f"ASR model made resident again in {time.perf_counter() - started:.2f}s.")
+
+    def save_to_cache(self, model_name: str):
+        """Write the resident model to the local model cache; offloads wait until it is done."""
+        with self._lock:
+            if self.state != self.RESIDENT:
+                return
+            self._save_done.clear()
+            model = self.app.asr_model
+        try:
+            populate_cache(model, model_name)
+        finally:
+            self._save_done.set()
+
+    def prefetch(self):
+        """Start restoring an offloaded model in the background (hotkey modifiers pressed)."""
+        if self.state == self.RESIDENT:
+            return
+        if self._prefetch_thread is not None and self._prefetch_thread.is_alive():
+            return
+        self._prefetch_thread = threading.Thread(target=self.ensure_resident, daemon=True)
+        self._prefetch_thread.start()
 
 
 def load_asr_model(app):
     try:
-        app.asr_model = nemo_asr.models.ASRModel.from_pretrained(MODEL_NAME)
-        app.model_loaded_event.set(); print("ASR model loaded successfully.")
+        app.asr_model, app.asr_load_metrics = load_asr_model_cached(MODEL_NAME)
+        load_asr_backend(app)
+        app.asr_residency = ASRResidencyManager(app)
+        if app.config.get("residency_config", {}).get("warmup", True):
+            app.asr_residency.warm_up()
+        app.model_loaded_event.set()
+        print(f"ASR model loaded successfully from {app.asr_load_metrics['source']} "
+              f"in {app.asr_load_metrics['load_seconds']:.1f}s.")
         app.current_state = "initial"
         app.master.after(0, app._update_ui_elements)
+        app.asr_residency.start()
+        if app.asr_load_metrics["source"] != "cache":
+            # Write the cache after the app is usable so the first launch is not slowed down further
+            threading.Thread(target=app.asr_residency.save_to_cache, args=(MODEL_NAME,), daemon=True).start()
     except Exception as e:
         print(f"Error loading ASR model: {e}"); app.current_state = "error_loading"
         app.master.after(0, app._update_ui_elements)
 
-# get_prompt_instructions function moved to backend/prompts.py
+def audio_to_float32(audio_data: np.ndarray) -> np.ndarray:
+    """Convert a captured int16/float32 buffer to the mono float32 [-1, 1] signal NeMo expects."""
+    if audio_data.ndim > 1:
+        audio_data = audio_data.mean(axis=1) if audio_data.shape[1] > 1 else audio_data.reshape(-1)
+    if audio_data.dtype == np.int16:
+        return audio_data.astype(np.float32) / 32768.0
+    return audio_data.astype(np.float32, copy=False)
+
+def _hypothesis_text(actual_result_item) -> str:
+    """Text of a single NeMo result item (plain string or Hypothesis)."""
+    if isinstance(actual_result_item, str):
+        return actual_result_item
+    elif hasattr(actual_result_item, 'text') and isinstance(getattr(actual_result_item, 'text'), str):
+        return actual_result_item.text
+    elif actual_result_item is None: return ""
+    else: print(f"ASR: Unexpected type for NeMo's result item: {type(actual_result_item)}")
+    return ""
+
+def run_asr(app, signals: List[np.ndarray], batch_size: int = 1) -> List[str]:
+    """Decode float32 signals with the active ASR backend; one string per signal."""
+    residency = getattr(app, 'asr_residency', None)
+    if residency is not None:
+        residency.ensure_resident()
+    if getattr(app, 'asr_backend', None) is not None:
+        return app.asr_backend.transcribe(signals)
+    results = app.asr_model.transcribe(signals, batch_size=batch_size, verbose=False)
+    if isinstance(results, tuple):
+        # Older RNNT transcribe() returns (best_hypotheses, all_hypotheses)
+        results = results[0]
+    if not isinstance(results, list) or len(results) != len(signals):
+        print(f"ASR: NeMo transcribe returned unexpected structure: {type(results)}")
+        return [""] * len(signals)
+    return [_hypothesis_text(item) for item in results]
+
+def transcribe_audio_array(app, audio_data: np.ndarray) -> str:
+    """
+    Transcribe an in-memory audio buffer without a temporary WAV file.
 
-# generate_dynamic_prompt function moved to backend/prompts.py
+    The buffer is handed to NeMo as a float32 array, so nothing touches the disk
+    and concurrent dictations cannot clobber each other's input.
 
-def process_text_with_mistral(app, text):
-    """Process text with Mistral API with robust error handling."""
-    # Input validation
-    if not app.mistral_client:
-        print("Mistral client not initialized. Skipping text refinement.")
-        return text
-    if not text or not text.strip():
-        print("No text from ASR to refine.")
+    Args:
+        app: The application instance
+        audio_data: Mono int16 or float32 samples at SAMPLE_RATE
+
+    Returns:
+        str: The transcribed text ("" if nothing was recognised)
+    """
+    residency = getattr(app, 'asr_residency', None)
+    if residency is not None:
+        # An idle-released model is reloaded here rather than reported as missing
+        residency.ensure_resident()
+    if not app.asr_model:
+        print("ASR model not available. Transcription skipped.")
         return ""
 
-    print("Refining text with Mistral...")
+    asr_config = app.config.get("asr_config", {})
+    if len(audio_data) > SAMPLE_RATE * asr_config.get("long_form_threshold_seconds", 60):
+        transcribed_text = transcribe_long_audio(app, audio_data)
+    else:
+        print("Transcribing audio with NeMo...")
+        transcribed_text = run_asr(app, [audio_to_float32(audio_data)])[0]
 
-    try:
-        # Get configuration with safe defaults
-        model_name = app.config.get("models_config", {}).get("mistral_model_name", DEFAULT_MISTRAL_MODEL_NAME)
-        language_code = app.config.get("language_config", {}).get("target_language", "en")
-        preserve_original_languages = app.config.get("language_config", {}).get("preserve_original_languages", True)
-        mode = app.config.get("mode_config", {}).get("operation_mode", "typer")
+    if transcribed_text: print(f"ASR Transcription: {transcribed_text}")
+    else: print("ASR Transcription by NeMo resulted in empty text.")
+    return transcribed_text
 
-        # Get prompts with error handling
-        try:
-            system_prompt, mode_instructions = get_prompt_instructions(mode, language_code, preserve_original_languages)
-        except Exception as e:
-            print(f"Error getting prompt instructions: {e}")
-            return text
+def plan_long_form_chunks(audio_data: np.ndarray, chunk_seconds: float, overlap_seconds: float) -> List[tuple]:
+    """
+    Split a long recording into overlapping (start, end) sample ranges.
 
-        # Build messages
-        if preserve_original_languages:
-            header_note = "to be processed while preserving original languages"
-        else:
-            header_note = f"to be processed into target language: {language_code}"
+    Each chunk is cut at the last pause (midpoint between two VAD speech
+    segments) in the second half of the chunk window; only when no pause is
+    available is the chunk cut hard at the window end. Consecutive chunks
+    overlap by overlap_seconds so words at the boundary are decoded twice and
+    can be de-duplicated when merging.
+    """
+    total = len(audio_data)
+    chunk_samples = int(SAMPLE_RATE * chunk_seconds)
+    overlap_samples = int(SAMPLE_RATE * overlap_seconds)
+    segments = speech_segments(audio_data)
+    pauses = np.array([(prev_end + next_start) // 2 for (_, prev_end), (next_start, _) in zip(segments, segments[1:])], dtype=np.int64)
+
+    chunks = []
+    start = 0
+    while start < total:
+        window_end = start + chunk_samples
+        if window_end >= total:
+            chunks.append((start, total))
+            break
+        candidates = pauses[(pauses > start + chunk_samples // 2) & (pauses <= window_end)]
+        end = int(candidates[-1]) if candidates.size else window_end
+        chunks.append((start, end))
+        start = max(end - overlap_samples, start + 1)
+    return chunks
+
+def merge_chunk_transcripts(chunk_texts: List[str], max_overlap_words: int = 8) -> str:
+    """
+    Join chunk hypotheses, dropping words repeated because of chunk overlap.
 
-        user_content_header = f"--- BEGIN RAW ASR TRANSCRIPTION ({header_note}) ---"
-        user_content_footer = "--- END RAW ASR TRANSCRIPTION ---"
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": f"{mode_instructions}\n\n{user_content_header}\n{text}\n{user_content_footer}"}
-        ]
+    The longest run of words (up to max_overlap_words) that ends the merged
+    text and starts the next chunk, compared case- and punctuation-insensitively,
+    is kept only once.
+    """
+    def normalize(word):
+        return re.sub(r"[^\w']", "", word.lower())
+
+    merged_words: List[str] = []
+    for text in chunk_texts:
+        words = text.split()
+        if not words:
+            continue
+        overlap = 0
+        for k in range(min(max_overlap_words, len(words), len(merged_words)), 0, -1):
+            if [normalize(w) for w in merged_words[-k:]] == [normalize(w) for w in words[:k]]:
+                overlap = k
+                break
+        merged_words.extend(words[overlap:])
+    return " ".join(merged_words)
 
-        # API call with error handling
-        try:
-            chat_response = app.mistral_client.chat.complete(
-                model=model_name,
-                messages=messages,
-                temperature=0.05
+def transcribe_long_audio(app, audio_data: np.ndarray) -> str:
+    """
+    Transcribe a long recording in overlapping chunks.
+
+    Chunks are decoded together as a batch, which bounds attention memory to
+    one chunk length per batch item instead of the whole recording. The batch
+    size trades memory for throughput; on CPU the encoder's intra-op threads
+    spread each batch across cores.
+    """
+    asr_config = app.config.get("asr_config", {})
+    chunk_ranges = plan_long_form_chunks(
+        audio_data,
+        asr_config.get("long_form_chunk_seconds", 30),
+        asr_config.get("long_form_overlap_seconds", 1.0)
+    )
+    print(f"Transcribing long audio ({len(audio_data) / SAMPLE_RATE:.0f}s) with NeMo in {len(chunk_ranges)} chunks...")
+    chunk_signals = [audio_to_float32(audio_data[start:end]) for start, end in chunk_ranges]
+    chunk_texts = run_asr(app, chunk_signals, batch_size=asr_config.get("long_form_batch_size", 4))
+    return merge_chunk_transcripts([text.strip() for text in chunk_texts])
+
+def transcribe_recording(app, audio_data: np.ndarray) -> str:
+    """
+    Transcribe a finished recording.
+
+    Voice-activity detection runs first: recordings without speech skip ASR
+    (and therefore the LLM) entirely, and silence is trimmed before decoding.
+    If a StreamingTranscriber already committed part of the recording while the
+    hotkey was held, only the remaining tail is decoded.
+    """
+    streaming_transcriber = getattr(app, 'streaming_transcriber', None)
+    app.streaming_transcriber = None
+
+    vad_config = app.config.get("vad_config", {})
+    if vad_config.get("enabled", True):
+        segments = speech_segments(audio_data, vad_config.get("threshold_db", DEFAULT_THRESHOLD_DB))
+        if not segments:
+            if streaming_transcriber is not None:
+                # Windows committed while recording were decoded already; keep them whatever VAD says
+                print("VAD: No speech detected. Skipping the uncommitted tail.")
+                return streaming_transcriber.finish(audio_data, decode_tail=False)
+            print("VAD: No speech detected. Skipping transcription.")
+            return ""
+        if streaming_transcriber is None:
+            # Committed windows use the original sample offsets, so only trim when nothing was committed yet
+            original_seconds = len(audio_data) / SAMPLE_RATE
+            audio_data = trim_silence(
+                audio_data, segments,
+                padding_ms=vad_config.get("padding_ms", 200),
+                max_pause_ms=vad_config.get("max_pause_ms", 700)
             )
-        except Exception as api_error:
-            print(f"Mistral API call failed: {api_error}")
-            return text
-
-        # Validate response
-        if not chat_response or not hasattr(chat_response, 'choices') or not chat_response.choices:
-            print("Mistral API returned invalid response structure")
-            return text
-
-        choice = chat_response.choices[0]
-        if not hasattr(choice, 'message') or not hasattr(choice.message, 'content'):
-            print("Mistral API response missing content")
-            return text
-
-        refined_text = choice.message.content.strip()
-        if not refined_text:
-            print("Mistral API returned empty response")
-            return text
-
-        # Post-process based on mode
-        try:
-            if mode == "prompt_engineer":
-                if refined_text.startswith("```xml") and refined_text.endswith("```"):
-                    refined_text = refined_text.removeprefix("```xml").removesuffix("```").strip()
-                elif refined_text.startswith("```") and refined_text.endswith("```"):
-                    refined_text_lines = refined_text.splitlines()
-                    if len(refined_text_lines) > 1 and refined_text_lines[0].strip().lower().startswith("xml"):
-                        refined_text = "\n".join(refined_text_lines[1:-1]).strip()
-                    else:
-                         refined_text = refined_text.removeprefix("```").removesuffix("```").strip()
-            elif mode == "email":
-                if refined_text.startswith("```") and refined_text.endswith("```"):
-                    refined_text_lines = refined_text.splitlines()
-                    if len(refined_text_lines) > 1 and refined_text_lines[0].strip().lower() in ["", "text", "email"]:
-                         refined_text = "\n".join(refined_text_lines[1:-1]).strip()
-                    else:
-                         refined_text = refined_text.removeprefix("```").removesuffix("```").strip()
-                if (refined_text.startswith('"') and refined_text.endswith('"')) or \
-                   (refined_text.startswith("'") and refined_text.endswith("'")):
-                    refined_text = refined_text[1:-1]
-            else: # Typer mode
-                if not (refined_text.startswith("+ ") or refined_text.startswith("1.")):
-                    if (refined_text.startswith('"') and refined_text.endswith('"')) or \
-                       (refined_text.startswith("'") and refined_text.endswith("'")):
-                        refined_text = refined_text[1:-1]
-
-            print(f"Mistral refined text (Model: {model_name}, Mode: {mode}, Lang: {language_code}):\n{refined_text}")
-            return refined_text
-
-        except Exception as processing_error:
-            print(f"Error processing Mistral response: {processing_error}")
-            return text
-
-    except Exception as general_error:
-        print(f"Unexpected error in Mistral processing: {general_error}")
-        return text
+            print(f"VAD: Trimmed audio from {original_seconds:.1f}s to {len(audio_data) / SAMPLE_RATE:.1f}s.")
+
+    if streaming_transcriber is not None:
+        return streaming_transcriber.finish(audio_data)
+    return transcribe_audio_array(app, audio_data)
+
+# get_prompt_instructions function moved to backend/prompts.py
+
+# generate_dynamic_prompt function moved to backend/prompts.py
+
+# Prompt assembly and the provider calls live in backend/llm_providers.py
+
+def process_text_with_mistral(app, text):
+    """Refine text with Mistral; returns the input unchanged on failure."""
+    return refine_transcript(app, text, service="Mistral")
+
 
 def process_text_with_gemini(app, text):
-    if not app.gemini_model_instance:
-        print("Gemini client not initialized. Skipping text refinement.")
-        return text
-    if not text.strip():
-        print("No text from ASR to refine.")
-        return ""
-    
-    selected_gemini_model_name = app.config.get("models_config", {}).get("gemini_model_name", DEFAULT_GEMINI_MODEL_NAME)
-    print(f"Refining text with Gemini (Model: {selected_gemini_model_name})...")
+    """Refine text with Gemini; returns the input unchanged on failure."""
+    return refine_transcript(app, text, service="Gemini")
 
-    language_code = app.config.get("language_config", {}).get("target_language", "en")
-    preserve_original_languages = app.config.get("language_config", {}).get("preserve_original_languages", True)
-    mode = app.config.get("mode_config", {}).get("operation_mode", "typer")
 
-    system_prompt, mode_instructions = get_prompt_instructions(mode, language_code, preserve_original_languages)
-    
-    if preserve_original_languages:
-        header_note = "to be processed while preserving original languages"
-    else:
-        header_note = f"to be processed into target language: {language_code}"
-    
-    user_content_header = f"--- BEGIN RAW ASR TRANSCRIPTION ({header_note}) ---"
-    user_content_footer = "--- END RAW ASR TRANSCRIPTION ---"
-    full_prompt_text = f"{system_prompt}\n\n{mode_instructions}\n\n{user_content_header}\n{text}\n{user_content_footer}"
+def output_text(app, text: str):
+    """
+    Copy the final text to the clipboard and paste it into the focused window.
 
+    If app.output_sink is set (a callable taking the text), it replaces the
+    clipboard/paste step, e.g. to run the pipeline headless in benchmarks.
+    """
+    output_sink = getattr(app, 'output_sink', None)
+    if output_sink is not None:
+        output_sink(text)
+        return
+    import pyperclip
+    import pyautogui
+    pyperclip.copy(text)
+    print(f"Final text copied to clipboard: \"{text}\"")
     try:
-        response = app.gemini_model_instance.generate_content(
-            full_prompt_text,
-            generation_config=genai.types.GenerationConfig(temperature=0.05)
-        )
-        refined_text = response.text.strip()
-
-        if mode == "prompt_engineer":
-            if refined_text.startswith("```xml") and refined_text.endswith("```"):
-                refined_text = refined_text.removeprefix("```xml").removesuffix("```").strip()
-            elif refined_text.startswith("```") and refined_text.endswith("```"):
-                refined_text_lines = refined_text.splitlines()
-                if len(refined_text_lines) > 1 and refined_text_lines[0].strip().lower().startswith("xml"):
-                    refined_text = "\n".join(refined_text_lines[1:-1]).strip()
-                else:
-                     refined_text = refined_text.removeprefix("```").removesuffix("```").strip()
-        elif mode == "email":
-            if refined_text.startswith("```") and refined_text.endswith("```"):
-                refined_text_lines = refined_text.splitlines()
-                if len(refined_text_lines) > 1 and refined_text_lines[0].strip().lower() in ["", "text", "email"]:
-                     refined_text = "\n".join(refined_text_lines[1:-1]).strip()
-                else:
-                     refined_text = refined_text.removeprefix("```").removesuffix("```").strip()
-            if (refined_text.startswith('"') and refined_text.endswith('"')) or \
-               (refined_text.startswith("'") and refined_text.endswith("'")):
-                refined_text = refined_text[1:-1]
-        else: # Typer mode
-            if not (refined_text.startswith("+ ") or refined_text.startswith("1.")):
-                if (refined_text.startswith('"') and refined_text.endswith('"')) or \
-                   (refined_text.startswith("'") and refined_text.endswith("'")):
-                    refined_text = refined_text[1:-1]
-
-        print(f"Gemini refined text (Model: {selected_gemini_model_name}, Mode: {mode}, Lang: {language_code}):\n{refined_text}")
-        return refined_text
-    except Exception as e:
-        print(f"Error during Gemini API call with model {selected_gemini_model_name}: {e}")
-        try:
-            if response and response.prompt_feedback and response.prompt_feedback.block_reason:
-                print(f"Gemini prompt blocked due to: {response.prompt_feedback.block_reason}")
-        except:
-            pass
-        return text
+        time.sleep(0.1)
+        pyautogui.hotkey('ctrl', 'v')
+        print("Paste command sent.")
+    except Exception as e_paste:
+        print(f"Could not simulate paste: {e_paste}")
+
+def rest_after_broken_stream(app, typed_text: str, transcribed_text: str, mode: str) -> str:
+    """
+    The text still to output after a refinement stream broke off part-way.
 
-def transcribe_and_refine_audio_data(app, frames_to_process):
+    The transcript is refined again in one piece and only the part after the
+    already typed sentences is returned. If that part cannot be located, the
+    full refined text is copied to the clipboard instead and "" is returned.
+    """
+    refined_text = refine_transcript(app, transcribed_text, mode=mode)
+    remainder = untyped_remainder(typed_text, refined_text)
+    if remainder is None:
+        print("Streaming refinement failed part-way and the missing text could not be located; "
+              "the full refined text was copied to the clipboard instead.")
+        if getattr(app, 'output_sink', None) is None:
+            import pyperclip
+            pyperclip.copy(refined_text)
+        return ""
+    return remainder
+
+def transcribe_and_refine_audio_data(app, audio_data):
     final_text_to_output = ""
+    typed_incrementally = False
+    speculative_refiner = getattr(app, 'speculative_refiner', None)
+    app.speculative_refiner = None
     try:
-        if not frames_to_process:
-            print("Transcription thread: No frames received.")
+        if audio_data is None or audio_data.size == 0:
+            print("Recorded audio data is empty.")
             app.master.after(0, app._set_initial_state_after_processing)
             return
-        audio_data = np.concatenate(frames_to_process, axis=0)
-        if audio_data.size == 0:
-            print("Concatenated audio data is empty.")
-            app.master.after(0, app._set_initial_state_after_processing)
-            return
-        sample_width_bytes = 2
-        with wave.open(TEMP_AUDIO_FILENAME, 'wb') as wf:
-            wf.setnchannels(CHANNELS)
-            wf.setsampwidth(sample_width_bytes)
-            wf.setframerate(SAMPLE_RATE)
-            wf.writeframes(audio_data.tobytes())
-
-        transcribed_text = ""
-        if app.asr_model:
-            print("Transcribing audio with NeMo...")
-            nemo_result_list = app.asr_model.transcribe([TEMP_AUDIO_FILENAME])
-            if nemo_result_list and isinstance(nemo_result_list, list) and len(nemo_result_list) > 0:
-                actual_result_item = nemo_result_list[0]
-                if isinstance(actual_result_item, str):
-                    transcribed_text = actual_result_item
-                elif hasattr(actual_result_item, 'text') and isinstance(getattr(actual_result_item, 'text'), str):
-                    transcribed_text = actual_result_item.text
-                elif actual_result_item is None: transcribed_text = ""
-                else: print(f"ASR: Unexpected type for NeMo's result item: {type(actual_result_item)}")
-            elif nemo_result_list is None: print("ASR: NeMo transcribe returned None.")
-            elif isinstance(nemo_result_list, list) and len(nemo_result_list) == 0: print("ASR: NeMo transcribe returned an empty list.")
-            else: print(f"ASR: NeMo transcribe returned unexpected structure: {type(nemo_result_list)}")
-
-            if transcribed_text: print(f"ASR Transcription: {transcribed_text}")
-            else: print("ASR Transcription by NeMo resulted in empty text.")
-        else:
-            print("ASR model not available. Transcription skipped.")
+        with latency.measure("asr"):
+            transcribed_text = transcribe_recording(app, audio_data)
 
         text_processing_service = app.config.get("models_config", {}).get("text_processing_service", "Mistral")
         streaming_config = app.config.get("streaming_config", {})
@@ -305,114 +493,68 @@ def transcribe_and_refine_audio_data(app, frames_to_process):
                 print("Starting streaming text processing...")
                 start_streaming_text_processing(app, transcribed_text)
                 return  # Exit early for streaming mode
+            elif text_processing_service == "None (Raw ASR)":
+                print("Using raw ASR output.")
+                final_text_to_output = transcribed_text
             else:
-                # Check operation mode
-                operation_mode = app.config.get("mode_config", {}).get("operation_mode", "typer")
-
-                if operation_mode == "coder":
-                    # Use coder mode processing
-                    final_text_to_output = process_text_with_coder_mode(app, transcribed_text)
-                else:
-                    # Use existing batch processing for other modes
-                    if text_processing_service == "Mistral" and app.mistral_client:
-                        final_text_to_output = process_text_with_mistral(app, transcribed_text)
-                    elif text_processing_service == "Gemini" and app.gemini_model_instance:
-                        final_text_to_output = process_text_with_gemini(app, transcribed_text)
-                    elif text_processing_service == "Ollama":
-                        # Initialize Ollama manager if not already done
-                        if not hasattr(app, 'ollama_manager'):
-                            initialize_ollama_manager(app)
-                        final_text_to_output = process_text_with_ollama(app, transcribed_text)
-                    elif text_processing_service == "None (Raw ASR)":
-                        print("Using raw ASR output.")
-                        final_text_to_output = transcribed_text
-                    else:
-                        print(f"Service '{text_processing_service}' not available or client not ready. Using raw ASR.")
-                        final_text_to_output = transcribed_text
+                # Initialize Ollama manager if not already done
+                if text_processing_service == "Ollama" and not hasattr(app, 'ollama_manager'):
+                    initialize_ollama_manager(app)
+                # Provider and operation mode (including coder) come from the config;
+                # an unavailable provider falls back to the raw ASR text
+                final_text_to_output = None
+                if speculative_refiner is not None:
+                    # Reuse the refinements made while the user was speaking
+                    final_text_to_output = speculative_refiner.finish(transcribed_text)
+                if final_text_to_output is None and incremental_output_enabled(app):
+                    # Sentences are pasted as they stream in; only a failed stream leaves text to output
+                    operation_mode = app.config.get("mode_config", {}).get("operation_mode", "typer")
+                    typed_text, completed = stream_to_focused_window(
+                        app, stream_refinement(app, transcribed_text, operation_mode), operation_mode)
+                    typed_incrementally = bool(typed_text)
+                    if typed_text and completed:
+                        final_text_to_output = ""
+                    elif typed_text:
+                        # The stream broke off after some sentences were typed: type only the missing rest
+                        final_text_to_output = rest_after_broken_stream(app, typed_text, transcribed_text, operation_mode)
+                    # Nothing was typed: refine in one piece below
+                if final_text_to_output is None:
+                    # Non-streaming responses arrive in one piece, so only completion is recorded
+                    final_text_to_output = refine_transcript(app, transcribed_text, record_latency=True)
         else:
             final_text_to_output = ""
 
+        if typed_incrementally:
+            print("Refined text was typed as it streamed.")
         if final_text_to_output:
-            pyperclip.copy(final_text_to_output)
-            print(f"Final text copied to clipboard: \"{final_text_to_output}\"")
-            try:
-                time.sleep(0.1)
-                pyautogui.hotkey('ctrl', 'v')
-                print("Paste command sent.")
-            except Exception as e_paste:
-                print(f"Could not simulate paste: {e_paste}")
-        else:
+            with latency.measure("clipboard"):
+                output_text(app, final_text_to_output)
+        elif not typed_incrementally:
             print("No final text to output.")
     except ValueError as ve:
         print(f"ValueError during audio processing: {ve}")
     except Exception as e:
         print(f"Error during transcription/refinement: {e}")
     finally:
+        if speculative_refiner is not None:
+            speculative_refiner.cancel()
         app._play_sound_async("close.wav")
         app.master.after(0, app._set_initial_state_after_processing) 
 
 def stream_mistral_text_processing(app, text: str, operation_mode: str) -> Generator[Dict[str, Any], None, None]:
     """
-    Stream text processing with Mistral AI using correct API pattern.
-    
+    Stream text processing with Mistral AI.
+
     Args:
         app: The application instance
         text: The transcribed text to process
         operation_mode: The operation mode (typer, prompt_engineer, email, coder)
-    
+
     Yields:
         Dict containing streaming data with keys: 'type', 'content'
     """
-    if not app.mistral_client:
-        yield {"type": "error", "content": "Mistral client not initialized"}
-        return
-    
-    # This function no longer needs to check for the streaming_config enabled flag,
-    # as it's only called when streaming is already intended.
-    
-    # Generate prompt based on operation mode
-    language_code = app.config.get("language_config", {}).get("target_language", "en")
-    preserve_original_languages = app.config.get("language_config", {}).get("preserve_original_languages", True)
-    system_prompt, mode_instructions = get_prompt_instructions(operation_mode, language_code, preserve_original_languages)
-    
-    if preserve_original_languages:
-        header_note = "to be processed while preserving original languages"
-    else:
-        header_note = f"to be processed into target language: {language_code}"
-    
-    user_content_header = f"--- BEGIN RAW ASR TRANSCRIPTION ({header_note}) ---"
-    user_content_footer = "--- END RAW ASR TRANSCRIPTION ---"
-    
-    messages = [
-        {"role": "system", "content": system_prompt},
-        {"role": "user", "content": f"{mode_instructions}\n\n{user_content_header}\n{text}\n{user_content_footer}"}
-    ]
-    
-    try:
-        # Use correct Mistral streaming pattern
-        stream_response = app.mistral_client.chat.stream(
-            model=app.config.get("models_config", {}).get("mistral_model_name", DEFAULT_MISTRAL_MODEL_NAME),
-            messages=messages,
-            temperature=0.05
-        )
-        
-        # Stream tokens naturally as they come from the API
-        for chunk in stream_response:
-            # CORRECTED: Access chunk.data.choices for Mistral streaming API
-            if chunk.data.choices[0].delta.content is not None:
-                token_content = chunk.data.choices[0].delta.content
-                yield {
-                    "type": "token",
-                    "content": token_content
-                }
-            
-            # CORRECTED: Check for completion reason correctly
-            if chunk.data.choices[0].finish_reason == "stop":
-                yield {"type": "final"}
-                break
-                
-    except Exception as e:
-        yield {"type": "error", "content": f"Streaming error: {str(e)}"}
+    yield from stream_refinement(app, text, operation_mode, service="Mistral")
+
 
 def analyze_and_correct_context(original_text: str, current_output: str, token: str, 
                                context_window: list, streaming_config: dict) -> Dict[str, Any]:
@@ -498,71 +640,18 @@ def suggest_correction(token: str, current_output: str, original_text: str) -> O
 
 def stream_gemini_text_processing(app, text: str, operation_mode: str) -> Generator[Dict[str, Any], None, None]:
     """
-    Stream text processing with Gemini AI using correct API pattern.
-    
+    Stream text processing with Gemini AI.
+
     Args:
         app: The application instance
         text: The transcribed text to process
         operation_mode: The operation mode (typer, prompt_engineer, email)
-    
+
     Yields:
         Dict containing streaming data with keys: 'type', 'content'
     """
-    if not app.gemini_model_instance:
-        yield {"type": "error", "content": "Gemini model not initialized"}
-        return
-    
-    streaming_config = app.config.get("streaming_config", {})
-    if not streaming_config.get("enabled", False):
-        # Fallback to existing batch processing
-        result = process_text_with_gemini(app, text)
-        yield {"type": "final", "content": result}
-        return
-    
-    # Generate prompt based on operation mode
-    language_code = app.config.get("language_config", {}).get("target_language", "en")
-    preserve_original_languages = app.config.get("language_config", {}).get("preserve_original_languages", True)
-    system_prompt, mode_instructions = get_prompt_instructions(operation_mode, language_code, preserve_original_languages)
-    
-    if preserve_original_languages:
-        header_note = "to be processed while preserving original languages"
-    else:
-        header_note = f"to be processed into target language: {language_code}"
-    
-    user_content_header = f"--- BEGIN RAW ASR TRANSCRIPTION ({header_note}) ---"
-    user_content_footer = "--- END RAW ASR TRANSCRIPTION ---"
-    
-    complete_prompt = f"""{system_prompt}
+    yield from stream_refinement(app, text, operation_mode, service="Gemini")
 
-{mode_instructions}
-
-{user_content_header}
-{text}
-{user_content_footer}"""
-    
-    try:
-        # Use correct Gemini streaming pattern from research
-        response = app.gemini_model_instance.generate_content(
-            complete_prompt,
-            generation_config=genai.types.GenerationConfig(
-                temperature=0.05,
-                max_output_tokens=2048,
-            ),
-            stream=True
-        )
-        
-        # Stream tokens naturally as they come from the API
-        for chunk in response:
-            if chunk.text:
-                yield {
-                    "type": "token",
-                    "content": chunk.text
-                }
-        
-        yield {"type": "final"}
-                
-    except Exception as e:
-        yield {"type": "error", "content": f"Streaming error: {str(e)}"} 
 
 def start_streaming_text_processing(app, transcribed_text: str):
     """
@@ -586,6 +675,7 @@ def start_streaming_text_processing(app, transcribed_text: str):
     app.master.after(0, show_widget_safe)
     
     def streaming_worker():
+        paste_sink = None
         try:
             # Small delay to ensure widget is shown
             time.sleep(0.1)
@@ -625,42 +715,86 @@ def start_streaming_text_processing(app, transcribed_text: str):
                 app.master.after(0, lambda: update_fallback_result_safe(result))
                 return
             
+            # Optionally type stable sentences into the focused window as they arrive
+            paste_sink = IncrementalPasteSink.from_config(app, operation_mode) \
+                if incremental_output_enabled(app, operation_mode) else None
+
             # Process streaming results naturally
+            llm_started = time.perf_counter()
+            first_token_latency = None
             for stream_data in stream_generator:
-                # Update UI in main thread - timing handled by UI layer
-                def update_content_safe(data):
-                    if app.streaming_widget is not None:
-                        app.streaming_widget.update_streaming_content(data)
-                    else:
-                        print("Warning: Streaming widget not available, skipping content update")
-                app.master.after(0, lambda data=stream_data: update_content_safe(data))
+                if stream_data.get("type") == "token":
+                    if first_token_latency is None:
+                        first_token_latency = time.perf_counter() - llm_started
+                    if paste_sink is not None:
+                        paste_sink.feed(stream_data.get("content", ""))
+                elif stream_data.get("type") in ("final", "error"):
+                    # A replayed cached response made no provider request, so it is not recorded
+                    if not stream_data.get("cached"):
+                        if first_token_latency is not None:
+                            latency.record("llm_first_token", first_token_latency)
+                        if stream_data.get("type") == "final":
+                            latency.record("llm_complete", time.perf_counter() - llm_started)
+                    if paste_sink is not None:
+                        # Mark the result as already pasted so the widget does not paste it again
+                        pasted_text = paste_sink.finish(flush_pending=stream_data.get("type") == "final")
+                        stream_data = dict(stream_data, pasted=bool(pasted_text))
+                        paste_sink = None
+                        if stream_data.get("type") == "error" and pasted_text:
+                            # Type the sentences the broken stream did not reach
+                            rest = rest_after_broken_stream(app, pasted_text, transcribed_text, operation_mode)
+                            if rest:
+                                output_text(app, rest)
+                # Queue for the widget; it renders pending tokens once per frame on the main thread
+                if app.streaming_widget is not None:
+                    app.streaming_widget.enqueue_stream_data(stream_data)
+                else:
+                    print("Warning: Streaming widget not available, skipping content update")
                 
         except Exception as e:
             error_data = {"type": "error", "content": f"Streaming processing error: {str(e)}"}
-            def handle_error_safe(data):
-                if app.streaming_widget is not None:
-                    app.streaming_widget.update_streaming_content(data)
-                else:
-                    print(f"Error: {data['content']}")
-            app.master.after(0, lambda: handle_error_safe(error_data))
+            if paste_sink is not None:
+                pasted_text = paste_sink.finish(flush_pending=False)
+                error_data["pasted"] = bool(pasted_text)
+                if pasted_text:
+                    rest = rest_after_broken_stream(app, pasted_text, transcribed_text, operation_mode)
+                    if rest:
+                        output_text(app, rest)
+            # Queued behind any pending tokens so it is rendered after them
+            if app.streaming_widget is not None:
+                app.streaming_widget.enqueue_stream_data(error_data)
+            else:
+                print(f"Error: {error_data['content']}")
     
     # Start streaming in a separate thread
     streaming_thread = threading.Thread(target=streaming_worker, daemon=True)
     streaming_thread.start() 
 
 class OllamaManager:
-    """Manager for Ollama integration - detection and model listing."""
+    """Manager for Ollama integration - detection, model listing and model residency."""
     
-    def __init__(self):
-        self.base_url = "http://localhost:11434"
+    def __init__(self, base_url: Optional[str] = None):
+        self.base_url = base_url or os.environ.get("OLLAMA_HOST", "http://localhost:11434")
         self.is_available = False
         self.client = None
+        self._session = None
+        # Models the server currently holds in memory, by name, as last reported by /api/ps
+        self.loaded_models: Dict[str, Dict[str, Any]] = {}
+        self._preload_thread: Optional[threading.Thread] = None
+
+    @property
+    def session(self):
+        """Keep-alive HTTP session reused for all management requests."""
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
         
     def detect_ollama(self) -> bool:
         """Check if Ollama is installed and running."""
         try:
             import requests
-            response = requests.get(f"{self.base_url}/api/version", timeout=5)
+            response = self.session.get(f"{self.base_url}/api/version", timeout=5)
             if response.status_code == 200:
                 self.is_available = True
                 try:
@@ -681,8 +815,7 @@ class OllamaManager:
             return []
         
         try:
-            import requests
-            response = requests.get(f"{self.base_url}/api/tags", timeout=10)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 models = []
@@ -702,6 +835,57 @@ class OllamaManager:
             print(f"Error getting Ollama models: {e}")
         return []
     
+    def refresh_loaded_models(self) -> Dict[str, Dict[str, Any]]:
+        """Update loaded_models from /api/ps."""
+        try:
+            response = self.session.get(f"{self.base_url}/api/ps", timeout=5)
+            if response.status_code == 200:
+                self.loaded_models = {model['name']: model for model in response.json().get('models', [])}
+        except Exception as e:
+            print(f"Error getting loaded Ollama models: {e}")
+        return self.loaded_models
+
+    def is_model_loaded(self, model_name: str) -> bool:
+        """Whether model_name was resident at the last refresh_loaded_models()."""
+        return model_name in self.loaded_models or f"{model_name}:latest" in self.loaded_models
+
+    def preload_model(self, model_name: str, keep_alive: Any = "30m") -> bool:
+        """
+        Load model_name into memory without generating anything.
+
+        An /api/generate request without a prompt only loads the model and
+        resets its keep_alive timer, so it is cheap when the model is already
+        resident. keep_alive=-1 pins the model until the server stops.
+        """
+        if not self.is_available or not model_name:
+            return False
+        self.refresh_loaded_models()
+        was_loaded = self.is_model_loaded(model_name)
+        started = time.perf_counter()
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/generate",
+                json={"model": model_name, "keep_alive": keep_alive},
+                timeout=300
+            )
+            if response.status_code != 200:
+                print(f"Ollama: failed to preload {model_name}: HTTP {response.status_code}")
+                return False
+        except Exception as e:
+            print(f"Ollama: failed to preload {model_name}: {e}")
+            return False
+        self.refresh_loaded_models()
+        if not was_loaded:
+            print(f"Ollama: loaded {model_name} in {time.perf_counter() - started:.2f}s (keep_alive={keep_alive}).")
+        return True
+
+    def preload_model_async(self, model_name: str, keep_alive: Any = "30m"):
+        """Start preload_model() in the background unless a preload is already running."""
+        if self._preload_thread is not None and self._preload_thread.is_alive():
+            return
+        self._preload_thread = threading.Thread(target=self.preload_model, args=(model_name, keep_alive), daemon=True)
+        self._preload_thread.start()
+
     def _format_size(self, size_bytes: int) -> str:
         """Format size in bytes to human readable format."""
         if size_bytes == 0:
@@ -714,11 +898,60 @@ class OllamaManager:
         return f"{size_bytes:.1f} PB"
 
 
+def ollama_keep_alive(app) -> Any:
+    """keep_alive sent with every Ollama request: -1 pins the model, otherwise the configured duration."""
+    ollama_config = app.config.get("ollama_config", {})
+    return -1 if ollama_config.get("pin_model", False) else ollama_config.get("keep_alive", "30m")
+
+
 def initialize_ollama_manager(app):
-    """Initialize Ollama manager for the application."""
-    if not hasattr(app, 'ollama_manager'):
-        app.ollama_manager = OllamaManager()
-        app.ollama_manager.detect_ollama()
+    """
+    Initialize Ollama manager for the application.
+
+    Startup runs this on a background thread while a dictation or the settings
+    window may call it too; the lock makes late callers wait for the detection
+    in progress, and app.ollama_manager is only set once detection finished.
+    """
+    with _ollama_init_lock:
+        if not hasattr(app, 'ollama_manager'):
+            manager = OllamaManager()
+            manager.detect_ollama()
+            app.ollama_manager = manager
+        keep_alive = ollama_keep_alive(app)
+        provider = get_provider(app, "Ollama")
+        if app.ollama_manager.is_available and (provider is None or provider.keep_alive != keep_alive):
+            try:
+                ollama_model = app.config.get("models_config", {}).get("ollama_model_name", "")
+                register_provider(app, OllamaProvider(app.ollama_manager.base_url, ollama_model, keep_alive=keep_alive))
+            except Exception as e:
+                print(f"Error initializing Ollama client: {e}")
+    if app.config.get("ollama_config", {}).get("pin_model", False):
+        preload_ollama_model(app, force=True)
+
+
+def preload_ollama_model(app, force: bool = False):
+    """
+    Start loading the selected Ollama model in the background.
+
+    Called when recording starts so a model evicted since the last dictation
+    loads while the user is still speaking. Only done when Ollama is the
+    selected service or the hedging secondary (unless force is set), so a
+    multi-GB model is not pulled into memory just for being in the fallback chain.
+    """
+    manager = getattr(app, 'ollama_manager', None)
+    ollama_config = app.config.get("ollama_config", {})
+    if manager is None or not manager.is_available:
+        return
+    if not force:
+        if not ollama_config.get("preload_on_record", True):
+            return
+        hedging_config = app.config.get("hedging_config", {})
+        hedged = hedging_config.get("enabled", False) and hedging_config.get("secondary_service") == "Ollama"
+        if app.config.get("models_config", {}).get("text_processing_service") != "Ollama" and not hedged:
+            return
+    model_name = app.config.get("models_config", {}).get("ollama_model_name", "")
+    if model_name:
+        manager.preload_model_async(model_name, ollama_keep_alive(app))
 
 
 def stream_ollama_text_processing(app, text: str, operation_mode: str) -> Generator[Dict[str, Any], None, None]:
@@ -733,124 +966,23 @@ def stream_ollama_text_processing(app, text: str, operation_mode: str) -> Genera
     Yields:
         Dict containing streaming data with keys: 'type', 'content'
     """
-    if not hasattr(app, 'ollama_manager') or not app.ollama_manager.is_available:
-        yield {"type": "error", "content": "Ollama not available or not initialized"}
-        return
-
-    # Get selected Ollama model from config
-    ollama_model = app.config.get("models_config", {}).get("ollama_model_name", "")
-    if not ollama_model:
-        yield {"type": "error", "content": "No Ollama model selected"}
-        return
+    yield from stream_refinement(app, text, operation_mode, service="Ollama")
 
-    # Generate prompt based on operation mode
-    language_code = app.config.get("language_config", {}).get("target_language", "en")
-    preserve_original_languages = app.config.get("language_config", {}).get("preserve_original_languages", True)
-
-    # For coder mode, get target language
-    target_language = None
-    if operation_mode == "coder":
-        target_language = app.config.get("coder_config", {}).get("target_language", "Python")
-
-    system_prompt, mode_instructions = get_prompt_instructions(operation_mode, language_code, preserve_original_languages, target_language)
-
-    if operation_mode == "coder":
-        # For coder mode, simpler prompt structure
-        full_prompt = f"{system_prompt}\n\n{mode_instructions}\n\nUser request: {text}"
-    else:
-        if preserve_original_languages:
-            header_note = "to be processed while preserving original languages"
-        else:
-            header_note = f"to be processed into target language: {language_code}"
-
-        user_content_header = f"--- BEGIN RAW ASR TRANSCRIPTION ({header_note}) ---"
-        user_content_footer = "--- END RAW ASR TRANSCRIPTION ---"
-        full_prompt = f"{system_prompt}\n\n{mode_instructions}\n\n{user_content_header}\n{text}\n{user_content_footer}"
-
-    try:
-        import ollama
-
-        # Stream response from Ollama
-        stream = ollama.chat(
-            model=ollama_model,
-            messages=[{
-                'role': 'user',
-                'content': full_prompt
-            }],
-            stream=True,
-        )
-
-        for chunk in stream:
-            content = chunk.get('message', {}).get('content', '')
-            if content:
-                yield {
-                    "type": "token",
-                    "content": content
-                }
-
-        yield {"type": "final"}
-
-    except Exception as e:
-        yield {"type": "error", "content": f"Ollama streaming error: {str(e)}"}
 
 
 def process_text_with_ollama(app, text: str) -> str:
     """
-    Process text with Ollama (non-streaming) as fallback.
+    Process text with Ollama (non-streaming).
 
     Args:
         app: The application instance
         text: The transcribed text to process
 
     Returns:
-        str: The processed text result
+        str: The processed text, or the input unchanged on failure
     """
-    if not hasattr(app, 'ollama_manager') or not app.ollama_manager.is_available:
-        return f"Error: Ollama not available"
-
-    operation_mode = app.config.get("mode_config", {}).get("operation_mode", "typer")
-    language_code = app.config.get("language_config", {}).get("target_language", "en")
-    preserve_original_languages = app.config.get("language_config", {}).get("preserve_original_languages", True)
-
-    # For coder mode, get target language from config
-    target_language = None
-    if operation_mode == "coder":
-        target_language = app.config.get("coder_config", {}).get("target_language", "Python")
-
-    system_prompt, mode_instructions = get_prompt_instructions(operation_mode, language_code, preserve_original_languages, target_language)
+    return refine_transcript(app, text, service="Ollama")
 
-    ollama_model = app.config.get("models_config", {}).get("ollama_model_name", "")
-    if not ollama_model:
-        return "Error: No Ollama model selected"
-
-    if operation_mode == "coder":
-        # For coder mode, simpler prompt structure
-        full_prompt = f"{system_prompt}\n\n{mode_instructions}\n\nUser request: {text}"
-    else:
-        if preserve_original_languages:
-            header_note = "to be processed while preserving original languages"
-        else:
-            header_note = f"to be processed into target language: {language_code}"
-
-        user_content_header = f"--- BEGIN RAW ASR TRANSCRIPTION ({header_note}) ---"
-        user_content_footer = "--- END RAW ASR TRANSCRIPTION ---"
-        full_prompt = f"{system_prompt}\n\n{mode_instructions}\n\n{user_content_header}\n{text}\n{user_content_footer}"
-
-    try:
-        import ollama
-
-        response = ollama.chat(
-            model=ollama_model,
-            messages=[{
-                'role': 'user',
-                'content': full_prompt
-            }]
-        )
-
-        return response['message']['content']
-
-    except Exception as e:
-        return f"Error processing with Ollama: {str(e)}"
 
 def process_text_with_coder_mode(app, text: str) -> str:
     """
@@ -861,52 +993,6 @@ def process_text_with_coder_mode(app, text: str) -> str:
         text: The transcribed text to process
 
     Returns:
-        str: The generated code
+        str: The generated code, or the input unchanged on failure
     """
-    target_language = app.config.get("coder_config", {}).get("target_language", "Python")
-    language_code = app.config.get("language_config", {}).get("target_language", "en")
-    preserve_original_languages = app.config.get("language_config", {}).get("preserve_original_languages", True)
-
-    system_prompt, mode_instructions = get_prompt_instructions("coder", language_code, preserve_original_languages, target_language)
-
-    # Create the full prompt
-    full_prompt = f"{system_prompt}\n\n{mode_instructions}\n\nUser request: {text}"
-
-    # Use the configured LLM service
-    text_processing_service = app.config.get("models_config", {}).get("text_processing_service", "Mistral")
-
-    try:
-        if text_processing_service == "Mistral" and app.mistral_client:
-            chat_response = app.mistral_client.chat.complete(
-                model=app.config.get("models_config", {}).get("mistral_model_name", DEFAULT_MISTRAL_MODEL_NAME),
-                messages=[{"role": "user", "content": full_prompt}],
-                temperature=0.05
-            )
-            return chat_response.choices[0].message.content.strip()
-
-        elif text_processing_service == "Gemini" and app.gemini_model_instance:
-            response = app.gemini_model_instance.generate_content(
-                full_prompt,
-                generation_config=genai.types.GenerationConfig(temperature=0.05)
-            )
-            return response.text.strip()
-
-        elif text_processing_service == "Ollama":
-            if not hasattr(app, 'ollama_manager'):
-                initialize_ollama_manager(app)
-            if hasattr(app, 'ollama_manager') and app.ollama_manager.is_available:
-                ollama_model = app.config.get("models_config", {}).get("ollama_model_name", "")
-                if ollama_model:
-                    import ollama
-                    response = ollama.chat(
-                        model=ollama_model,
-                        messages=[{'role': 'user', 'content': full_prompt}]
-                    )
-                    return response['message']['content']
-            return f"Error: Ollama not available or no model selected"
-
-        else:
-            return f"Error: No LLM service available for coder mode"
-
-    except Exception as e:
-        return f"Error in coder mode processing: {str(e)}" 
\ No newline at end of file
+    return refine_transcript(app, text, mode="coder")
@@ -1,16 +1,128 @@
 import sounddevice
 import numpy as np
-import wave
 import time
 import os
 import threading
 from typing import List, Optional
 
+from .metrics import latency
+from .visualizer import SpectralVisualizer
+
 SAMPLE_RATE = 16000
 CHANNELS = 1
 AUDIO_BLOCK_DURATION_MS = 100
-ASSETS_DIR = "assets"
-TEMP_AUDIO_FILENAME = os.path.join(ASSETS_DIR, "temp_axo_audio.wav")
+
+
+class RecordingBuffer:
+    """
+    Growable, preallocated int16 arena for captured audio.
+
+    The PortAudio callback appends each block with a single copy into the arena
+    instead of allocating a new array per block; readers get views, not copies.
+    """
+
+    def __init__(self, initial_seconds: float = 30.0, channels: int = CHANNELS):
+        self.channels = channels
+        self.initial_capacity = int(SAMPLE_RATE * initial_seconds)
+        self._data = np.empty((self.initial_capacity, channels), dtype=np.int16)
+        self._length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def reset(self):
+        """Start a new recording, reusing the current arena."""
+        with self._lock:
+            self._length = 0
+
+    def write(self, block: np.ndarray):
+        """Append one block of frames (called from the audio callback)."""
+        with self._lock:
+            end = self._length + len(block)
+            if end > len(self._data):
+                self._grow(end)
+            self._data[self._length:end] = block
+            self._length = end
+
+    def _grow(self, min_capacity: int):
+        new_data = np.empty((max(min_capacity, len(self._data) * 2), self.channels), dtype=np.int16)
+        new_data[:self._length] = self._data[:self._length]
+        self._data = new_data
+
+    def view(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        """Zero-copy view of the recorded frames in [start, end)."""
+        with self._lock:
+            end = self._length if end is None else min(end, self._length)
+            return self._data[start:end]
+
+    def detach(self) -> np.ndarray:
+        """
+        Hand the recorded frames to a consumer without copying.
+
+        The current arena is given away with the returned view and a fresh one
+        takes its place, so the next recording cannot overwrite audio that is
+        still being transcribed.
+        """
+        with self._lock:
+            recorded = self._data[:self._length]
+            self._data = np.empty((self.initial_capacity, self.channels), dtype=np.int16)
+            self._length = 0
+            return recorded
+
+
+class AmplitudeChannel:
+    """
+    Single-producer/single-consumer ring of the most recent captured samples.
+
+    The PortAudio callback publishes every block into a preallocated ring and
+    then advances the published-frame counter; the Tk animation tick reads
+    the newest frames for the bar display. Only the producer writes the ring
+    and the counter, and the counter moves after the samples are in place, so
+    the real-time thread and the UI share no lock. A reader that fell a whole
+    ring behind gets nothing for the overwritten frames (the counter is checked
+    again after copying). Publishing allocates nothing.
+
+    Readers see the len()/view() interface of RecordingBuffer, so the
+    SpectralVisualizer can read from either.
+    """
+
+    def __init__(self, capacity_frames: int = SAMPLE_RATE * 2):
+        self.capacity = capacity_frames
+        self._ring = np.zeros(capacity_frames, dtype=np.int16)
+        self._written = 0
+
+    def __len__(self) -> int:
+        return self._written
+
+    def publish(self, block: np.ndarray):
+        """Append one block of frames, first channel only (audio thread only)."""
+        samples = block[:, 0] if block.ndim > 1 else block
+        count = len(samples)
+        if count > self.capacity:
+            samples = samples[-self.capacity:]
+        kept = len(samples)
+        start = (self._written + count - kept) % self.capacity
+        first = min(kept, self.capacity - start)
+        self._ring[start:start + first] = samples[:first]
+        self._ring[:kept - first] = samples[first:]
+        self._written += count
+
+    def reset(self):
+        """Start a new recording (only while no stream is publishing)."""
+        self._written = 0
+
+    def view(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        """Copy of frames [start, end); empty if they are no longer (or not yet) in the ring."""
+        written = self._written
+        end = written if end is None else min(end, written)
+        if end <= start or start < written - self.capacity:
+            return np.empty(0, dtype=np.int16)
+        frames = self._ring[np.arange(start, end) % self.capacity]
+        if start < self._written - self.capacity:
+            # The producer lapped the reader while it was copying
+            return np.empty(0, dtype=np.int16)
+        return frames
 
 
 class AudioManager:
@@ -21,6 +133,9 @@ class AudioManager:
 
     def __init__(self):
         self.active_streams: List[sounddevice.InputStream] = []
+        self.recording_buffer = RecordingBuffer()
+        self.amplitude_channel = AmplitudeChannel()
+        self.spectral_visualizer = SpectralVisualizer(self.amplitude_channel)
         self._lock = threading.Lock()
 
     def create_stream(self, **kwargs) -> sounddevice.InputStream:
@@ -69,29 +184,31 @@ def get_audio_devices():
     return input_devices
 
 def audio_callback(app, indata, frames, time, status):
+    # Runs on the PortAudio thread: store the block and publish it, nothing else. The UIs
+    # get the bar levels from app.spectral_visualizer, which reads audio_manager.amplitude_channel
+    # on their own animation tick without touching the recording buffer's lock.
     if status: print(f"Audio callback status: {status}")
     if app.is_recording:
-        app.audio_frames.append(indata.copy())
-        MAX_EXPECTED_AMPLITUDE = 2000
-        mean_abs_val = np.abs(indata).mean()
-        app.current_normalized_amplitude = min(mean_abs_val / MAX_EXPECTED_AMPLITUDE, 1.0) if MAX_EXPECTED_AMPLITUDE > 0 else 0.0
-
-        # Update modern UI audio bars if active
-        if hasattr(app, 'modern_ui') and app.modern_ui is not None:
-            app.modern_ui.update_audio_bars(app.current_normalized_amplitude)
-    else:
-        app.current_normalized_amplitude = 0.0
-        # Reset modern UI audio bars if active
-        if hasattr(app, 'modern_ui') and app.modern_ui is not None:
-            app.modern_ui.update_audio_bars(0.0)
+        audio_manager.recording_buffer.write(indata)
+        audio_manager.amplitude_channel.publish(indata)
+
+def cancel_speculative_refiner(app):
+    """Stop the speculative refiner of a recording that will not be processed."""
+    speculative_refiner = getattr(app, 'speculative_refiner', None)
+    app.speculative_refiner = None
+    if speculative_refiner is not None:
+        speculative_refiner.cancel()
 
 def start_audio_recording(app):
     if not app.model_loaded_event.is_set():
         print("ASR Model not ready."); app.current_state = "initial"; app._update_ui_elements(); return
     if app.is_recording: return
     print("Starting recording..."); app._play_sound_async("open.wav")
-    app.audio_frames = []; app.current_normalized_amplitude = 0.0
+    audio_manager.recording_buffer.reset(); audio_manager.amplitude_channel.reset()
+    audio_manager.spectral_visualizer.reset(); app.spectral_visualizer = audio_manager.spectral_visualizer
     app.bar_current_heights = np.zeros(app.num_audio_bars)
+    app.streaming_transcriber = None
+    cancel_speculative_refiner(app)
     app.is_recording = True
     try:
         blocksize = int(SAMPLE_RATE * AUDIO_BLOCK_DURATION_MS / 1000)
@@ -110,8 +227,29 @@ def start_audio_recording(app):
             device=device_to_use
         )
         app.audio_stream.start()
+
+        # Overlap a cold Ollama model load with the user speaking
+        from .ai import preload_ollama_model
+        preload_ollama_model(app)
+
+        # Decode rolling windows while the hotkey is held, if enabled; speculative
+        # refinement needs them too, since it refines the committed segments
+        asr_config = app.config.get("asr_config", {})
+        from .speculative import SpeculativeRefiner, speculative_refinement_enabled
+        if speculative_refinement_enabled(app):
+            app.speculative_refiner = SpeculativeRefiner.from_config(app)
+            app.speculative_refiner.start()
+        if asr_config.get("streaming_partials", False) or app.speculative_refiner is not None:
+            from .streaming_asr import StreamingTranscriber
+            app.streaming_transcriber = StreamingTranscriber(
+                app, audio_manager.recording_buffer,
+                chunk_seconds=asr_config.get("partial_chunk_seconds", 2.0),
+                on_commit=app.speculative_refiner.add_segment if app.speculative_refiner is not None else None
+            )
+            app.streaming_transcriber.start()
     except Exception as e:
         print(f"Error starting recording: {e}"); app.is_recording = False; app.current_state = "initial"; app._update_ui_elements()
+        cancel_speculative_refiner(app)
         # Clean up stream if creation failed
         if hasattr(app, 'audio_stream') and app.audio_stream:
             try:
@@ -120,8 +258,8 @@ def start_audio_recording(app):
                 pass
 
 def stop_audio_recording_and_process(app):
-    if not app.is_recording and not app.audio_frames:
-        app.is_recording = False; app.current_normalized_amplitude = 0.0
+    if not app.is_recording and not len(audio_manager.recording_buffer):
+        app.is_recording = False
         # Clean up stream using audio manager
         if hasattr(app, 'audio_stream') and app.audio_stream:
             audio_manager.remove_stream(app.audio_stream)
@@ -131,9 +269,10 @@ def stop_audio_recording_and_process(app):
                 app.audio_stream.close()
             except Exception as e:
                 print(f"Error stopping/closing stream on no-op: {e}")
+        cancel_speculative_refiner(app)
         app.audio_stream = None; app.master.after(0, app._safe_ui_update_to_initial); return
 
-    print("Stopping recording..."); app.is_recording = False; app.current_normalized_amplitude = 0.0
+    print("Stopping recording..."); app.is_recording = False
     if hasattr(app, 'audio_stream') and app.audio_stream:
         # Remove from audio manager and clean up
         audio_manager.remove_stream(app.audio_stream)
@@ -145,10 +284,12 @@ def stop_audio_recording_and_process(app):
             print(f"Error stopping/closing audio stream: {e}")
         app.audio_stream = None
     time.sleep(0.05 + (AUDIO_BLOCK_DURATION_MS / 1000))
-    if not app.audio_frames:
-        print("No audio recorded."); app.master.after(0, app._safe_ui_update_to_initial); return
-    frames_to_send = list(app.audio_frames); app.audio_frames = []
+    if not len(audio_manager.recording_buffer):
+        print("No audio recorded."); cancel_speculative_refiner(app)
+        app.master.after(0, app._safe_ui_update_to_initial); return
+    with latency.measure("concat"):
+        audio_to_send = audio_manager.recording_buffer.detach()
 
     # This was originally a direct call to a threaded method.
     # To decouple, we'll call a method on the app instance that will then start the thread.
-    app.start_transcription_thread(frames_to_send) 
\ No newline at end of file
+    app.start_transcription_thread(audio_to_send) 
\ No newline at end of file
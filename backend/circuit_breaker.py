@@ -0,0 +1,163 @@
+"""
+Per-provider health tracking with a circuit breaker.
+
+Each text-processing service gets a CircuitBreaker that watches the outcome of
+its recent requests. When too many of them fail, the circuit opens and the
+service is skipped outright, so dictations go straight to the next provider
+in the fallback chain instead of waiting for a timeout. An answer that misses
+the latency SLO counts as half a failure: a provider opens for slowness only
+when it misses the SLO on (nearly) every request. The SLO is measured on time
+to first token for streams, and for complete() on the time that is left after
+subtracting the expected generation time of the answer (slo_latency), so long
+Email or Coder answers and slower local models are not penalized for their
+length. After a cool-down a single half-open probe request is let through; its
+outcome closes the circuit again or re-opens it.
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict, List
+
+RAW_ASR_SERVICE = "None (Raw ASR)"
+DEFAULT_FALLBACK_CHAIN = ["Mistral", "Gemini", "Ollama", RAW_ASR_SERVICE]
+# Services that send the transcript off the machine
+CLOUD_SERVICES = ("Mistral", "Gemini")
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker driven by failure rate and a latency SLO."""
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+    # Weight of a request outcome in the failure rate
+    HEALTHY, SLOW, FAILED = 0.0, 0.5, 1.0
+
+    def __init__(self, name: str, failure_rate_threshold: float = 0.5, window_size: int = 10,
+                 min_requests: int = 4, latency_slo_seconds: float = 8.0, open_seconds: float = 30.0):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_requests = min_requests
+        self.latency_slo_seconds = latency_slo_seconds
+        self.open_seconds = open_seconds
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self._outcomes = deque(maxlen=window_size)  # HEALTHY, SLOW or FAILED
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """True if a request may be sent now (counts as the probe when half-open)."""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.open_seconds:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+                print(f"Circuit breaker [{self.name}]: half-open, sending a probe request.")
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    return False
+                self._probe_in_flight = True
+            return True
+
+    def record_success(self, latency_seconds: float):
+        """A valid answer; latency_seconds is measured as described in the module docstring."""
+        slow = latency_seconds > self.latency_slo_seconds
+        if slow:
+            print(f"Circuit breaker [{self.name}]: {latency_seconds:.1f}s exceeds the {self.latency_slo_seconds:.1f}s SLO.")
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                print(f"Circuit breaker [{self.name}]: probe succeeded, closing.")
+                self.state = self.CLOSED
+                self._outcomes.clear()
+                self._probe_in_flight = False
+            self._record(self.SLOW if slow else self.HEALTHY)
+
+    def record_slow(self):
+        """A request cancelled after it had already run past the SLO (a hedge partner answered first)."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                # No answer, so the probe is inconclusive
+                self._probe_in_flight = False
+                return
+            self._record(self.SLOW)
+
+    def record_failure(self):
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._open()
+                return
+            self._record(self.FAILED)
+
+    def _record(self, outcome: float):
+        self._outcomes.append(outcome)
+        if (self.state == self.CLOSED and len(self._outcomes) >= self.min_requests
+                and sum(self._outcomes) / len(self._outcomes) >= self.failure_rate_threshold):
+            self._open()
+
+    def release_probe(self):
+        """
+        Let another probe through if the current one ended without an outcome.
+
+        Called after every request: a half-open probe that was cancelled (its
+        hedge partner answered first, or a stream was closed early) neither
+        closes nor re-opens the circuit. No-op once the outcome was recorded.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probe_in_flight = False
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self._probe_in_flight = False
+        print(f"Circuit breaker [{self.name}]: open for {self.open_seconds:.0f}s.")
+
+
+def breaker_for(app, service: str) -> CircuitBreaker:
+    """The app's circuit breaker for service, created from fallback_config on first use."""
+    if not hasattr(app, 'circuit_breakers'):
+        app.circuit_breakers = {}
+    breakers: Dict[str, CircuitBreaker] = app.circuit_breakers
+    breaker = breakers.get(service)
+    if breaker is None:
+        fallback_config = app.config.get("fallback_config", {})
+        breaker = breakers[service] = CircuitBreaker(
+            service,
+            failure_rate_threshold=fallback_config.get("failure_rate_threshold", 0.5),
+            window_size=fallback_config.get("window_size", 10),
+            min_requests=fallback_config.get("min_requests", 4),
+            latency_slo_seconds=fallback_config.get("latency_slo_seconds", 8.0),
+            open_seconds=fallback_config.get("open_seconds", 30.0),
+        )
+    return breaker
+
+
+def slo_latency(app, elapsed_seconds: float, response_text: str) -> float:
+    """
+    Latency of a complete() answer for the SLO: the elapsed time minus the time
+    generating response_text takes at fallback_config.slo_output_chars_per_second.
+    """
+    chars_per_second = app.config.get("fallback_config", {}).get("slo_output_chars_per_second", 40.0)
+    return max(0.0, elapsed_seconds - len(response_text or "") / chars_per_second)
+
+
+def service_chain(app, service: str) -> List[str]:
+    """
+    Services to try, in order, for a request addressed to service.
+
+    The requested service always comes first; with fallback enabled, the
+    remaining entries of the configured chain follow. Cloud services other
+    than the requested one are only fallbacks with allow_cloud_fallback, so a
+    transcript never reaches a provider the user did not pick. The chain ends
+    at raw ASR output, where nothing else is tried.
+    """
+    fallback_config = app.config.get("fallback_config", {})
+    if not fallback_config.get("enabled", True):
+        return [service]
+    fallbacks = [name for name in fallback_config.get("chain", DEFAULT_FALLBACK_CHAIN) if name != service]
+    if not fallback_config.get("allow_cloud_fallback", False):
+        fallbacks = [name for name in fallbacks if name not in CLOUD_SERVICES]
+    chain = [service] + fallbacks
+    if RAW_ASR_SERVICE in chain:
+        chain = chain[:chain.index(RAW_ASR_SERVICE)]
+    return chain
@@ -45,6 +45,10 @@ def start_keyboard_listener(app):
 
 def on_global_key_press(app, key):
     app.currently_pressed_keys.add(key)
+
+    if app.asr_residency is not None and key != app.hotkey_key and app.hotkey_modifiers and check_hotkey_modifiers_active(app):
+        # The user is reaching for the recording hotkey: start restoring an idle-offloaded model now
+        app.asr_residency.prefetch()
     
     key_char_val = getattr(key, 'char', None)
     vk_val = getattr(key, 'vk', None)
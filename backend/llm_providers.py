@@ -0,0 +1,684 @@
+"""
+Unified LLM provider layer for transcript refinement.
+
+Every text-processing backend (Mistral, Gemini, Ollama) implements the same
+small asyncio interface: complete() for a whole response and stream() for
+tokens. All providers run on one background event loop (AsyncRuntime), so each
+keeps a single long-lived client with a keep-alive (HTTP/2 where available)
+connection pool. warm_up() opens those connections right after the provider is
+created, so TCP/TLS setup is paid at startup instead of on the first dictation.
+
+The static instructions are sent as a byte-stable system message ahead of the
+transcript so providers can reuse the prompt prefix: Gemini binds it as the
+system instruction, or with provider_cache_config.gemini_context_cache (off by
+default, since cache storage is billed) serves it from an explicit context
+cache (CachedContent), Mistral's prompt caching sees the same
+prefix on every request, and Ollama keeps the model, and with it the KV cache
+of the prefix, loaded between dictations through keep_alive.
+
+Prompt assembly and response post-processing are shared by all providers;
+refine_transcript() and stream_refinement() are the synchronous entry points
+used by the rest of the app.
+"""
+import abc
+import asyncio
+import datetime
+import importlib.util
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Dict, Generator, List, Optional, Tuple
+
+from .circuit_breaker import CircuitBreaker, breaker_for, service_chain, slo_latency
+from .metrics import latency
+from .response_cache import make_cache_key, response_cache_for
+from .prompts import get_prompt_template
+
+DEFAULT_MISTRAL_MODEL_NAME = "mistral-medium-latest"
+DEFAULT_GEMINI_MODEL_NAME = "gemini-2.0-flash"
+TEMPERATURE = 0.05
+REQUEST_TIMEOUT_SECONDS = 60.0
+KEEPALIVE_EXPIRY_SECONDS = 300.0
+DEFAULT_GEMINI_CACHE_TTL_MINUTES = 60
+# Re-create a Gemini context cache this long before it expires server-side
+GEMINI_CACHE_RENEW_MARGIN_SECONDS = 60.0
+DEFAULT_OLLAMA_KEEP_ALIVE = "30m"
+
+GEMINI_SAFETY_SETTINGS = [
+    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
+]
+
+
+class AsyncRuntime:
+    """A background thread running the asyncio event loop shared by all providers."""
+
+    _END = object()
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="axo-llm-runtime", daemon=True).start()
+            return self._loop
+
+    def submit(self, coro) -> Future:
+        """Schedule a coroutine on the runtime loop from any thread."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout: Optional[float] = REQUEST_TIMEOUT_SECONDS):
+        """Run a coroutine on the runtime loop and block until it finishes."""
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def iterate(self, async_iterator: AsyncIterator, timeout: Optional[float] = REQUEST_TIMEOUT_SECONDS) -> Generator:
+        """
+        Consume an async iterator on the runtime loop and yield its items synchronously.
+
+        timeout applies to the wait for each item. Closing the generator early
+        cancels the underlying iteration (and with it the HTTP request).
+        """
+        items: queue.Queue = queue.Queue()
+
+        async def pump():
+            try:
+                async for item in async_iterator:
+                    items.put((True, item))
+            except BaseException as e:
+                items.put((False, e))
+            finally:
+                items.put((True, self._END))
+
+        future = self.submit(pump())
+        try:
+            while True:
+                ok, item = items.get(timeout=timeout)
+                if not ok:
+                    raise item
+                if item is self._END:
+                    return
+                yield item
+        finally:
+            future.cancel()
+
+
+# Global runtime shared by all providers
+runtime = AsyncRuntime()
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class LLMProvider(abc.ABC):
+    """Interface implemented by every text-processing backend."""
+
+    name = "LLM"
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    @abc.abstractmethod
+    async def complete(self, messages: List[Dict[str, str]], model_name: Optional[str] = None,
+                       temperature: float = TEMPERATURE) -> str:
+        """Return the full response text for a chat-style message list; model_name overrides self.model_name."""
+
+    @abc.abstractmethod
+    def stream(self, messages: List[Dict[str, str]], model_name: Optional[str] = None,
+               temperature: float = TEMPERATURE) -> AsyncIterator[str]:
+        """Async iterator over response text fragments; model_name overrides self.model_name."""
+
+    async def warm_up(self):
+        """Open pooled connections ahead of the first real request."""
+
+    async def aclose(self):
+        """Release pooled connections."""
+
+
+class MistralProvider(LLMProvider):
+    name = "Mistral"
+
+    def __init__(self, api_key: str, model_name: str = DEFAULT_MISTRAL_MODEL_NAME):
+        super().__init__(model_name)
+        import httpx
+        from mistralai import Mistral
+
+        self.api_key = api_key
+        limits = httpx.Limits(max_keepalive_connections=4, keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS)
+        timeout = httpx.Timeout(REQUEST_TIMEOUT_SECONDS, connect=10.0)
+        self.http_client = httpx.Client(http2=_http2_available(), limits=limits, timeout=timeout)
+        self.async_http_client = httpx.AsyncClient(http2=_http2_available(), limits=limits, timeout=timeout)
+        # The sync client stays available as app.mistral_client for code that calls the SDK directly
+        self.client = Mistral(api_key=api_key, client=self.http_client, async_client=self.async_http_client)
+
+    async def complete(self, messages, model_name=None, temperature=TEMPERATURE) -> str:
+        response = await self.client.chat.complete_async(
+            model=model_name or self.model_name, messages=messages, temperature=temperature
+        )
+        if not response or not response.choices:
+            raise ValueError("Mistral API returned invalid response structure")
+        return response.choices[0].message.content or ""
+
+    async def stream(self, messages, model_name=None, temperature=TEMPERATURE):
+        response = await self.client.chat.stream_async(
+            model=model_name or self.model_name, messages=messages, temperature=temperature
+        )
+        async for event in response:
+            choice = event.data.choices[0]
+            if choice.delta.content:
+                yield choice.delta.content
+            if choice.finish_reason == "stop":
+                break
+
+    async def warm_up(self):
+        await self.client.models.list_async()
+
+    async def aclose(self):
+        await self.async_http_client.aclose()
+        self.http_client.close()
+
+
+class GeminiProvider(LLMProvider):
+    name = "Gemini"
+
+    def __init__(self, api_key: str, model_name: str = DEFAULT_GEMINI_MODEL_NAME, context_cache: bool = False,
+                 cache_ttl_minutes: float = DEFAULT_GEMINI_CACHE_TTL_MINUTES):
+        super().__init__(model_name)
+        import google.generativeai as genai
+
+        self.api_key = api_key
+        self._genai = genai
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name=model_name, safety_settings=GEMINI_SAFETY_SETTINGS)
+        self.context_cache = context_cache
+        self.cache_ttl = datetime.timedelta(minutes=cache_ttl_minutes)
+        # (model name, system prompt) -> (model bound to it, monotonic renewal deadline, CachedContent or None)
+        self._prefix_models: Dict[Tuple[str, str], Tuple[Any, float, Any]] = {}
+        self._prefix_lock = asyncio.Lock()
+
+    @staticmethod
+    def _prompt(messages) -> str:
+        # Gemini takes a single prompt; system and user parts are joined in order
+        return "\n\n".join(message["content"] for message in messages)
+
+    def _generation_config(self, temperature, **kwargs):
+        return self._genai.types.GenerationConfig(temperature=temperature, **kwargs)
+
+    async def _model_and_prompt(self, messages, model_name: Optional[str] = None) -> Tuple[Any, str]:
+        """The model to call and the prompt left to send once the system message is bound to the model."""
+        model_name = model_name or self.model_name
+        if not messages or messages[0]["role"] != "system":
+            if model_name == self.model_name:
+                return self.model, self._prompt(messages)
+            model = self._genai.GenerativeModel(model_name=model_name, safety_settings=GEMINI_SAFETY_SETTINGS)
+            return model, self._prompt(messages)
+        key = (model_name, messages[0]["content"])
+        async with self._prefix_lock:
+            entry = self._prefix_models.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                entry = self._prefix_models[key] = await self._bind_system_prompt(model_name, key[1])
+        return entry[0], self._prompt(messages[1:])
+
+    async def _bind_system_prompt(self, model_name: str, system_prompt: str) -> Tuple[Any, float, Any]:
+        """
+        Create a context cache holding system_prompt and a model reading from it.
+
+        Context caching has a minimum prompt size and is not offered for every
+        model; when creation fails the prompt is passed as system_instruction
+        instead, which keeps the same stable prefix without the explicit cache.
+        """
+        genai = self._genai
+        if self.context_cache:
+            try:
+                cached_content = await asyncio.to_thread(
+                    genai.caching.CachedContent.create,
+                    model=model_name, system_instruction=system_prompt, ttl=self.cache_ttl
+                )
+                model = genai.GenerativeModel.from_cached_content(cached_content, safety_settings=GEMINI_SAFETY_SETTINGS)
+                renew_at = time.monotonic() + self.cache_ttl.total_seconds() - GEMINI_CACHE_RENEW_MARGIN_SECONDS
+                print(f"Gemini: created context cache {cached_content.name} for the system prompt.")
+                return model, renew_at, cached_content
+            except Exception as e:
+                print(f"Gemini: context cache unavailable, sending the system prompt inline: {e}")
+        model = genai.GenerativeModel(model_name=model_name, safety_settings=GEMINI_SAFETY_SETTINGS,
+                                      system_instruction=system_prompt)
+        return model, float("inf"), None
+
+    async def complete(self, messages, model_name=None, temperature=TEMPERATURE) -> str:
+        model, prompt = await self._model_and_prompt(messages, model_name)
+        response = await model.generate_content_async(
+            prompt, generation_config=self._generation_config(temperature)
+        )
+        return response.text
+
+    async def stream(self, messages, model_name=None, temperature=TEMPERATURE):
+        model, prompt = await self._model_and_prompt(messages, model_name)
+        response = await model.generate_content_async(
+            prompt,
+            generation_config=self._generation_config(temperature, max_output_tokens=2048),
+            stream=True
+        )
+        async for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                # Chunks without text parts (e.g. safety metadata only)
+                continue
+            if text:
+                yield text
+
+    async def warm_up(self):
+        # Opens the gRPC channel on the runtime loop
+        await self.model.count_tokens_async("ping")
+
+    async def aclose(self):
+        cached_contents = [entry[2] for entry in self._prefix_models.values() if entry[2] is not None]
+        self._prefix_models.clear()
+        for cached_content in cached_contents:
+            try:
+                await asyncio.to_thread(cached_content.delete)
+            except Exception as e:
+                print(f"Gemini: failed to delete context cache {cached_content.name}: {e}")
+
+
+class OllamaProvider(LLMProvider):
+    name = "Ollama"
+
+    def __init__(self, base_url: str, model_name: str = "", keep_alive: Any = DEFAULT_OLLAMA_KEEP_ALIVE):
+        super().__init__(model_name)
+        import ollama
+
+        self.base_url = base_url
+        # How long the server keeps the model (and the KV cache of the shared prompt prefix) loaded
+        self.keep_alive = keep_alive
+        self.client = ollama.AsyncClient(host=base_url)
+
+    async def complete(self, messages, model_name=None, temperature=TEMPERATURE) -> str:
+        response = await self.client.chat(
+            model=model_name or self.model_name, messages=messages, options={"temperature": temperature},
+            keep_alive=self.keep_alive
+        )
+        return response['message']['content']
+
+    async def stream(self, messages, model_name=None, temperature=TEMPERATURE):
+        response = await self.client.chat(
+            model=model_name or self.model_name, messages=messages,
+            options={"temperature": temperature}, stream=True, keep_alive=self.keep_alive
+        )
+        async for chunk in response:
+            content = chunk['message']['content']
+            if content:
+                yield content
+
+    async def warm_up(self):
+        await self.client.list()
+
+
+def register_provider(app, provider: LLMProvider):
+    """Make provider the active backend for its service and pre-warm its connections."""
+    if not hasattr(app, 'llm_providers'):
+        app.llm_providers = {}
+    providers = app.llm_providers
+    previous = providers.get(provider.name)
+    providers[provider.name] = provider
+    if previous is not None and previous is not provider:
+        runtime.submit(previous.aclose())
+
+    def report_warm_up(future):
+        error = future.exception() if not future.cancelled() else None
+        if error is not None:
+            print(f"{provider.name}: connection warm-up failed: {error}")
+    runtime.submit(provider.warm_up()).add_done_callback(report_warm_up)
+
+
+def unregister_provider(app, service: str):
+    provider = getattr(app, 'llm_providers', {}).pop(service, None)
+    if provider is not None:
+        runtime.submit(provider.aclose())
+
+
+def get_provider(app, service: str) -> Optional[LLMProvider]:
+    return getattr(app, 'llm_providers', {}).get(service)
+
+
+def services_in_use(app) -> List[str]:
+    """Services that need a provider: the selected one, its fallback chain and the hedging secondary."""
+    services = service_chain(app, app.config.get("models_config", {}).get("text_processing_service", "Mistral"))
+    hedging_config = app.config.get("hedging_config", {})
+    if hedging_config.get("enabled", False) and hedging_config.get("secondary_service") not in services:
+        services.append(hedging_config.get("secondary_service"))
+    return services
+
+
+def configured_model_name(app, service: str) -> str:
+    models_config = app.config.get("models_config", {})
+    if service == "Mistral":
+        return models_config.get("mistral_model_name", DEFAULT_MISTRAL_MODEL_NAME)
+    if service == "Gemini":
+        return models_config.get("gemini_model_name", DEFAULT_GEMINI_MODEL_NAME)
+    if service == "Ollama":
+        return models_config.get("ollama_model_name", "")
+    return ""
+
+
+def build_messages(app, text: str, mode: str) -> List[Dict[str, str]]:
+    """Chat messages for refining text in the given operation mode."""
+    with latency.measure("prompt_build"):
+        language_code = app.config.get("language_config", {}).get("target_language", "en")
+        preserve_original_languages = app.config.get("language_config", {}).get("preserve_original_languages", True)
+
+        target_language = app.config.get("coder_config", {}).get("target_language", "Python") if mode == "coder" else None
+        return get_prompt_template(mode, language_code, preserve_original_languages, target_language).render(text)
+
+
+def postprocess_response(refined_text: str, mode: str) -> str:
+    """Strip code fences and wrapping quotes the models add around the result."""
+    refined_text = refined_text.strip()
+    if mode == "coder":
+        return refined_text
+    if mode == "prompt_engineer":
+        if refined_text.startswith("```xml") and refined_text.endswith("```"):
+            refined_text = refined_text.removeprefix("```xml").removesuffix("```").strip()
+        elif refined_text.startswith("```") and refined_text.endswith("```"):
+            refined_text_lines = refined_text.splitlines()
+            if len(refined_text_lines) > 1 and refined_text_lines[0].strip().lower().removeprefix("```").startswith("xml"):
+                refined_text = "\n".join(refined_text_lines[1:-1]).strip()
+            else:
+                refined_text = refined_text.removeprefix("```").removesuffix("```").strip()
+    elif mode == "email":
+        if refined_text.startswith("```") and refined_text.endswith("```"):
+            refined_text_lines = refined_text.splitlines()
+            if len(refined_text_lines) > 1 and refined_text_lines[0].strip().lower().removeprefix("```") in ["", "text", "email"]:
+                refined_text = "\n".join(refined_text_lines[1:-1]).strip()
+            else:
+                refined_text = refined_text.removeprefix("```").removesuffix("```").strip()
+        if (refined_text.startswith('"') and refined_text.endswith('"')) or \
+           (refined_text.startswith("'") and refined_text.endswith("'")):
+            refined_text = refined_text[1:-1]
+    else: # Typer mode
+        if not (refined_text.startswith("+ ") or refined_text.startswith("1.")):
+            if (refined_text.startswith('"') and refined_text.endswith('"')) or \
+               (refined_text.startswith("'") and refined_text.endswith("'")):
+                refined_text = refined_text[1:-1]
+    return refined_text
+
+
+async def _timed_complete(provider: LLMProvider, messages, model_name) -> Tuple[str, float]:
+    """provider.complete() and its duration, recorded in the provider's latency histogram."""
+    started = time.perf_counter()
+    response_text = await provider.complete(messages, model_name)
+    elapsed = time.perf_counter() - started
+    latency.record(f"llm:{provider.name}", elapsed)
+    return response_text, elapsed
+
+
+def hedge_delay_seconds(app, service: str) -> float:
+    """
+    How long to wait for the primary provider before also asking the secondary.
+
+    With auto_tune, this is the primary's recent latency percentile (p95 by
+    default) once enough samples exist, so the hedge only fires on its slow
+    tail; otherwise the configured hedge_delay_ms is used.
+    """
+    hedging_config = app.config.get("hedging_config", {})
+    delay = hedging_config.get("hedge_delay_ms", 1500) / 1000
+    if hedging_config.get("auto_tune", True) and \
+            latency.samples(f"llm:{service}").size >= hedging_config.get("min_samples", 20):
+        delay = latency.percentile(f"llm:{service}", hedging_config.get("percentile", 95))
+    return min(max(delay, hedging_config.get("min_delay_ms", 250) / 1000), hedging_config.get("max_delay_ms", 10000) / 1000)
+
+
+async def _hedged_complete(primary: LLMProvider, primary_model: str, secondary: LLMProvider,
+                           secondary_model: str, messages, hedge_delay: float):
+    """
+    Race primary against secondary, starting secondary after hedge_delay (or as
+    soon as primary fails). Returns (winning provider, response text, its
+    duration, whether primary failed, seconds primary had run when it was
+    cancelled or None); the losing request is cancelled. The last two let the
+    caller settle the primary's circuit breaker when secondary wins.
+
+    A cancelled primary is recorded in its latency histogram at the time it
+    had run so far (it would have taken at least that long). Leaving it out
+    would drop exactly the slow tail that hedge_delay_seconds() tunes on, and
+    the hedge would fire more and more often.
+    """
+    started = time.perf_counter()
+    primary_task = asyncio.ensure_future(_timed_complete(primary, messages, primary_model))
+    tasks = {primary_task: primary}
+    done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+    if primary_task in done and not primary_task.exception() and (primary_task.result()[0] or "").strip():
+        return (primary,) + primary_task.result() + (False, None)
+
+    print(f"Hedging: {primary.name} slow or failed after {hedge_delay:.2f}s, also asking {secondary.name}.")
+    tasks[asyncio.ensure_future(_timed_complete(secondary, messages, secondary_model))] = secondary
+    pending = {task for task in tasks if not task.done()}
+    last_error: Optional[BaseException] = primary_task.exception() if primary_task.done() else None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    last_error = task.exception()
+                elif (task.result()[0] or "").strip():
+                    primary_cancelled_after = time.perf_counter() - started if primary_task in pending else None
+                    return (tasks[task],) + task.result() + (primary_task.done() and task is not primary_task,
+                                                             primary_cancelled_after)
+    finally:
+        if primary_task in pending:
+            latency.record(f"llm:{primary.name}", time.perf_counter() - started)
+        for task in pending:
+            task.cancel()
+    raise last_error or ValueError("all hedged requests returned empty responses")
+
+
+def _model_for(app, service: str) -> str:
+    provider = get_provider(app, service)
+    return configured_model_name(app, service) or (provider.model_name if provider is not None else "")
+
+
+def _response_cache_key(app, service: str, mode: str, text: str) -> str:
+    language_config = app.config.get("language_config", {})
+    language_settings = {
+        "target_language": language_config.get("target_language", "en"),
+        "preserve_original_languages": language_config.get("preserve_original_languages", True),
+    }
+    if mode == "coder":
+        language_settings["coder_target_language"] = app.config.get("coder_config", {}).get("target_language", "Python")
+    return make_cache_key(service, _model_for(app, service), mode, language_settings, text)
+
+
+def _cache_for_text(app, text: str):
+    """The response cache if this transcript is short enough to be worth caching."""
+    max_chars = app.config.get("response_cache_config", {}).get("max_transcript_chars", 500)
+    return response_cache_for(app) if len(text.strip()) <= max_chars else None
+
+
+def _hedge_partner(app, provider: LLMProvider) -> Optional[LLMProvider]:
+    """The provider to hedge requests to provider with, if hedging is enabled and it is healthy."""
+    hedging_config = app.config.get("hedging_config", {})
+    if not hedging_config.get("enabled", False):
+        return None
+    secondary = get_provider(app, hedging_config.get("secondary_service"))
+    if secondary is None or secondary is provider or breaker_for(app, secondary.name).state != CircuitBreaker.CLOSED:
+        return None
+    return secondary
+
+
+def refine_transcript(app, text: str, service: Optional[str] = None, mode: Optional[str] = None,
+                      split_long: bool = True, raw_on_failure: bool = True,
+                      record_latency: bool = False) -> Optional[str]:
+    """
+    Refine a transcript with an LLM provider.
+
+    service and mode default to the configured text-processing service and
+    operation mode. Services whose circuit breaker is open are skipped without
+    a request, and a failed or empty answer moves on to the next service in
+    the fallback chain. With hedging_config enabled, each request also goes to
+    the secondary service if no answer arrived within the hedge delay, and the
+    first valid answer wins. If every service fails, the raw transcript is
+    returned unchanged, or None with raw_on_failure=False. Short transcripts are answered from the response
+    cache when the same request was made before. Long transcripts are split
+    and refined in parallel chunks unless split_long is False (see
+    backend/long_input.py). With record_latency, the time until a provider
+    answered is recorded as the llm_complete stage; cache hits and failures
+    are not recorded.
+    """
+    if not text or not text.strip():
+        print("No text from ASR to refine.")
+        return ""
+    started = time.perf_counter()
+    service = service or app.config.get("models_config", {}).get("text_processing_service", "Mistral")
+    mode = mode or app.config.get("mode_config", {}).get("operation_mode", "typer")
+    messages = None
+
+    if split_long:
+        from .long_input import long_input_applies, refine_long_transcript
+        if long_input_applies(app, text, mode):
+            refined_text = refine_long_transcript(app, text, service, mode)
+            if record_latency:
+                latency.record("llm_complete", time.perf_counter() - started)
+            return refined_text
+
+    cache = _cache_for_text(app, text)
+    if cache is not None:
+        cached_text = cache.get(_response_cache_key(app, service, mode, text))
+        if cached_text is not None:
+            print(f"Using cached {service} response.")
+            return postprocess_response(cached_text, mode)
+
+    for candidate in service_chain(app, service):
+        provider = get_provider(app, candidate)
+        if provider is None:
+            print(f"{candidate} client not initialized. Skipping.")
+            continue
+        breaker = breaker_for(app, candidate)
+        if not breaker.allow_request():
+            print(f"{candidate} circuit is open. Skipping.")
+            continue
+
+        model_name = configured_model_name(app, candidate) or provider.model_name
+        print(f"Refining text with {candidate} (Model: {model_name}, Mode: {mode})...")
+        if messages is None:
+            messages = build_messages(app, text, mode)
+        secondary = _hedge_partner(app, provider)
+        try:
+            if secondary is not None:
+                winner, response_text, elapsed, primary_failed, primary_cancelled_after = runtime.run(_hedged_complete(
+                    provider, model_name, secondary, configured_model_name(app, secondary.name) or secondary.model_name,
+                    messages, hedge_delay_seconds(app, candidate)
+                ))
+                if primary_failed:
+                    breaker.record_failure()
+                elif primary_cancelled_after is not None and primary_cancelled_after > breaker.latency_slo_seconds:
+                    breaker.record_slow()
+            else:
+                winner = provider
+                response_text, elapsed = runtime.run(_timed_complete(provider, messages, model_name))
+        except Exception as e:
+            print(f"{candidate} API call failed: {e}")
+            breaker.record_failure()
+            continue
+        else:
+            if not response_text or not response_text.strip():
+                print(f"{winner.name} API returned empty response")
+                breaker_for(app, winner.name).record_failure()
+                continue
+            breaker_for(app, winner.name).record_success(slo_latency(app, elapsed, response_text))
+        finally:
+            # If the secondary won, the candidate's half-open probe was cancelled without an outcome
+            breaker.release_probe()
+
+        if cache is not None and winner.name == service:
+            # Answers from a hedge partner or a fallback are not cached: they would be
+            # served as the requested service's answer even after it recovered
+            cache.put(_response_cache_key(app, service, mode, text), response_text)
+        if record_latency:
+            latency.record("llm_complete", time.perf_counter() - started)
+        refined_text = postprocess_response(response_text, mode)
+        print(f"{winner.name} refined text (Mode: {mode}):\n{refined_text}")
+        return refined_text
+
+    if not raw_on_failure:
+        print("No text-processing service available.")
+        return None
+    print("No text-processing service available. Using raw ASR output.")
+    return text
+
+
+def stream_refinement(app, text: str, mode: str, service: Optional[str] = None) -> Generator[Dict[str, Any], None, None]:
+    """
+    Stream a refinement as {"type": "token"|"final"|"error", "content": ...} dicts.
+
+    Like refine_transcript, unhealthy services are skipped and a stream that
+    fails before its first token falls through to the next service in the
+    fallback chain. A cached response is replayed as a single token, and its
+    "final" update carries "cached": True.
+    """
+    service = service or app.config.get("models_config", {}).get("text_processing_service", "Mistral")
+    messages = None
+    last_error = f"{service} client not initialized"
+
+    cache = _cache_for_text(app, text)
+    if cache is not None:
+        cached_text = cache.get(_response_cache_key(app, service, mode, text))
+        if cached_text is not None:
+            yield {"type": "token", "content": cached_text}
+            yield {"type": "final", "cached": True}
+            return
+
+    for candidate in service_chain(app, service):
+        provider = get_provider(app, candidate)
+        if provider is None:
+            continue
+        model_name = configured_model_name(app, candidate) or provider.model_name
+        if not model_name:
+            last_error = f"No {candidate} model selected"
+            continue
+        breaker = breaker_for(app, candidate)
+        if not breaker.allow_request():
+            last_error = f"{candidate} circuit is open"
+            continue
+        if messages is None:
+            messages = build_messages(app, text, mode)
+
+        started = time.perf_counter()
+        first_token_latency = None
+        tokens = []
+        tokens_sent = False
+        try:
+            for token in runtime.iterate(provider.stream(messages, model_name)):
+                if first_token_latency is None:
+                    first_token_latency = time.perf_counter() - started
+                tokens_sent = True
+                tokens.append(token)
+                yield {"type": "token", "content": token}
+        except Exception as e:
+            breaker.record_failure()
+            last_error = f"{candidate} streaming error: {str(e)}"
+            if tokens_sent:
+                break
+            continue
+        else:
+            # Streams are judged on time to first token; generation time follows the answer's length
+            breaker.record_success(first_token_latency if first_token_latency is not None else time.perf_counter() - started)
+        finally:
+            # Also runs when the consumer closes the generator mid-stream
+            breaker.release_probe()
+        if cache is not None and candidate == service and "".join(tokens).strip():
+            cache.put(_response_cache_key(app, service, mode, text), "".join(tokens))
+        yield {"type": "final"}
+        return
+
+    yield {"type": "error", "content": last_error}
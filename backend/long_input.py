@@ -0,0 +1,104 @@
+"""
+Map-reduce refinement for long transcripts.
+
+A long dictation sent as one request makes the model generate every output
+token serially. Above long_input_config.threshold_chars the transcript is
+split at paragraph and sentence boundaries into chunks of about chunk_chars,
+the chunks are refined concurrently by a bounded worker pool and the results
+are reassembled in order, so wall-clock time follows the chunk count rather
+than the total length.
+
+Chunks are refined in Typer mode, which works sentence by sentence. Email and
+Prompt Engineer restructure the whole text, so by default they are refined in
+one piece. With merge_pass, they are split too, and the cleaned-up chunks then
+go through a final pass in the selected mode. That final pass is a full serial
+refinement, so it only pays off when a slow model struggles with the raw
+input. Coder mode is never split.
+"""
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from .llm_providers import refine_transcript
+
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+SENTENCE_BREAK = re.compile(r"(?<=[.!?…])\s+")
+MERGE_MODES = ("email", "prompt_engineer")
+
+
+def long_input_applies(app, text: str, mode: str) -> bool:
+    long_input_config = app.config.get("long_input_config", {})
+    if not long_input_config.get("enabled", True) or mode == "coder":
+        return False
+    if mode in MERGE_MODES and not long_input_config.get("merge_pass", False):
+        return False
+    return len(text) > long_input_config.get("threshold_chars", 2500)
+
+
+def split_transcript(text: str, chunk_chars: int) -> List[Tuple[str, str]]:
+    """
+    Split text into (chunk, separator) pairs of at most about chunk_chars.
+
+    Chunks never straddle a paragraph; sentences are packed greedily and only
+    a single sentence longer than chunk_chars is cut between words. separator
+    is what followed the chunk in the original ("\\n\\n" or " ").
+    """
+    chunks: List[Tuple[str, str]] = []
+    for paragraph in PARAGRAPH_BREAK.split(text.strip()):
+        current = ""
+        for sentence in SENTENCE_BREAK.split(paragraph.strip()):
+            for piece in _split_words(sentence, chunk_chars):
+                if current and len(current) + 1 + len(piece) > chunk_chars:
+                    chunks.append((current, " "))
+                    current = piece
+                else:
+                    current = f"{current} {piece}" if current else piece
+        if current:
+            chunks.append((current, "\n\n"))
+    return chunks
+
+
+def _split_words(sentence: str, chunk_chars: int) -> List[str]:
+    if len(sentence) <= chunk_chars:
+        return [sentence] if sentence else []
+    pieces, current = [], ""
+    for word in sentence.split():
+        if current and len(current) + 1 + len(word) > chunk_chars:
+            pieces.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def refine_long_transcript(app, text: str, service: Optional[str] = None, mode: Optional[str] = None) -> str:
+    """Refine text chunk by chunk in parallel and reassemble it (see module docstring)."""
+    long_input_config = app.config.get("long_input_config", {})
+    mode = mode or app.config.get("mode_config", {}).get("operation_mode", "typer")
+    chunks = split_transcript(text, long_input_config.get("chunk_chars", 1000))
+    max_workers = max(1, min(long_input_config.get("max_workers", 4), len(chunks)))
+    print(f"Long input: refining {len(chunks)} chunks with {max_workers} workers (Mode: {mode}).")
+
+    def refine_chunk(chunk: str) -> Optional[str]:
+        return refine_transcript(app, chunk, service=service, mode="typer", split_long=False, raw_on_failure=False)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="axo-long-input") as pool:
+        refined_chunks = list(pool.map(refine_chunk, [chunk for chunk, _ in chunks]))
+
+    if any(refined is None for refined in refined_chunks):
+        # Mixing refined and raw chunks would read unevenly; one request for the whole text
+        # falls back to the raw transcript on its own if no service answers
+        print(f"Long input: {refined_chunks.count(None)} of {len(chunks)} chunks could not be refined; "
+              "refining the whole transcript in one piece.")
+        return refine_transcript(app, text, service=service, mode=mode, split_long=False)
+
+    merged = "".join(
+        refined + (separator if i < len(chunks) - 1 else "")
+        for i, (refined, (_, separator)) in enumerate(zip(refined_chunks, chunks))
+    )
+    if mode in MERGE_MODES:
+        # The chunks are already corrected; this pass only applies the mode's structure
+        return refine_transcript(app, merged, service=service, mode=mode, split_long=False)
+    return merged
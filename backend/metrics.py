@@ -0,0 +1,74 @@
+"""
+Lightweight in-process latency metrics for the dictation pipeline.
+
+Each pipeline stage (concat, asr, prompt_build, llm_first_token, llm_complete,
+clipboard) records its duration into a bounded per-stage sample window, from
+which percentiles are computed on demand. Recording is cheap enough to stay
+enabled in normal use; the benchmarks read the same recorder.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterable, Optional
+
+import numpy as np
+
+DEFAULT_MAX_SAMPLES = 1000
+
+
+class LatencyRecorder:
+    """Thread-safe per-stage latency samples (seconds) with percentile summaries."""
+
+    def __init__(self, max_samples: int = DEFAULT_MAX_SAMPLES):
+        self.max_samples = max_samples
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.max_samples)
+            samples.append(seconds)
+
+    @contextmanager
+    def measure(self, stage: str):
+        """Context manager recording the wall time of its body under stage."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started)
+
+    def samples(self, stage: str) -> np.ndarray:
+        with self._lock:
+            return np.array(self._samples.get(stage, ()), dtype=np.float64)
+
+    def percentile(self, stage: str, q: float) -> Optional[float]:
+        """q-th percentile of stage in seconds, or None if nothing was recorded."""
+        values = self.samples(stage)
+        return float(np.percentile(values, q)) if values.size else None
+
+    def summary(self, percentiles: Iterable[float] = (50, 95, 99)) -> Dict[str, Dict[str, float]]:
+        """{stage: {"count", "mean_ms", "p50_ms", ...}} for every recorded stage."""
+        with self._lock:
+            stages = list(self._samples)
+        result = {}
+        for stage in stages:
+            values = self.samples(stage) * 1000
+            if not values.size:
+                continue
+            stats = {"count": int(values.size), "mean_ms": float(values.mean())}
+            for q in percentiles:
+                stats[f"p{q:g}_ms"] = float(np.percentile(values, q))
+            result[stage] = stats
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+
+# Global recorder shared by the pipeline stages
+latency = LatencyRecorder()
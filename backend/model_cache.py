@@ -0,0 +1,116 @@
+"""
+Local, versioned cache of the restored ASR model.
+
+from_pretrained() resolves the model through the NeMo/Hugging Face cache and
+then unpacks the .nemo archive into a temporary directory on every launch.
+This module keeps an already-extracted copy of the archive (config, tokenizer
+artifacts and weights) on disk and restores the model from that directory
+directly, skipping the download check and the unpack step.
+"""
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+from typing import Any, Dict, Tuple
+
+MODEL_CACHE_DIR = os.path.join("models", "nemo")
+CACHE_FORMAT_VERSION = 1
+
+
+def _cache_dir_for(model_name: str) -> str:
+    return os.path.join(MODEL_CACHE_DIR, model_name.replace("/", "__"))
+
+
+def _cache_fingerprint(model_name: str) -> Dict[str, Any]:
+    """Everything that must match for a cached model to be reusable."""
+    import nemo
+    import torch
+
+    return {
+        "model_name": model_name,
+        "format_version": CACHE_FORMAT_VERSION,
+        "nemo_version": getattr(nemo, "__version__", "unknown"),
+        "torch_version": torch.__version__,
+    }
+
+
+def is_cache_valid(model_name: str) -> bool:
+    """True if a complete cache entry exists for this model and library versions."""
+    manifest_path = os.path.join(_cache_dir_for(model_name), "manifest.json")
+    if not os.path.exists(manifest_path):
+        return False
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except Exception as e:
+        print(f"ASR model cache manifest unreadable: {e}")
+        return False
+    return manifest.get("fingerprint") == _cache_fingerprint(model_name)
+
+
+def restore_from_cache(model_name: str, map_location=None):
+    """Restore the model from the extracted cache directory without unpacking an archive."""
+    import nemo.collections.asr as nemo_asr
+    from nemo.core.connectors.save_restore_connector import SaveRestoreConnector
+
+    extracted_dir = os.path.join(_cache_dir_for(model_name), "extracted")
+    connector = SaveRestoreConnector()
+    connector.model_extracted_dir = extracted_dir
+    return nemo_asr.models.ASRModel.restore_from(
+        restore_path=extracted_dir,
+        save_restore_connector=connector,
+        map_location=map_location
+    )
+
+
+def populate_cache(model, model_name: str):
+    """
+    Write the restored model to the cache as an extracted archive.
+
+    The entry is assembled in a temporary directory and moved into place with
+    the manifest written last, so a crash never leaves a half-written entry
+    that looks valid.
+    """
+    cache_dir = _cache_dir_for(model_name)
+    os.makedirs(MODEL_CACHE_DIR, exist_ok=True)
+    staging_dir = tempfile.mkdtemp(prefix="axo_model_cache_", dir=MODEL_CACHE_DIR)
+    try:
+        archive_path = os.path.join(staging_dir, "model.nemo")
+        model.save_to(archive_path)
+        with tarfile.open(archive_path, "r:*") as archive:
+            archive.extractall(os.path.join(staging_dir, "extracted"))
+        os.remove(archive_path)
+
+        if os.path.exists(cache_dir):
+            shutil.rmtree(cache_dir)
+        os.replace(staging_dir, cache_dir)
+        with open(os.path.join(cache_dir, "manifest.json"), 'w', encoding='utf-8') as f:
+            json.dump({"fingerprint": _cache_fingerprint(model_name), "created": time.time()}, f, indent=2)
+        print(f"ASR model cached in {cache_dir} for fast startup.")
+    except Exception as e:
+        print(f"Could not write ASR model cache: {e}")
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def load_asr_model_cached(model_name: str) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Load the ASR model, preferring the local cache.
+
+    Returns:
+        Tuple of (model, metrics) where metrics has 'source' ("cache" or
+        "pretrained") and 'load_seconds'.
+    """
+    started = time.perf_counter()
+    if is_cache_valid(model_name):
+        try:
+            model = restore_from_cache(model_name)
+            return model, {"source": "cache", "load_seconds": time.perf_counter() - started}
+        except Exception as e:
+            print(f"ASR model cache unusable, falling back to from_pretrained: {e}")
+
+    import nemo.collections.asr as nemo_asr
+
+    model = nemo_asr.models.ASRModel.from_pretrained(model_name)
+    return model, {"source": "pretrained", "load_seconds": time.perf_counter() - started}
@@ -0,0 +1,177 @@
+"""
+Type-as-it-streams output: refined text reaches the focused window while the
+LLM is still generating.
+
+Streamed tokens are buffered until a sentence (or line) is complete and then
+pasted; nothing already pasted can be taken back, so only finished sentences
+are considered stable. Each paste costs a clipboard write, a short settle
+delay and a Ctrl+V, so segments that finalize close together are coalesced
+into one paste by a single worker thread.
+
+The batch path runs the answer through postprocess_response, which strips a
+code fence or quotes wrapped around the whole result. Whether a streamed
+answer is wrapped is only known at its end, so an answer that opens with a
+fence or quote character is held back and pasted in one piece, post-processed,
+when the stream finishes.
+"""
+import queue
+import re
+import threading
+import time
+from typing import Optional, Tuple
+
+from .llm_providers import postprocess_response
+from .speculative import strip_overlap
+
+# A sentence end followed by whitespace, or a newline. The whitespace is pasted with the
+# next segment, so nothing trails the last sentence of the answer.
+STABLE_BOUNDARY = re.compile(r"(?:[.!?…:;]['\")\]]*\s+|\n+)")
+# Modes whose raw stream is pasteable as-is (others are post-processed or wrapped in fences)
+INCREMENTAL_MODES = ("typer", "email")
+# Characters an answer wrapped in a fence or quotes starts with
+WRAPPER_PREFIXES = ("`", '"', "'")
+
+
+def incremental_output_enabled(app, mode: Optional[str] = None) -> bool:
+    if not app.config.get("output_config", {}).get("type_as_it_streams", False):
+        return False
+    mode = mode or app.config.get("mode_config", {}).get("operation_mode", "typer")
+    return mode in INCREMENTAL_MODES
+
+
+class IncrementalPasteSink:
+    """Pastes stable segments of a token stream into the focused window, in order."""
+
+    _END = object()
+
+    def __init__(self, app, mode: str = "typer", coalesce_seconds: float = 0.25):
+        self.app = app
+        self.mode = mode
+        self.coalesce_seconds = coalesce_seconds
+        self.pasted_text = ""
+        self.paste_count = 0
+        self.held_back: Optional[bool] = None  # decided by the first non-whitespace character
+        self._pending = ""
+        self._queued_any = False
+        self._segments: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_config(cls, app, mode: Optional[str] = None) -> "IncrementalPasteSink":
+        output_config = app.config.get("output_config", {})
+        mode = mode or app.config.get("mode_config", {}).get("operation_mode", "typer")
+        return cls(app, mode=mode, coalesce_seconds=output_config.get("coalesce_ms", 250) / 1000)
+
+    def feed(self, token: str):
+        """Add streamed text; every complete sentence in the buffer is queued for pasting."""
+        self._pending += token
+        if self.held_back is None:
+            start = self._pending.lstrip()
+            if not start:
+                return
+            self.held_back = start.startswith(WRAPPER_PREFIXES)
+        if self.held_back:
+            return
+        boundary_end = None
+        for match in STABLE_BOUNDARY.finditer(self._pending):
+            boundary_end = match.end()
+        if boundary_end is None:
+            return
+        segment = self._pending[:boundary_end].rstrip()
+        self._pending = self._pending[len(segment):]
+        self._queue(segment)
+
+    def finish(self, timeout: Optional[float] = 30.0, flush_pending: bool = True) -> str:
+        """
+        Paste whatever is left, wait until every paste was sent and return the full pasted text.
+
+        With flush_pending False (the stream failed), text that was not pasted
+        yet is dropped, so the pasted text ends at a sentence boundary.
+        """
+        if not flush_pending:
+            self._pending = ""
+        elif self.held_back:
+            self._pending = postprocess_response(self._pending, self.mode)
+        if self._pending.strip():
+            self._queue(self._pending.rstrip())
+        self._pending = ""
+        self._segments.put(self._END)
+        self._thread.join(timeout)
+        return self.pasted_text
+
+    def _queue(self, segment: str):
+        if not self._queued_any:
+            segment = segment.lstrip()
+        if segment:
+            self._queued_any = True
+            self._segments.put(segment)
+
+    def _run(self):
+        from .ai import output_text
+
+        last_paste = 0.0
+        while True:
+            segment = self._segments.get()
+            if segment is self._END:
+                return
+            # Let segments that finalize in quick succession join this paste
+            time.sleep(max(0.0, self.coalesce_seconds - (time.monotonic() - last_paste)))
+            batch = [segment]
+            finished = False
+            while True:
+                try:
+                    item = self._segments.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._END:
+                    finished = True
+                    break
+                batch.append(item)
+            text = "".join(batch)
+            try:
+                output_text(self.app, text)
+                self.pasted_text += text
+                self.paste_count += 1
+            except Exception as e:
+                print(f"Incremental paste failed: {e}")
+            last_paste = time.monotonic()
+            if finished:
+                return
+
+
+def stream_to_focused_window(app, stream, mode: Optional[str] = None) -> Tuple[str, bool]:
+    """
+    Paste a stream_refinement() generator incrementally.
+
+    Returns the text that was pasted and whether the stream completed; after
+    a failure, only complete sentences have been pasted.
+    """
+    sink = IncrementalPasteSink.from_config(app, mode)
+    completed = False
+    try:
+        for stream_data in stream:
+            if stream_data.get("type") == "token":
+                sink.feed(stream_data.get("content", ""))
+            elif stream_data.get("type") == "final":
+                completed = True
+            elif stream_data.get("type") == "error":
+                print(f"Streaming refinement failed: {stream_data.get('content')}")
+    finally:
+        pasted_text = sink.finish(flush_pending=completed)
+    return pasted_text, completed
+
+
+def untyped_remainder(typed_text: str, refined_text: str) -> Optional[str]:
+    """
+    The part of refined_text that comes after typed_text.
+
+    refined_text is a new refinement of the whole transcript, made after a
+    stream broke off; the typed prefix is located in it word by word, as with
+    speculative refinement. Returns None if it cannot be located. The
+    separator after the typed sentence was never pasted, so a space leads.
+    """
+    remainder = strip_overlap(typed_text, refined_text)
+    if remainder and typed_text and not typed_text[-1].isspace():
+        return f" {remainder}"
+    return remainder
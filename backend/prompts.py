@@ -1,7 +1,15 @@
 """
 Prompt templates and instructions for different operation modes.
 This module contains all AI prompt instructions used in Axo.
+
+Prompts are built once per (mode, language_code, preserve_original_languages,
+target_language) combination and cached; get_prompt_template() returns a
+PromptTemplate whose render(text) only splices the transcript into the
+prebuilt text. The static part always comes first and is byte-for-byte
+identical between requests, so provider-side prefix caching can reuse it.
 """
+from functools import lru_cache
+from typing import Dict, List, Optional
 
 def get_system_prompt_core(language_instruction):
     """
@@ -235,10 +243,30 @@ Best regards,
 
 Your task is to apply these instructions to the ASR transcript provided below."""
 
+def _prompt_cache_key(mode, language_code, preserve_original_languages, target_language):
+    """Normalize arguments that do not change the prompt so equivalent calls share a cache entry."""
+    if mode not in ("typer", "prompt_engineer", "email", "coder"):
+        mode = "typer"
+    if mode == "coder":
+        return mode, None, bool(preserve_original_languages), target_language or "Python"
+    if preserve_original_languages:
+        # The target language is not mentioned when original languages are preserved
+        language_code = None
+    return mode, language_code, bool(preserve_original_languages), None
+
 def get_prompt_instructions(mode, language_code, preserve_original_languages=False, target_language=None):
     """
     Get the appropriate system prompt and mode instructions.
 
+    Results are memoized; see _build_prompt_instructions.
+    """
+    return _build_prompt_instructions(*_prompt_cache_key(mode, language_code, preserve_original_languages, target_language))
+
+@lru_cache(maxsize=64)
+def _build_prompt_instructions(mode, language_code, preserve_original_languages=False, target_language=None):
+    """
+    Build the system prompt and mode instructions for one combination of settings.
+
     Args:
         mode: Operation mode ('typer', 'prompt_engineer', 'email', 'coder')
         language_code: Target language code (ISO 639-1)
@@ -270,6 +298,59 @@ def get_prompt_instructions(mode, language_code, preserve_original_languages=Fal
 
     return system_prompt_core, mode_instructions
 
+class PromptTemplate:
+    """
+    Prebuilt prompt for one combination of prompt settings.
+
+    Everything except the transcript is assembled once; render() only splices
+    the text between the precomputed prefix and suffix. The system prompt and
+    the mode instructions together form the static system message, so the
+    whole multi-kilobyte part is a reusable prefix for provider-side caching
+    and only the short user message changes between requests.
+    """
+
+    def __init__(self, mode: str, system_prompt: str, mode_instructions: str, header_note: Optional[str]):
+        self.mode = mode
+        self.system_prompt = system_prompt
+        self.mode_instructions = mode_instructions
+        self.system_message = {"role": "system", "content": f"{system_prompt}\n\n{mode_instructions}"}
+        if mode == "coder":
+            self.user_prefix = "User request: "
+            self.user_suffix = ""
+        else:
+            self.user_prefix = f"--- BEGIN RAW ASR TRANSCRIPTION ({header_note}) ---\n"
+            self.user_suffix = "\n--- END RAW ASR TRANSCRIPTION ---"
+        self.text_prefix = f"{self.system_message['content']}\n\n{self.user_prefix}"
+
+    def render(self, text: str) -> List[Dict[str, str]]:
+        """Chat messages for text; the system message is the same object on every call."""
+        return [self.system_message, {"role": "user", "content": self.user_prefix + text + self.user_suffix}]
+
+    def render_text(self, text: str) -> str:
+        """The whole prompt as one string, for single-prompt APIs."""
+        return self.text_prefix + text + self.user_suffix
+
+def get_prompt_template(mode, language_code, preserve_original_languages=False, target_language=None) -> PromptTemplate:
+    """
+    Get the cached PromptTemplate for a combination of prompt settings.
+
+    Args:
+        mode: The operation mode (typer, prompt_engineer, email, coder)
+        language_code: Target language code (ISO 639-1)
+        preserve_original_languages: Whether to preserve original languages or translate
+        target_language: Target programming language for coder mode
+    """
+    return _build_prompt_template(*_prompt_cache_key(mode, language_code, preserve_original_languages, target_language))
+
+@lru_cache(maxsize=64)
+def _build_prompt_template(mode, language_code, preserve_original_languages, target_language):
+    system_prompt, mode_instructions = _build_prompt_instructions(mode, language_code, preserve_original_languages, target_language)
+    if preserve_original_languages:
+        header_note = "to be processed while preserving original languages"
+    else:
+        header_note = f"to be processed into target language: {language_code}"
+    return PromptTemplate(mode, system_prompt, mode_instructions, header_note)
+
 def generate_dynamic_prompt(operation_mode: str, text: str, language_code: str, preserve_original_languages: bool = False, target_language: str = None) -> str:
     """
     Generate a dynamic prompt for streaming text processing based on operation mode.
@@ -284,35 +365,8 @@ def generate_dynamic_prompt(operation_mode: str, text: str, language_code: str,
     Returns:
         Complete prompt string for the LLM
     """
-    system_prompt, mode_instructions = get_prompt_instructions(operation_mode, language_code, preserve_original_languages, target_language)
-
-    if operation_mode == "coder":
-        # For coder mode, simpler prompt structure
-        complete_prompt = f"""{system_prompt}
-
-{mode_instructions}
-
-User request: {text}"""
-    else:
-        # For other modes, use the existing structure
-        if preserve_original_languages:
-            header_note = "to be processed while preserving original languages"
-        else:
-            header_note = f"to be processed into target language: {language_code}"
-
-        user_content_header = f"--- BEGIN RAW ASR TRANSCRIPTION ({header_note}) ---"
-        user_content_footer = "--- END RAW ASR TRANSCRIPTION ---"
-
-        # Create the complete prompt
-        complete_prompt = f"""{system_prompt}
-
-{mode_instructions}
-
-{user_content_header}
-{text}
-{user_content_footer}"""
-
-    return complete_prompt
+    template = get_prompt_template(operation_mode, language_code, preserve_original_languages, target_language)
+    return template.render_text(text)
 
 def get_coder_mode_instructions(target_language: str, preserve_original_languages: bool = False) -> str:
     """Get instructions for Coder mode - translates natural language to code."""
@@ -0,0 +1,143 @@
+"""
+Content-addressed cache of LLM refinement responses.
+
+Short dictations repeat a lot ("new line", "thanks, talk soon", sign-offs), and
+for a fixed provider, model, mode and language setting the refinement is
+deterministic enough to reuse. Responses are keyed on a SHA-256 of those
+settings plus the normalized transcript and kept in a bounded in-memory LRU.
+Entries expire after a TTL. With response_cache_config.persist, they are also
+written to a small SQLite database so they survive restarts; that stores
+dictated text unencrypted on disk, so it is off by default.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+RESPONSE_CACHE_PATH = os.path.join("cache", "llm_responses.sqlite3")
+CACHE_KEY_VERSION = 2
+
+
+def normalize_transcript(text: str) -> str:
+    """Collapse whitespace and case so trivially different transcripts share an entry."""
+    return " ".join(text.split()).casefold()
+
+
+def make_cache_key(service: str, model_name: str, mode: str, language_settings: Dict, text: str) -> str:
+    payload = json.dumps({
+        "version": CACHE_KEY_VERSION,
+        "service": service,
+        "model": model_name,
+        "mode": mode,
+        "language": language_settings,
+        "text": normalize_transcript(text),
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Bounded in-memory LRU in front of an optional SQLite store, with TTL and hit/miss counters."""
+
+    def __init__(self, path: Optional[str] = RESPONSE_CACHE_PATH, max_memory_entries: int = 256,
+                 max_disk_entries: int = 5000, ttl_seconds: float = 7 * 24 * 3600):
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = self.disk_hits = self.misses = 0
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            try:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL, last_used REAL NOT NULL)"
+                )
+                self._db.execute("DELETE FROM responses WHERE expires < ?", (time.time(),))
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"Response cache: disk store unavailable, using memory only: {e}")
+                self._db = None
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[1] >= now:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._memory[key]
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT value, expires FROM responses WHERE key = ? AND expires >= ?", (key, now)
+                    ).fetchone()
+                    if row is not None:
+                        self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+                        self._db.commit()
+                        self._remember(key, row[0], row[1])
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return row[0]
+                except sqlite3.Error as e:
+                    print(f"Response cache read failed: {e}")
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: str):
+        now = time.time()
+        expires = now + self.ttl_seconds
+        with self._lock:
+            self._remember(key, value, expires)
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, expires, last_used) VALUES (?, ?, ?, ?)",
+                    (key, value, expires, now)
+                )
+                # Evict the least recently used rows beyond the disk budget
+                self._db.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_disk_entries,)
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"Response cache write failed: {e}")
+
+    def _remember(self, key: str, value: str, expires: float):
+        self._memory[key] = (value, expires)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                    "memory_entries": len(self._memory)}
+
+
+def response_cache_for(app) -> Optional[ResponseCache]:
+    """The app's response cache, created from response_cache_config on first use (None if disabled)."""
+    cache_config = app.config.get("response_cache_config", {})
+    if not cache_config.get("enabled", True):
+        return None
+    if getattr(app, 'response_cache', None) is None:
+        app.response_cache = ResponseCache(
+            path=RESPONSE_CACHE_PATH if cache_config.get("persist", False) else None,
+            max_memory_entries=cache_config.get("max_memory_entries", 256),
+            max_disk_entries=cache_config.get("max_disk_entries", 5000),
+            ttl_seconds=cache_config.get("ttl_hours", 168) * 3600,
+        )
+    return app.response_cache
@@ -0,0 +1,198 @@
+"""
+Speculative LLM refinement while the recording hotkey is still held.
+
+The StreamingTranscriber commits ASR segments during capture. In Typer mode
+those segments are refined right away, one batch per finished sentence, and
+the refined prefix is kept. On release only the remaining tail is sent to the
+LLM, together with the last few refined words as context, and the answer is
+stitched onto the prefix. The user then waits for roughly the refinement of
+the last sentence instead of the whole utterance.
+
+Typer refinement works sentence by sentence, which is what makes splitting
+safe; the other modes restructure the whole input and always refine it in one
+piece. If the overlap cannot be located in a refined batch, speculation is
+abandoned and the caller refines the full transcript as usual. If no service
+answers for a batch, speculation stops there and that batch is refined again,
+with the rest of the tail, on release.
+"""
+import difflib
+import re
+import threading
+from typing import List, Optional
+
+from .circuit_breaker import RAW_ASR_SERVICE
+from .llm_providers import refine_transcript
+
+SENTENCE_END = re.compile(r"[.!?…]['\")\]]*$")
+# Extra words at the start of a refined batch that may precede the end of the overlap
+OVERLAP_SLACK_WORDS = 4
+MIN_OVERLAP_MATCH_RATIO = 0.6
+
+
+def speculative_refinement_enabled(app) -> bool:
+    """Speculation applies to non-streamed Typer refinement with an LLM service selected."""
+    if not app.config.get("speculative_config", {}).get("enabled", False):
+        return False
+    if app.config.get("streaming_config", {}).get("enabled", False):
+        return False
+    if app.config.get("mode_config", {}).get("operation_mode", "typer") != "typer":
+        return False
+    return app.config.get("models_config", {}).get("text_processing_service", "Mistral") != RAW_ASR_SERVICE
+
+
+class RefinementUnavailable(Exception):
+    """No text-processing service refined a batch (refine_transcript would fall back to raw text)."""
+
+
+def _normalize_word(word: str) -> str:
+    return re.sub(r"[^\w]", "", word).casefold()
+
+
+def strip_overlap(overlap: str, refined: str) -> Optional[str]:
+    """
+    Remove the re-refined overlap from the start of refined.
+
+    The model usually reproduces the context words unchanged, but may adjust
+    punctuation or casing, so words are compared normalized. Returns None if
+    the overlap cannot be located.
+    """
+    overlap_words = [_normalize_word(word) for word in overlap.split()]
+    if not overlap_words:
+        return refined.strip()
+    refined_words = refined.split()
+    window = [_normalize_word(word) for word in refined_words[:len(overlap_words) + OVERLAP_SLACK_WORDS]]
+    matcher = difflib.SequenceMatcher(None, overlap_words, window, autojunk=False)
+    blocks = [block for block in matcher.get_matching_blocks() if block.size]
+    if not blocks or sum(block.size for block in blocks) < MIN_OVERLAP_MATCH_RATIO * len(overlap_words):
+        return None
+    last = blocks[-1]
+    # Overlap words after the last match were dropped or merged by the model
+    cut = last.b + last.size + (len(overlap_words) - (last.a + last.size))
+    return " ".join(refined_words[min(cut, len(refined_words)):])
+
+
+class SpeculativeRefiner:
+    """
+    Refines committed transcript segments in the background during recording
+    and finishes the refinement from the tail on release.
+    """
+
+    def __init__(self, app, max_pending_words: int = 40, overlap_words: int = 12):
+        self.app = app
+        self.max_pending_words = max_pending_words
+        self.overlap_words = overlap_words
+        self.segments: List[str] = []
+        self.consumed_segments = 0
+        self.refined_parts: List[str] = []
+        self.failed = False
+        self._closed = False
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @classmethod
+    def from_config(cls, app) -> "SpeculativeRefiner":
+        speculative_config = app.config.get("speculative_config", {})
+        return cls(
+            app,
+            max_pending_words=speculative_config.get("max_pending_words", 40),
+            overlap_words=speculative_config.get("overlap_words", 12),
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def add_segment(self, segment_text: str):
+        """Called by the StreamingTranscriber for every committed segment."""
+        with self._lock:
+            self.segments.append(segment_text)
+        self._wake.set()
+
+    def _next_batch(self) -> int:
+        """Number of pending segments ready for refinement (0 if none)."""
+        pending = self.segments[self.consumed_segments:]
+        ready = 0
+        words = 0
+        for i, segment in enumerate(pending, 1):
+            words += len(segment.split())
+            if SENTENCE_END.search(segment):
+                ready = i
+        if ready == 0 and words >= self.max_pending_words:
+            ready = len(pending)
+        return ready
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            with self._lock:
+                self._wake.clear()
+                if self._closed or self.failed:
+                    return
+                batch_size = self._next_batch()
+                if not batch_size:
+                    continue
+                batch = " ".join(self.segments[self.consumed_segments:self.consumed_segments + batch_size])
+            try:
+                refined = self._refine_after_prefix(batch)
+            except RefinementUnavailable:
+                # Keep the refined prefix; the batch stays pending and is refined on release
+                print("Speculative refinement: a batch could not be refined, leaving it for release.")
+                return
+            with self._lock:
+                if refined is None:
+                    print("Speculative refinement: could not stitch a batch, refining in full on release.")
+                    self.failed = True
+                    return
+                self.refined_parts.append(refined)
+                self.consumed_segments += batch_size
+                self._wake.set()
+
+    def _refine_after_prefix(self, raw_text: str) -> Optional[str]:
+        """
+        Refine raw_text with the end of the refined prefix as context; None if
+        stitching fails. Raises RefinementUnavailable if no service answered.
+        """
+        overlap = " ".join(" ".join(self.refined_parts).split()[-self.overlap_words:]) if self.refined_parts else ""
+        refined = refine_transcript(self.app, f"{overlap} {raw_text}" if overlap else raw_text, mode="typer",
+                                    split_long=False, raw_on_failure=False)
+        if refined is None:
+            raise RefinementUnavailable(raw_text)
+        if not refined:
+            return None
+        return strip_overlap(overlap, refined) if overlap else refined.strip()
+
+    def finish(self, transcript: str) -> Optional[str]:
+        """
+        Refine what is left of transcript and return the stitched result.
+
+        Returns None when nothing could be reused, in which case the caller
+        refines the whole transcript.
+        """
+        with self._lock:
+            self._closed = True
+        self._wake.set()
+        if self._thread.is_alive():
+            # Wait for an in-flight batch; it started earlier than a fresh request would
+            self._thread.join()
+        if self.failed or not self.refined_parts:
+            return None
+        consumed_text = " ".join(self.segments[:self.consumed_segments])
+        if not transcript.startswith(consumed_text):
+            return None
+        tail = transcript[len(consumed_text):].strip()
+        print(f"Speculative refinement: reusing {self.consumed_segments} refined segment(s), {len(tail.split())} word(s) left.")
+        if not tail:
+            return " ".join(self.refined_parts)
+        try:
+            refined_tail = self._refine_after_prefix(tail)
+        except RefinementUnavailable:
+            return None
+        if refined_tail is None:
+            return None
+        return " ".join(self.refined_parts + [refined_tail] if refined_tail else self.refined_parts)
+
+    def cancel(self):
+        """Stop refining; used when the recording is discarded or processed another way."""
+        with self._lock:
+            self._closed = True
+        self._wake.set()
@@ -0,0 +1,120 @@
+"""
+Streaming transcription while the recording hotkey is still held.
+
+Parakeet-TDT is an offline (full-context) model, so instead of frame-level
+cache-aware decoding the recording is committed in rolling windows: whenever
+enough new audio has arrived, the window is cut at the quietest point near its
+end (a pause between words) and decoded on its own. The committed text is the
+"cache"; on release only the audio after the last cut still needs decoding.
+"""
+import threading
+import time
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from .audio import SAMPLE_RATE, AUDIO_BLOCK_DURATION_MS
+from .ai import transcribe_audio_array
+
+# Length of the analysis frames used to look for a quiet cut point.
+CUT_FRAME_MS = 20
+
+
+def find_quiet_cut(audio: np.ndarray, search_start: int) -> int:
+    """
+    Return the sample index of the quietest frame at or after search_start.
+
+    Cutting a window there keeps words from being split across two decodes.
+    """
+    frame_len = int(SAMPLE_RATE * CUT_FRAME_MS / 1000)
+    region = audio[search_start:].reshape(-1).astype(np.float32)
+    num_frames = len(region) // frame_len
+    if num_frames == 0:
+        return len(audio)
+    energies = np.square(region[:num_frames * frame_len].reshape(num_frames, frame_len)).mean(axis=1)
+    return search_start + int(np.argmin(energies)) * frame_len + frame_len // 2
+
+
+class StreamingTranscriber:
+    """
+    Decodes committed windows of a RecordingBuffer during capture and reports
+    partial hypotheses to the UI.
+    """
+
+    def __init__(self, app, recording_buffer, chunk_seconds: float = 2.0, search_seconds: float = 0.5,
+                 on_commit: Optional[Callable[[str], None]] = None):
+        self.app = app
+        self.on_commit = on_commit
+        self.recording_buffer = recording_buffer
+        self.chunk_samples = int(SAMPLE_RATE * chunk_seconds)
+        self.search_samples = int(SAMPLE_RATE * search_seconds)
+        self.poll_interval = AUDIO_BLOCK_DURATION_MS / 1000
+        self.committed_samples = 0
+        self.committed_segments: List[str] = []
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start committing windows in the background until recording stops."""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while self.app.is_recording:
+            time.sleep(self.poll_interval)
+            available = len(self.recording_buffer)
+            if available - self.committed_samples < self.chunk_samples + self.search_samples:
+                continue
+            try:
+                self._commit_window(available)
+            except Exception as e:
+                print(f"Streaming ASR: error decoding window: {e}")
+                return
+
+    def _commit_window(self, available: int):
+        window = self.recording_buffer.view(self.committed_samples, available)
+        if len(window) < available - self.committed_samples:
+            # The buffer was detached underneath us; the final pass handles the rest.
+            return
+        cut = find_quiet_cut(window[:self.chunk_samples + self.search_samples], self.chunk_samples)
+        segment_text = transcribe_audio_array(self.app, window[:cut]).strip()
+        with self._lock:
+            self.committed_samples += cut
+            if segment_text:
+                self.committed_segments.append(segment_text)
+            partial_text = " ".join(self.committed_segments)
+        if segment_text:
+            self._emit_partial(partial_text)
+            if self.on_commit is not None:
+                self.on_commit(segment_text)
+
+    def _emit_partial(self, partial_text: str):
+        app = self.app
+
+        def show_partial_safe():
+            if getattr(app, 'modern_ui', None) is not None:
+                app.modern_ui.update_partial_transcript(partial_text)
+            if app.config.get("streaming_config", {}).get("enabled", False) and app.streaming_widget is not None:
+                app.streaming_widget.show_partial_transcript(partial_text)
+        app.master.after(0, show_partial_safe)
+
+    def finish(self, audio_data: np.ndarray, decode_tail: bool = True) -> str:
+        """
+        Decode the tail that was not committed during recording and return the
+        full transcript.
+
+        Args:
+            audio_data: The complete recording (same sample offsets as the buffer)
+            decode_tail: False returns only the committed windows, e.g. when
+                voice-activity detection found no speech in the recording
+        """
+        if self._thread is not None:
+            self._thread.join()
+        with self._lock:
+            segments = list(self.committed_segments)
+            tail = audio_data[self.committed_samples:]
+        if decode_tail and len(tail):
+            tail_text = transcribe_audio_array(self.app, tail).strip()
+            if tail_text:
+                segments.append(tail_text)
+        return " ".join(segments)
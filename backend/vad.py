@@ -0,0 +1,101 @@
+"""
+Energy-based voice-activity detection for recorded dictations.
+
+Used between capture and ASR to drop leading/trailing silence, shorten long
+pauses and skip the ASR and LLM stages entirely when nothing was said.
+"""
+from typing import List, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+FRAME_MS = 30
+DEFAULT_THRESHOLD_DB = -55.0   # Absolute floor: quieter frames are never speech; low enough for low-gain microphones
+NOISE_MARGIN_DB = 10.0         # Speech must be this far above the estimated noise floor
+MIN_SPEECH_MS = 90             # Shorter bursts (clicks, key presses) are ignored
+HANGOVER_MS = 300              # Gaps shorter than this are bridged inside a segment
+MAX_ADAPTIVE_THRESHOLD_DB = -30.0  # Keeps wall-to-wall speech from raising the floor too far
+
+
+def frame_energies_db(audio: np.ndarray, frame_ms: int = FRAME_MS) -> np.ndarray:
+    """Per-frame RMS level in dBFS of an int16 or float32 mono recording."""
+    frame_len = int(SAMPLE_RATE * frame_ms / 1000)
+    signal = audio.reshape(-1)
+    num_frames = len(signal) // frame_len
+    if num_frames == 0:
+        return np.empty(0, dtype=np.float32)
+    frames = signal[:num_frames * frame_len].reshape(num_frames, frame_len).astype(np.float32)
+    if audio.dtype == np.int16:
+        frames /= 32768.0
+    rms = np.sqrt(np.mean(np.square(frames), axis=1))
+    return 20.0 * np.log10(np.maximum(rms, 1e-10))
+
+
+def speech_segments(audio: np.ndarray, threshold_db: float = DEFAULT_THRESHOLD_DB) -> List[Tuple[int, int]]:
+    """
+    Find speech regions in a recording.
+
+    The decision threshold adapts to the recording: it is the louder of the
+    absolute floor and the estimated noise floor (10th percentile frame level)
+    plus a margin, so a noisy room does not count as continuous speech.
+
+    Returns:
+        List of (start_sample, end_sample) tuples, empty if no speech was found
+    """
+    energies = frame_energies_db(audio)
+    if energies.size == 0:
+        return []
+    noise_floor_db = float(np.percentile(energies, 10))
+    adaptive_threshold_db = min(noise_floor_db + NOISE_MARGIN_DB, MAX_ADAPTIVE_THRESHOLD_DB)
+    is_speech = energies > max(threshold_db, adaptive_threshold_db)
+
+    frame_len = int(SAMPLE_RATE * FRAME_MS / 1000)
+    hangover_frames = HANGOVER_MS // FRAME_MS
+    min_speech_frames = max(1, MIN_SPEECH_MS // FRAME_MS)
+
+    # Run boundaries of the boolean mask
+    edges = np.diff(np.concatenate(([0], is_speech.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    segments: List[Tuple[int, int]] = []
+    for start, end in zip(starts, ends):
+        if segments and start - segments[-1][1] <= hangover_frames:
+            segments[-1] = (segments[-1][0], end)
+        else:
+            segments.append((start, end))
+    return [(start * frame_len, end * frame_len) for start, end in segments
+            if end - start >= min_speech_frames]
+
+
+def trim_silence(audio: np.ndarray, segments: List[Tuple[int, int]],
+                 padding_ms: int = 200, max_pause_ms: int = 700) -> np.ndarray:
+    """
+    Cut leading/trailing silence and shorten internal pauses.
+
+    Each speech segment keeps padding_ms of context on both sides; pauses
+    longer than max_pause_ms are shortened to max_pause_ms of the original
+    background audio. A single contiguous region is returned as a view.
+    """
+    if not segments:
+        return audio[:0]
+    padding = int(SAMPLE_RATE * padding_ms / 1000)
+    max_pause = int(SAMPLE_RATE * max_pause_ms / 1000)
+
+    regions: List[Tuple[int, int]] = []
+    for start, end in segments:
+        start, end = max(0, start - padding), min(len(audio), end + padding)
+        if regions and start - regions[-1][1] <= max_pause:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((start, end))
+
+    if len(regions) == 1:
+        return audio[regions[0][0]:regions[0][1]]
+
+    pieces = []
+    for i, (start, end) in enumerate(regions):
+        pieces.append(audio[start:end])
+        if i + 1 < len(regions):
+            pieces.append(audio[end:end + max_pause])
+    return np.concatenate(pieces, axis=0)
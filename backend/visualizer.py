@@ -0,0 +1,111 @@
+"""
+Spectral audio visualizer for the recording bars.
+
+Each 100 ms audio block is Hann-windowed and transformed with a real FFT; the
+power spectrum is summed into log-spaced frequency bands by one matrix
+product and converted to a 0..1 level on a dB scale. Several blocks are
+analyzed as one batch. All of this runs on the UI thread when a frame samples
+the levels, never in the PortAudio callback, and only when a new block has
+arrived since the previous frame; the bars fall back with a per-block decay.
+"""
+from typing import Dict, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+BLOCK_FRAMES = 1600  # one 100 ms audio callback block
+FFT_SIZE = 2048
+MIN_FREQUENCY = 80.0
+MAX_FREQUENCY = 7600.0
+FLOOR_DB = -75.0
+CEILING_DB = -15.0
+# More pending blocks than this are never analyzed in one frame; only the newest matter
+MAX_BATCH_BLOCKS = 8
+
+
+class SpectralAnalyzer:
+    """Windowed rFFT band energies for batches of equally sized blocks."""
+
+    def __init__(self, num_bands: int, block_frames: int = BLOCK_FRAMES, sample_rate: int = SAMPLE_RATE,
+                 fft_size: int = FFT_SIZE, min_frequency: float = MIN_FREQUENCY, max_frequency: float = MAX_FREQUENCY,
+                 floor_db: float = FLOOR_DB, ceiling_db: float = CEILING_DB):
+        self.num_bands = num_bands
+        self.block_frames = block_frames
+        self.fft_size = max(fft_size, block_frames)
+        self.floor_db = floor_db
+        self.ceiling_db = ceiling_db
+        window = np.hanning(block_frames).astype(np.float32)
+        # int16 full scale and the window's coherent gain, so a full-scale sine peaks near 0 dB
+        self.window = window * (2.0 / (window.sum() * 32768.0))
+        self.band_matrix = self._band_matrix(num_bands, sample_rate, min_frequency, max_frequency)
+
+    def _band_matrix(self, num_bands, sample_rate, min_frequency, max_frequency) -> np.ndarray:
+        """(num_bins, num_bands) 0/1 matrix summing rFFT bins into log-spaced bands."""
+        num_bins = self.fft_size // 2 + 1
+        bin_hz = sample_rate / self.fft_size
+        edges = np.geomspace(min_frequency, min(max_frequency, sample_rate / 2), num_bands + 1) / bin_hz
+        edges = np.round(edges).astype(int)
+        # Every band gets at least one bin
+        edges = np.maximum(edges, edges[0] + np.arange(num_bands + 1))
+        edges = np.minimum(edges, num_bins)
+        matrix = np.zeros((num_bins, num_bands), dtype=np.float32)
+        for band in range(num_bands):
+            matrix[edges[band]:max(edges[band + 1], edges[band] + 1), band] = 1.0
+        return matrix
+
+    def analyze(self, blocks: np.ndarray) -> np.ndarray:
+        """Levels (0..1) of shape (num_blocks, num_bands) for int16 blocks of shape (num_blocks, block_frames)."""
+        spectrum = np.fft.rfft(blocks * self.window, n=self.fft_size, axis=-1)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        band_db = 10.0 * np.log10(np.maximum(power @ self.band_matrix, 1e-12))
+        return np.clip((band_db - self.floor_db) / (self.ceiling_db - self.floor_db), 0.0, 1.0)
+
+
+class SpectralVisualizer:
+    """
+    Band levels of the newest captured audio, sampled by the UI.
+
+    The source is anything with the len()/view() interface of RecordingBuffer;
+    the app reads the AmplitudeChannel, so a frame never waits on the audio
+    thread.
+
+    band_levels() is called every animation frame but only analyzes blocks
+    that arrived since its previous call; in between it returns the cached
+    levels. reset() is called when a new recording starts.
+    """
+
+    def __init__(self, source, block_frames: int = BLOCK_FRAMES, decay: float = 0.7):
+        self.source = source
+        self.block_frames = block_frames
+        self.decay = decay
+        self._analyzers: Dict[int, SpectralAnalyzer] = {}
+        # Per band count: (recording generation, levels, frames analyzed)
+        self._state: Dict[int, Tuple[int, np.ndarray, int]] = {}
+        self._generation = 0
+
+    def reset(self):
+        """Start over for a new recording; state saved by a frame that was already running is ignored."""
+        self._generation += 1
+
+    def band_levels(self, num_bands: int) -> np.ndarray:
+        analyzer = self._analyzers.get(num_bands)
+        if analyzer is None:
+            analyzer = self._analyzers[num_bands] = SpectralAnalyzer(num_bands, self.block_frames)
+        generation = self._generation
+        state = self._state.get(num_bands)
+        if state is not None and state[0] == generation:
+            _, levels, analyzed = state
+        else:
+            levels, analyzed = np.zeros(num_bands), 0
+        available = len(self.source)
+
+        new_blocks = min((available - analyzed) // self.block_frames, MAX_BATCH_BLOCKS)
+        if new_blocks > 0:
+            end = analyzed + ((available - analyzed) // self.block_frames) * self.block_frames
+            audio = self.source.view(end - new_blocks * self.block_frames, end)
+            if len(audio) == new_blocks * self.block_frames:
+                for block_levels in analyzer.analyze(audio.reshape(new_blocks, self.block_frames)):
+                    levels = np.maximum(block_levels, levels * self.decay)
+            analyzed = end
+        self._state[num_bands] = (generation, levels, analyzed)
+        return levels
@@ -0,0 +1,123 @@
+"""
+Compare the NeMo and ONNX Runtime (int8) ASR backends.
+
+Reports real-time factor (decode time / audio duration, lower is better) and
+word error rate for each backend over a directory of fixture recordings. Each
+fixture is a 16 kHz mono 16-bit WAV file with the reference transcript in a
+.txt file of the same name; by default the synthetic ones checked in under
+benchmarks/fixtures are used (see benchmarks/make_fixtures.py).
+
+Usage:
+    python -m benchmarks.asr_backends [--fixtures benchmarks/fixtures] [--threads 4] [--json]
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.ai import MODEL_NAME, SAMPLE_RATE, audio_to_float32, run_asr
+
+
+def load_fixtures(fixtures_dir):
+    """Return [(name, float32 signal, reference text)] for every WAV with a transcript."""
+    fixtures = []
+    for wav_path in sorted(glob.glob(os.path.join(fixtures_dir, "*.wav"))):
+        txt_path = os.path.splitext(wav_path)[0] + ".txt"
+        if not os.path.exists(txt_path):
+            continue
+        with wave.open(wav_path, 'rb') as wf:
+            if wf.getframerate() != SAMPLE_RATE or wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+                print(f"Skipping {wav_path}: expected 16 kHz mono 16-bit audio")
+                continue
+            audio = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        with open(txt_path, 'r', encoding='utf-8') as f:
+            reference = f.read().strip()
+        fixtures.append((os.path.basename(wav_path), audio_to_float32(audio), reference))
+    return fixtures
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level Levenshtein distance divided by the reference length."""
+    def words(text):
+        return re.sub(r"[^\w\s']", "", text.lower()).split()
+
+    ref, hyp = words(reference), words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    distances = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        previous_diagonal, distances[0] = distances[0], i
+        for j, hyp_word in enumerate(hyp, 1):
+            previous_diagonal, distances[j] = distances[j], min(
+                distances[j] + 1,
+                distances[j - 1] + 1,
+                previous_diagonal + (ref_word != hyp_word)
+            )
+    return distances[-1] / len(ref)
+
+
+def benchmark_backend(app, fixtures):
+    total_audio = total_decode = 0.0
+    total_errors = total_words = 0.0
+    per_fixture = []
+    run_asr(app, [fixtures[0][1]])  # Warm-up, not timed
+    for name, signal, reference in fixtures:
+        started = time.perf_counter()
+        hypothesis = run_asr(app, [signal])[0]
+        elapsed = time.perf_counter() - started
+        duration = len(signal) / SAMPLE_RATE
+        wer = word_error_rate(reference, hypothesis)
+        ref_words = max(1, len(reference.split()))
+        total_audio += duration
+        total_decode += elapsed
+        total_errors += wer * ref_words
+        total_words += ref_words
+        per_fixture.append({"fixture": name, "rtf": elapsed / duration, "wer": wer})
+    return {
+        "rtf": total_decode / total_audio if total_audio else 0.0,
+        "wer": total_errors / total_words if total_words else 0.0,
+        "audio_seconds": total_audio,
+        "fixtures": per_fixture,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare NeMo and ONNX ASR backends (RTF and WER).")
+    parser.add_argument("--fixtures", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures"))
+    parser.add_argument("--threads", type=int, default=0, help="onnxruntime intra-op threads (0 = auto)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        sys.exit(f"No fixtures (*.wav + *.txt) found in {args.fixtures}")
+
+    import nemo.collections.asr as nemo_asr
+    from backend.asr_onnx import OnnxParakeetBackend
+
+    asr_model = nemo_asr.models.ASRModel.from_pretrained(MODEL_NAME)
+    app = SimpleNamespace(asr_model=asr_model, asr_backend=None)
+    results = {"nemo": benchmark_backend(app, fixtures)}
+
+    app.asr_backend = OnnxParakeetBackend.load(asr_model, MODEL_NAME, intra_op_threads=args.threads or None)
+    results["onnx_int8"] = benchmark_backend(app, fixtures)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'backend':<12}{'RTF':>10}{'WER':>10}")
+    for backend_name, result in results.items():
+        print(f"{backend_name:<12}{result['rtf']:>10.3f}{result['wer']:>10.2%}")
+
+
+if __name__ == "__main__":
+    main()
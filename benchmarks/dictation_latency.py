@@ -0,0 +1,307 @@
+"""
+End-to-end dictation latency benchmark.
+
+Replays fixture recordings through the real pipeline, from hotkey release
+(stop_audio_recording_and_process) through transcribe_and_refine_audio_data to
+the paste step, without a display or a network:
+
+* Tk's master.after is replaced by a stub that runs callbacks inline,
+* the LLM is a local mock Ollama HTTP server with a configurable time to first
+  token and inter-token delay,
+* the clipboard/paste step is a no-op output sink.
+
+Stage timings come from backend.metrics and are reported as p50/p95/p99 (ms)
+JSON for batch and streaming refinement. Fixtures are 16 kHz mono 16-bit WAV
+files; by default the ones checked in under benchmarks/fixtures are used
+(made by benchmarks/make_fixtures.py and shared with benchmarks/asr_backends.py;
+transcripts are not needed here).
+
+Usage:
+    python -m benchmarks.dictation_latency [--fixtures benchmarks/fixtures] [--iterations 5] [--mode both]
+"""
+import argparse
+import contextlib
+import glob
+import json
+import os
+import sys
+import threading
+import time
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.ai import SAMPLE_RATE, OllamaManager, initialize_ollama_manager, load_asr_model
+from backend.audio import audio_manager, stop_audio_recording_and_process
+from backend.metrics import latency
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+MOCK_MODEL_NAME = "mock-llm"
+STREAM_TIMEOUT_SECONDS = 60
+
+
+class MockOllamaServer:
+    """
+    Minimal Ollama-compatible HTTP server (/api/version, /api/tags, /api/chat).
+
+    Chat replies echo the transcript found in the prompt, word by word, after
+    first_token_delay seconds and with token_delay seconds between tokens.
+    """
+
+    def __init__(self, first_token_delay: float = 0.15, token_delay: float = 0.01):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, payload, status=200):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == "/api/version":
+                    self._send_json({"version": "0.0.0-mock"})
+                elif self.path == "/api/tags":
+                    self._send_json({"models": [{"name": f"{MOCK_MODEL_NAME}:latest", "model": f"{MOCK_MODEL_NAME}:latest",
+                                                 "size": 0, "modified_at": "1970-01-01T00:00:00Z"}]})
+                else:
+                    self._send_json({"error": "not found"}, status=404)
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if self.path != "/api/chat":
+                    self._send_json({"error": "not found"}, status=404)
+                    return
+                tokens = server.reply_tokens(request.get("messages", []))
+                time.sleep(server.first_token_delay)
+                if not request.get("stream", True):
+                    time.sleep(server.token_delay * max(0, len(tokens) - 1))
+                    self._send_json(server.chat_chunk("".join(tokens), done=True))
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for i, token in enumerate(tokens):
+                    if i:
+                        time.sleep(server.token_delay)
+                    self._write_chunk(server.chat_chunk(token, done=False))
+                self._write_chunk(server.chat_chunk("", done=True))
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _write_chunk(self, payload):
+                line = (json.dumps(payload) + "\n").encode("utf-8")
+                self.wfile.write(f"{len(line):x}\r\n".encode("ascii") + line + b"\r\n")
+                self.wfile.flush()
+
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    @staticmethod
+    def reply_tokens(messages):
+        prompt = messages[-1].get("content", "") if messages else ""
+        lines = prompt.splitlines()
+        begin = next((i for i, line in enumerate(lines) if line.startswith("--- BEGIN")), None)
+        transcript = " ".join(lines[begin + 1:-1]) if begin is not None else prompt[-200:]
+        words = transcript.split() or ["ok"]
+        return [words[0]] + [" " + word for word in words[1:]]
+
+    @staticmethod
+    def chat_chunk(content, done):
+        chunk = {"model": MOCK_MODEL_NAME, "created_at": "1970-01-01T00:00:00Z",
+                 "message": {"role": "assistant", "content": content}, "done": done}
+        if done:
+            chunk["done_reason"] = "stop"
+        return chunk
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+
+
+class InlineMaster:
+    """Stand-in for the Tk root: scheduled callbacks run immediately on the calling thread."""
+
+    def after(self, _delay_ms, callback=None, *args):
+        if callback is not None:
+            callback(*args)
+
+    def after_idle(self, callback, *args):
+        callback(*args)
+
+
+class StreamCompletionWidget:
+    """Stand-in for StreamingWidget that only signals when a stream has finished."""
+
+    def __init__(self):
+        self.finished = threading.Event()
+
+    def show_streaming_widget(self, original_text):
+        pass
+
+    def show_partial_transcript(self, partial_text):
+        pass
+
+    def update_streaming_content(self, stream_data):
+        if stream_data.get("type") in ("final", "error"):
+            self.finished.set()
+
+    def enqueue_stream_data(self, stream_data):
+        self.update_streaming_content(stream_data)
+
+
+class HeadlessApp:
+    """The attributes and callbacks of AxoApp that the processing pipeline touches."""
+
+    def __init__(self, config):
+        self.config = config
+        self.master = InlineMaster()
+        self.model_loaded_event = threading.Event()
+        self.current_state = "loading_model"
+        self.is_recording = False
+        self.audio_stream = None
+        self.asr_model = None
+        self.asr_load_metrics = {}
+        self.asr_residency = None
+        self.streaming_transcriber = None
+        self.speculative_refiner = None
+        self.streaming_widget = StreamCompletionWidget()
+        self.mistral_client = None
+        self.gemini_model_instance = None
+        self.llm_providers = {}
+        self.pasted_texts = []
+        self.output_sink = self.pasted_texts.append
+
+    def start_transcription_thread(self, audio_data):
+        # Run inline so batch mode returns once the text has been "pasted"
+        from backend.ai import transcribe_and_refine_audio_data
+        transcribe_and_refine_audio_data(self, audio_data)
+
+    def _ensure_streaming_widget_exists(self):
+        return True
+
+    def _play_sound_async(self, sound_file_name_only):
+        pass
+
+    def _update_ui_elements(self):
+        pass
+
+    def _set_initial_state_after_processing(self):
+        self.current_state = "initial"
+
+    def _safe_ui_update_to_initial(self):
+        self.current_state = "initial"
+
+
+def load_wav_fixtures(fixtures_dir):
+    fixtures = []
+    for wav_path in sorted(glob.glob(os.path.join(fixtures_dir, "*.wav"))):
+        with wave.open(wav_path, 'rb') as wf:
+            if wf.getframerate() != SAMPLE_RATE or wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+                print(f"Skipping {wav_path}: expected 16 kHz mono 16-bit audio", file=sys.stderr)
+                continue
+            audio = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        fixtures.append((os.path.basename(wav_path), audio.reshape(-1, 1)))
+    return fixtures
+
+
+def replay(app, audio, streaming):
+    """Simulate a hotkey release after recording audio; returns end-to-end seconds."""
+    app.streaming_widget.finished.clear()
+    audio_manager.recording_buffer.reset()
+    audio_manager.recording_buffer.write(audio)
+    app.is_recording = True
+    app.current_state = "processing"
+
+    released = time.perf_counter()
+    stop_audio_recording_and_process(app)
+    if streaming and not app.streaming_widget.finished.wait(STREAM_TIMEOUT_SECONDS):
+        print("Streaming refinement did not finish in time", file=sys.stderr)
+    return time.perf_counter() - released
+
+
+def run_mode(app, fixtures, iterations, streaming):
+    app.config["streaming_config"]["enabled"] = streaming
+    latency.reset()
+    for _ in range(iterations):
+        for _, audio in fixtures:
+            latency.record("end_to_end", replay(app, audio, streaming))
+    return latency.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-stage dictation latency from hotkey release to paste.")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="Directory of 16 kHz mono WAV recordings")
+    parser.add_argument("--iterations", type=int, default=5, help="Replays of every fixture per mode")
+    parser.add_argument("--mode", choices=("batch", "streaming", "both"), default="both")
+    parser.add_argument("--first-token-ms", type=float, default=150.0, help="Mock LLM time to first token")
+    parser.add_argument("--token-ms", type=float, default=10.0, help="Mock LLM delay between tokens")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    fixtures = load_wav_fixtures(args.fixtures)
+    if not fixtures:
+        sys.exit(f"No 16 kHz mono WAV fixtures found in {args.fixtures} (python -m benchmarks.make_fixtures creates them)")
+
+    server = MockOllamaServer(args.first_token_ms / 1000, args.token_ms / 1000)
+    server.start()
+    # Pipeline logging goes to stderr so stdout carries only the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        report = run_benchmark(args, fixtures, server)
+    server.stop()
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + "\n")
+
+
+def run_benchmark(args, fixtures, server):
+    config = {
+        "models_config": {"text_processing_service": "Ollama", "ollama_model_name": MOCK_MODEL_NAME},
+        "mode_config": {"operation_mode": "typer"},
+        "language_config": {"target_language": "en", "preserve_original_languages": True},
+        "streaming_config": {"enabled": False},
+        "asr_config": {"backend": "nemo", "streaming_partials": False},
+        "residency_config": {"warmup": True, "idle_offload_minutes": 0},
+    }
+    app = HeadlessApp(config)
+    app.ollama_manager = OllamaManager(base_url=server.url)
+    if not app.ollama_manager.detect_ollama():
+        sys.exit("Mock LLM server is not reachable (is the 'ollama' package installed?)")
+    initialize_ollama_manager(app)
+
+    load_asr_model(app)
+    if not app.model_loaded_event.is_set():
+        sys.exit("ASR model failed to load")
+
+    modes = {"batch": [False], "streaming": [True], "both": [False, True]}[args.mode]
+    report = {
+        "fixtures": len(fixtures),
+        "iterations": args.iterations,
+        "asr_load": app.asr_load_metrics,
+        "mock_llm": {"first_token_ms": args.first_token_ms, "token_ms": args.token_ms},
+    }
+    for streaming in modes:
+        report["streaming" if streaming else "batch"] = run_mode(app, fixtures, args.iterations, streaming)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Startup import-time regression check.
+
+Imports Axo.py in a fresh interpreter under `python -X importtime` and fails
+if importing the entry point takes longer than the budget, or if any heavy SDK
+that should only load lazily or in a background thread (NeMo/torch, LLM
+clients, pyautogui, ...) is pulled in before the window is drawn.
+
+Usage:
+    python -m benchmarks.import_time [--budget-ms 800] [--top 15] [--json]
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Top-level packages that must not be imported by `import Axo`
+FORBIDDEN_MODULES = (
+    "torch", "nemo", "lightning", "pytorch_lightning", "onnxruntime",
+    "mistralai", "google.generativeai", "ollama", "httpx", "requests",
+    "pyautogui", "pyperclip", "sounddevice", "pynput", "pydub", "PIL",
+)
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def measure_imports(entry_module: str = "Axo"):
+    """
+    Return [(module, self_us, cumulative_us, depth)] for one cold import of entry_module.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {entry_module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        tail = "\n".join(result.stderr.strip().splitlines()[-5:])
+        raise RuntimeError(f"Importing {entry_module} failed:\n{tail}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that importing Axo.py stays fast and free of heavy SDKs.")
+    parser.add_argument("--budget-ms", type=float, default=800.0, help="Maximum total import time of Axo.py")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest top-level imports to list")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    entries = measure_imports()
+    top_level = [entry for entry in entries if entry[3] == 0]
+    # Interpreter startup (site, encodings) is excluded; only `import Axo` counts against the budget
+    total_ms = next(cumulative_us for module, _, cumulative_us, _ in top_level if module == "Axo") / 1000
+    imported = {module for module, _, _, _ in entries}
+    violations = sorted(module for module in imported
+                        if any(module == name or module.startswith(name + ".") for name in FORBIDDEN_MODULES))
+    slowest = sorted((entry for entry in entries if entry[3] == 1), key=lambda entry: entry[2], reverse=True)[:args.top]
+
+    if args.json:
+        print(json.dumps({
+            "total_ms": total_ms,
+            "budget_ms": args.budget_ms,
+            "forbidden_imports": violations,
+            "slowest": [{"module": module, "cumulative_ms": cumulative_us / 1000}
+                        for module, _, cumulative_us, _ in slowest],
+        }, indent=2))
+    else:
+        print(f"import Axo: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+        for module, _, cumulative_us, _ in slowest:
+            print(f"  {cumulative_us / 1000:>9.1f} ms  {module}")
+        if violations:
+            print("Heavy modules imported at startup: " + ", ".join(violations))
+
+    if violations or total_ms > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
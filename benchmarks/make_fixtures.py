@@ -0,0 +1,101 @@
+"""
+Generate the benchmark fixture recordings.
+
+Speaks a few typical dictations with espeak-ng and writes them as 16 kHz mono
+16-bit WAV files, each with its reference transcript in a .txt file of the
+same name, which is the layout benchmarks/asr_backends.py and
+benchmarks/dictation_latency.py read. The fixtures checked in under
+benchmarks/fixtures were made with this script.
+
+Synthetic speech is cleaner than a real microphone, so word error rates on
+these fixtures are optimistic; they are meant for latency measurements and
+for comparing backends against each other. Add real recordings to the same
+directory for accuracy work.
+
+Usage:
+    python -m benchmarks.make_fixtures [--output benchmarks/fixtures] [--voice en-us] [--wpm 165]
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import wave
+
+import numpy as np
+
+SAMPLE_RATE = 16000  # what the ASR model is fed
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+# Short, medium and long dictations; the long one crosses a few sentence boundaries
+DICTATIONS = [
+    ("01_short_reply", "Sounds good, talk to you tomorrow."),
+    ("02_note", "Remind me to send the quarterly report to Anna before the meeting on Thursday."),
+    ("03_paragraph", "I looked at the numbers from last week. Sign ups went up by about twelve percent, "
+                     "but most of them came from the new landing page. Let's keep the old page running "
+                     "for another week and then compare the two again."),
+]
+
+
+def synthesize(text: str, voice: str, words_per_minute: int) -> np.ndarray:
+    """Speak text with espeak-ng; returns int16 samples at SAMPLE_RATE."""
+    espeak = shutil.which("espeak-ng")
+    if espeak is None:
+        sys.exit("espeak-ng was not found on PATH (e.g. 'apt install espeak-ng' or 'brew install espeak-ng').")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        wav_path = os.path.join(tmp_dir, "speech.wav")
+        subprocess.run([espeak, "-v", voice, "-s", str(words_per_minute), "-w", wav_path, text], check=True)
+        with wave.open(wav_path, 'rb') as wf:
+            rate = wf.getframerate()
+            audio = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+            if wf.getnchannels() > 1:
+                audio = audio.reshape(-1, wf.getnchannels()).mean(axis=1)
+    return resample(audio.astype(np.float64), rate, SAMPLE_RATE)
+
+
+def resample(audio: np.ndarray, rate: int, target_rate: int) -> np.ndarray:
+    """Band-limited resampling by truncating or zero-padding the spectrum."""
+    if rate == target_rate:
+        return np.clip(audio, -32768, 32767).astype(np.int16)
+    target_length = int(round(len(audio) * target_rate / rate))
+    spectrum = np.fft.rfft(audio)
+    resized = np.zeros(target_length // 2 + 1, dtype=complex)
+    keep = min(len(spectrum), len(resized))
+    resized[:keep] = spectrum[:keep]
+    resampled = np.fft.irfft(resized, n=target_length) * (target_length / len(audio))
+    return np.clip(np.round(resampled), -32768, 32767).astype(np.int16)
+
+
+def write_fixtures(output_dir: str, voice: str = "en-us", words_per_minute: int = 165):
+    """Write every DICTATIONS entry to output_dir; returns the WAV paths."""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for name, text in DICTATIONS:
+        audio = synthesize(text, voice, words_per_minute)
+        # Half a second of silence on both sides, like a hotkey pressed before and released after speaking
+        padding = np.zeros(SAMPLE_RATE // 2, dtype=np.int16)
+        audio = np.concatenate([padding, audio, padding])
+        wav_path = os.path.join(output_dir, f"{name}.wav")
+        with wave.open(wav_path, 'wb') as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(SAMPLE_RATE)
+            wf.writeframes(audio.tobytes())
+        with open(os.path.join(output_dir, f"{name}.txt"), 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+        print(f"{wav_path}: {len(audio) / SAMPLE_RATE:.1f}s")
+        paths.append(wav_path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the WAV fixtures used by the benchmarks.")
+    parser.add_argument("--output", default=FIXTURES_DIR)
+    parser.add_argument("--voice", default="en-us", help="espeak-ng voice")
+    parser.add_argument("--wpm", type=int, default=165, help="Speaking rate in words per minute")
+    args = parser.parse_args()
+    write_fixtures(args.output, args.voice, args.wpm)
+
+
+if __name__ == "__main__":
+    main()
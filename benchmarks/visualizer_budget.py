@@ -0,0 +1,105 @@
+"""
+Per-frame CPU budget check for the spectral visualizer.
+
+Simulates a recording that grows by one 100 ms block every 100 ms while the UI
+samples SpectralVisualizer.band_levels() at 60 fps, and measures the time each
+frame spends in it: most frames only return cached levels, one in six
+analyzes a new block. Also times a worst-case frame that has to analyze a full
+batch of pending blocks (e.g. after the UI thread stalled). Fails if the p99
+frame time or the worst case exceeds the budget.
+
+Usage:
+    python -m benchmarks.visualizer_budget [--bands 12] [--seconds 10] [--budget-ms 2.0]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.visualizer import BLOCK_FRAMES, MAX_BATCH_BLOCKS, SAMPLE_RATE, SpectralVisualizer
+
+FRAME_INTERVAL_SECONDS = 1 / 60
+
+
+class GrowingBuffer:
+    """The part of RecordingBuffer the visualizer reads, over a prerecorded array."""
+
+    def __init__(self, audio: np.ndarray):
+        self.audio = audio
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    def view(self, start=0, end=None):
+        end = self.length if end is None else min(end, self.length)
+        return self.audio[start:end]
+
+
+def synthetic_speech(seconds: float, seed: int = 0) -> np.ndarray:
+    """Noise with a syllable-rate envelope and low-frequency emphasis, as (frames, 1) int16."""
+    rng = np.random.default_rng(seed)
+    frames = int(seconds * SAMPLE_RATE)
+    noise = np.cumsum(rng.standard_normal(frames)) * 0.05 + rng.standard_normal(frames)
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * np.arange(frames) / SAMPLE_RATE) ** 2
+    audio = noise * envelope
+    audio = audio / np.abs(audio).max() * 8000
+    return audio.astype(np.int16).reshape(-1, 1)
+
+
+def percentile_summary(samples_ms):
+    values = np.array(samples_ms)
+    return {"count": int(values.size), "mean_ms": float(values.mean()), "p50_ms": float(np.percentile(values, 50)),
+            "p99_ms": float(np.percentile(values, 99)), "max_ms": float(values.max())}
+
+
+def run(bands: int, seconds: float):
+    buffer = GrowingBuffer(synthetic_speech(seconds))
+    visualizer = SpectralVisualizer(buffer)
+    visualizer.band_levels(bands)  # build the analyzer outside the measurement
+
+    frame_ms = []
+    total_frames = int(seconds / FRAME_INTERVAL_SECONDS)
+    for frame in range(total_frames):
+        buffer.length = min(len(buffer.audio), int(frame * FRAME_INTERVAL_SECONDS * 10) * BLOCK_FRAMES)
+        started = time.perf_counter()
+        visualizer.band_levels(bands)
+        frame_ms.append((time.perf_counter() - started) * 1000)
+
+    # Worst case: a full batch of blocks pending at once
+    worst_ms = []
+    for _ in range(50):
+        buffer.length = 0
+        visualizer.reset()
+        buffer.length = MAX_BATCH_BLOCKS * BLOCK_FRAMES
+        started = time.perf_counter()
+        visualizer.band_levels(bands)
+        worst_ms.append((time.perf_counter() - started) * 1000)
+
+    return {"bands": bands, "frames": percentile_summary(frame_ms),
+            f"batch_of_{MAX_BATCH_BLOCKS}_blocks": percentile_summary(worst_ms)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that the spectral visualizer fits the per-frame CPU budget.")
+    parser.add_argument("--bands", type=int, default=12, help="Number of bars (12 for the pill UI, 9 for the classic UI)")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Length of the simulated recording")
+    parser.add_argument("--budget-ms", type=float, default=2.0, help="Maximum p99 time per frame")
+    args = parser.parse_args()
+
+    report = run(args.bands, args.seconds)
+    report["budget_ms"] = args.budget_ms
+    print(json.dumps(report, indent=2))
+
+    worst = report[f"batch_of_{MAX_BATCH_BLOCKS}_blocks"]
+    if report["frames"]["p99_ms"] > args.budget_ms or worst["p99_ms"] > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
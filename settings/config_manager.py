@@ -27,6 +27,82 @@ def load_config():
         "coder_config": {"target_language": "Python"},
         "hotkey_config": {"modifiers": ["ctrl", "shift"], "key": "space"},
         "audio_config": {"device": "Default"},
+        "asr_config": {
+            "backend": "nemo",
+            "onnx_intra_op_threads": 0,
+            "streaming_partials": False,
+            "partial_chunk_seconds": 2.0,
+            "long_form_threshold_seconds": 60,
+            "long_form_chunk_seconds": 30,
+            "long_form_overlap_seconds": 1.0,
+            "long_form_batch_size": 4
+        },
+        "residency_config": {
+            "warmup": True,
+            "idle_offload_minutes": 15,
+            "release_on_cpu": True
+        },
+        "vad_config": {
+            "enabled": True,
+            "threshold_db": -55.0,
+            "padding_ms": 200,
+            "max_pause_ms": 700
+        },
+        "hedging_config": {
+            "enabled": False,
+            "secondary_service": "Ollama",
+            "hedge_delay_ms": 1500,
+            "auto_tune": True,
+            "percentile": 95,
+            "min_samples": 20,
+            "min_delay_ms": 250,
+            "max_delay_ms": 10000
+        },
+        "fallback_config": {
+            "enabled": True,
+            "allow_cloud_fallback": False,
+            "chain": ["Mistral", "Gemini", "Ollama", "None (Raw ASR)"],
+            "failure_rate_threshold": 0.5,
+            "window_size": 10,
+            "min_requests": 4,
+            "latency_slo_seconds": 8.0,
+            "slo_output_chars_per_second": 40,
+            "open_seconds": 30
+        },
+        "response_cache_config": {
+            "enabled": True,
+            "persist": False,
+            "max_transcript_chars": 500,
+            "max_memory_entries": 256,
+            "max_disk_entries": 5000,
+            "ttl_hours": 168
+        },
+        "provider_cache_config": {
+            # Opt-in: explicit context caches are billed for storage while they live
+            "gemini_context_cache": False,
+            "gemini_cache_ttl_minutes": 60
+        },
+        "ollama_config": {
+            "keep_alive": "30m",
+            "pin_model": False,
+            "preload_on_record": True
+        },
+        "long_input_config": {
+            "enabled": True,
+            "threshold_chars": 2500,
+            "chunk_chars": 1000,
+            "max_workers": 4,
+            "merge_pass": False
+        },
+        "speculative_config": {
+            "enabled": False,
+            "max_pending_words": 40,
+            "overlap_words": 12
+        },
+        "output_config": {
+            "type_as_it_streams": False,
+            "coalesce_ms": 250
+        },
         "streaming_config": {
             "enabled": False,
             "confidence_threshold": 0.5,
@@ -35,7 +111,8 @@ def load_config():
         },
         "ui_config": {
             "design_theme": "modern",
-            "ui_design": "modern"
+            "ui_design": "modern",
+            "idle_fps": 5
         },
         "logging_config": {
             "enabled": False,
@@ -371,6 +371,12 @@ def open_settings_dialog(app):
     corrections_toggle = ctk.CTkCheckBox(streaming_frame, text="Show correction indicators in streaming widget", variable=app.show_corrections_var)
     corrections_toggle.pack(anchor="w", pady=(0,10))
 
+    # Live partial transcripts
+    asr_config = app.config.get("asr_config", {})
+    app.streaming_partials_var = ctk.BooleanVar(value=asr_config.get("streaming_partials", False))
+    partials_toggle = ctk.CTkCheckBox(streaming_frame, text="Transcribe while recording (live partial transcripts)", variable=app.streaming_partials_var)
+    partials_toggle.pack(anchor="w", pady=(0,10))
+
     # Save Button
     save_button = ctk.CTkButton(app.settings_window, text="Save & Close", command=lambda: save_settings_from_dialog(app))
     save_button.pack(pady=(15,10), side="bottom")
@@ -463,6 +469,7 @@ def save_settings_from_dialog(app):
     app.config.setdefault("audio_config", {})
     app.config.setdefault("hotkey_config", {})
     app.config.setdefault("streaming_config", {})
+    app.config.setdefault("asr_config", {})
 
     # Get API key values
     mistral_key = app.mistral_api_entry.get()
@@ -484,6 +491,7 @@ def save_settings_from_dialog(app):
     app.config["streaming_config"]["confidence_threshold"] = app.confidence_threshold_var.get()
     app.config["streaming_config"]["context_sensitivity"] = app.context_sensitivity_var.get()
     app.config["streaming_config"]["show_corrections"] = app.show_corrections_var.get()
+    app.config["asr_config"]["streaming_partials"] = app.streaming_partials_var.get()
 
     # Save coder config
     app.config.setdefault("coder_config", {})
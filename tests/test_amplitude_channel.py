@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("sounddevice")
+
+from backend.audio import AmplitudeChannel
+from backend.visualizer import BLOCK_FRAMES, SpectralVisualizer
+
+
+def test_view_returns_published_frames():
+    channel = AmplitudeChannel(capacity_frames=10)
+    channel.publish(np.arange(4, dtype=np.int16).reshape(-1, 1))
+    channel.publish(np.arange(4, 8, dtype=np.int16).reshape(-1, 1))
+    assert len(channel) == 8
+    assert channel.view(2, 6).tolist() == [2, 3, 4, 5]
+
+
+def test_ring_wraps_and_forgets_overwritten_frames():
+    channel = AmplitudeChannel(capacity_frames=10)
+    for start in range(0, 16, 4):
+        channel.publish(np.arange(start, start + 4, dtype=np.int16).reshape(-1, 1))
+    assert channel.view(6, 16).tolist() == list(range(6, 16))
+    assert channel.view(5, 16).size == 0
+
+
+def test_block_larger_than_the_ring_keeps_its_end():
+    channel = AmplitudeChannel(capacity_frames=4)
+    channel.publish(np.arange(10, dtype=np.int16).reshape(-1, 1))
+    assert len(channel) == 10
+    assert channel.view(6).tolist() == [6, 7, 8, 9]
+
+
+def test_reset_starts_over():
+    channel = AmplitudeChannel(capacity_frames=10)
+    channel.publish(np.ones((4, 1), dtype=np.int16))
+    channel.reset()
+    assert len(channel) == 0
+    assert channel.view(0).size == 0
+
+
+def test_visualizer_reads_the_channel():
+    channel = AmplitudeChannel()
+    visualizer = SpectralVisualizer(channel)
+    t = np.arange(BLOCK_FRAMES) / 16000
+    channel.publish((8000 * np.sin(2 * np.pi * 1000 * t)).astype(np.int16).reshape(-1, 1))
+    assert visualizer.band_levels(12).max() > 0.0
@@ -0,0 +1,200 @@
+import asyncio
+from types import SimpleNamespace
+
+from backend import circuit_breaker
+from backend.circuit_breaker import RAW_ASR_SERVICE, CircuitBreaker, breaker_for, service_chain, slo_latency
+from backend.llm_providers import LLMProvider, refine_transcript
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_breaker(monkeypatch, **kwargs):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock)
+    options = dict(failure_rate_threshold=0.5, window_size=4, min_requests=4, latency_slo_seconds=1.0, open_seconds=30.0)
+    options.update(kwargs)
+    return CircuitBreaker("Test", **options), clock
+
+
+def open_breaker(breaker):
+    for _ in range(breaker.min_requests):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_stays_closed_below_min_requests(monkeypatch):
+    breaker, _ = make_breaker(monkeypatch)
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+def test_opens_at_failure_rate(monkeypatch):
+    breaker, _ = make_breaker(monkeypatch)
+    breaker.record_success(0.1)
+    breaker.record_success(0.1)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_slow_successes_count_as_half_a_failure(monkeypatch):
+    breaker, _ = make_breaker(monkeypatch)
+    for _ in range(4):
+        breaker.record_success(5.0)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_occasional_slow_success_stays_closed(monkeypatch):
+    breaker, _ = make_breaker(monkeypatch)
+    for latency in (5.0, 0.2, 5.0, 0.2):
+        breaker.record_success(latency)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_slow_probe_neither_closes_nor_reopens(monkeypatch):
+    breaker, clock = make_breaker(monkeypatch)
+    open_breaker(breaker)
+    clock.now += 31.0
+    assert breaker.allow_request()
+    breaker.record_slow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_slo_latency_discounts_generation_time():
+    app = SimpleNamespace(config={"fallback_config": {"slo_output_chars_per_second": 40}})
+    assert slo_latency(app, 10.0, "x" * 400) == 0.0
+    assert slo_latency(app, 10.0, "x" * 200) == 5.0
+
+
+def test_half_open_lets_one_probe_through(monkeypatch):
+    breaker, clock = make_breaker(monkeypatch)
+    open_breaker(breaker)
+    clock.now += 29.0
+    assert not breaker.allow_request()
+    clock.now += 2.0
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request()
+
+
+def test_probe_success_closes(monkeypatch):
+    breaker, clock = make_breaker(monkeypatch)
+    open_breaker(breaker)
+    clock.now += 31.0
+    assert breaker.allow_request()
+    breaker.record_success(0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+    # The failures from before the outage are forgotten
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_probe_failure_reopens(monkeypatch):
+    breaker, clock = make_breaker(monkeypatch)
+    open_breaker(breaker)
+    clock.now += 31.0
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_release_probe_allows_a_new_probe(monkeypatch):
+    breaker, clock = make_breaker(monkeypatch)
+    open_breaker(breaker)
+    clock.now += 31.0
+    assert breaker.allow_request()
+    breaker.release_probe()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_release_probe_is_a_no_op_when_closed(monkeypatch):
+    breaker, _ = make_breaker(monkeypatch)
+    breaker.release_probe()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+def test_service_chain_skips_unselected_cloud_services_by_default():
+    app = SimpleNamespace(config={})
+    assert service_chain(app, "Ollama") == ["Ollama"]
+    assert service_chain(app, "Mistral") == ["Mistral", "Ollama"]
+
+
+def test_service_chain_with_cloud_fallback():
+    app = SimpleNamespace(config={"fallback_config": {"allow_cloud_fallback": True}})
+    assert service_chain(app, "Ollama") == ["Ollama", "Mistral", "Gemini"]
+    assert RAW_ASR_SERVICE not in service_chain(app, "Gemini")
+
+
+def test_service_chain_disabled():
+    app = SimpleNamespace(config={"fallback_config": {"enabled": False}})
+    assert service_chain(app, "Mistral") == ["Mistral"]
+
+
+class FakeProvider(LLMProvider):
+    def __init__(self, name, delay, reply):
+        super().__init__("fake-model")
+        self.name = name
+        self.delay = delay
+        self.reply = reply
+
+    async def complete(self, messages, model_name=None, temperature=0.0):
+        await asyncio.sleep(self.delay)
+        return self.reply
+
+    async def stream(self, messages, model_name=None, temperature=0.0):
+        yield await self.complete(messages, model_name, temperature)
+
+
+def test_hedge_win_releases_the_half_open_probe():
+    app = SimpleNamespace(config={
+        "models_config": {"text_processing_service": "Mistral", "ollama_model_name": "fake-model"},
+        "fallback_config": {"enabled": False},
+        "hedging_config": {"enabled": True, "secondary_service": "Ollama", "auto_tune": False,
+                           "hedge_delay_ms": 50, "min_delay_ms": 50},
+        "response_cache_config": {"enabled": False},
+        "long_input_config": {"enabled": False},
+    })
+    app.llm_providers = {
+        "Mistral": FakeProvider("Mistral", delay=2.0, reply="from mistral"),
+        "Ollama": FakeProvider("Ollama", delay=0.0, reply="from ollama"),
+    }
+    breaker = breaker_for(app, "Mistral")
+    breaker.state = CircuitBreaker.HALF_OPEN
+
+    assert refine_transcript(app, "hello there", mode="typer") == "from ollama"
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_failed_primary_is_recorded_when_the_hedge_wins():
+    app = SimpleNamespace(config={
+        "models_config": {"text_processing_service": "Mistral", "ollama_model_name": "fake-model"},
+        "fallback_config": {"enabled": False},
+        "hedging_config": {"enabled": True, "secondary_service": "Ollama", "auto_tune": False,
+                           "hedge_delay_ms": 50, "min_delay_ms": 50},
+        "response_cache_config": {"enabled": False},
+        "long_input_config": {"enabled": False},
+    })
+    app.llm_providers = {
+        "Mistral": FakeProvider("Mistral", delay=0.0, reply=""),
+        "Ollama": FakeProvider("Ollama", delay=0.0, reply="from ollama"),
+    }
+    breaker = breaker_for(app, "Mistral")
+    breaker.state = CircuitBreaker.HALF_OPEN
+
+    assert refine_transcript(app, "hello there", mode="typer") == "from ollama"
+    assert breaker.state == CircuitBreaker.OPEN
@@ -0,0 +1,50 @@
+from ui.frame_scheduler import CanvasWriter
+
+
+class FakeCanvas:
+    def __init__(self):
+        self.calls = []
+
+    def itemconfig(self, item, **options):
+        self.calls.append(("itemconfig", item, options))
+
+    def coords(self, item, *coords):
+        self.calls.append(("coords", item, coords))
+
+
+def test_itemconfig_forwards_only_changed_options():
+    canvas = FakeCanvas()
+    writer = CanvasWriter(canvas)
+    writer.itemconfig(1, fill="#fff", width=2)
+    writer.itemconfig(1, fill="#fff", width=2)
+    writer.itemconfig(1, fill="#000", width=2)
+    assert canvas.calls == [("itemconfig", 1, {"fill": "#fff", "width": 2}), ("itemconfig", 1, {"fill": "#000"})]
+    assert writer.stats() == {"canvas_writes": 2, "canvas_writes_skipped": 1}
+
+
+def test_options_are_tracked_per_item():
+    canvas = FakeCanvas()
+    writer = CanvasWriter(canvas)
+    writer.itemconfig(1, fill="#fff")
+    writer.itemconfig(2, fill="#fff")
+    assert len(canvas.calls) == 2
+
+
+def test_coords_within_precision_are_skipped():
+    canvas = FakeCanvas()
+    writer = CanvasWriter(canvas)
+    writer.coords(1, 10.0, 20.0)
+    writer.coords(1, 10.1, 20.1)
+    writer.coords(1, 11.0, 20.0)
+    assert [call[2] for call in canvas.calls] == [(10.0, 20.0), (11.0, 20.0)]
+
+
+def test_forget_forces_the_next_write():
+    canvas = FakeCanvas()
+    writer = CanvasWriter(canvas)
+    writer.itemconfig(1, fill="#fff")
+    writer.coords(1, 0, 0)
+    writer.forget(1)
+    writer.itemconfig(1, fill="#fff")
+    writer.coords(1, 0, 0)
+    assert len(canvas.calls) == 4
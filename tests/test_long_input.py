@@ -0,0 +1,59 @@
+from types import SimpleNamespace
+
+from backend import long_input
+from backend.long_input import long_input_applies, refine_long_transcript, split_transcript
+
+
+def test_short_text_is_one_chunk():
+    assert split_transcript("One sentence. Two sentences.", 100) == [("One sentence. Two sentences.", "\n\n")]
+
+
+def test_sentences_are_packed_up_to_chunk_size():
+    chunks = split_transcript("Aaaa aaaa. Bbbb bbbb. Cccc cccc.", 22)
+    assert chunks == [("Aaaa aaaa. Bbbb bbbb.", " "), ("Cccc cccc.", "\n\n")]
+
+
+def test_chunks_never_straddle_paragraphs():
+    chunks = split_transcript("First paragraph.\n\nSecond paragraph.", 1000)
+    assert chunks == [("First paragraph.", "\n\n"), ("Second paragraph.", "\n\n")]
+
+
+def test_long_sentence_is_cut_between_words():
+    sentence = " ".join(["word"] * 30)
+    chunks = split_transcript(sentence, 50)
+    assert all(len(chunk) <= 50 for chunk, _ in chunks)
+    assert " ".join(chunk for chunk, _ in chunks) == sentence
+
+
+def test_reassembly_keeps_the_text():
+    text = "One. Two three.\n\nFour five six. Seven.\n\nEight."
+    chunks = split_transcript(text, 10)
+    rebuilt = "".join(chunk + (separator if i < len(chunks) - 1 else "") for i, (chunk, separator) in enumerate(chunks))
+    assert rebuilt == text
+
+
+def test_applies_to_long_typer_input_only_by_default():
+    app = SimpleNamespace(config={"long_input_config": {"threshold_chars": 10}})
+    long_text = "x" * 11
+    assert long_input_applies(app, long_text, "typer")
+    assert not long_input_applies(app, "short", "typer")
+    assert not long_input_applies(app, long_text, "email")
+    assert not long_input_applies(app, long_text, "coder")
+    app.config["long_input_config"]["merge_pass"] = True
+    assert long_input_applies(app, long_text, "email")
+
+
+def test_failed_chunk_refines_the_whole_transcript(monkeypatch):
+    calls = []
+
+    def fake_refine(app, text, service=None, mode=None, split_long=True, raw_on_failure=True):
+        calls.append(text)
+        if text.startswith("Second"):
+            return None if not raw_on_failure else text
+        return text.upper()
+
+    monkeypatch.setattr(long_input, "refine_transcript", fake_refine)
+    app = SimpleNamespace(config={"long_input_config": {"chunk_chars": 20}})
+    text = "First paragraph.\n\nSecond paragraph."
+    assert refine_long_transcript(app, text, "Mistral", "typer") == text.upper()
+    assert calls[-1] == text
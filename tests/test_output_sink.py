@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+import pytest
+
+import backend.ai
+from backend.output_sink import IncrementalPasteSink, stream_to_focused_window, untyped_remainder
+
+
+@pytest.fixture
+def pasted(monkeypatch):
+    pastes = []
+    monkeypatch.setattr(backend.ai, "output_text", lambda app, text: pastes.append(text))
+    return pastes
+
+
+def make_sink(mode="typer"):
+    return IncrementalPasteSink(SimpleNamespace(), mode=mode, coalesce_seconds=0.0)
+
+
+def test_only_complete_sentences_are_pasted_before_finish(pasted):
+    sink = make_sink()
+    for token in ["Hello", " there.", " How are", " you"]:
+        sink.feed(token)
+    sink._segments.put(sink._END)
+    sink._thread.join(5)
+    assert "".join(pasted) == "Hello there."
+
+
+def test_finish_pastes_the_rest(pasted):
+    sink = make_sink()
+    for token in ["  Hello there.", " How are", " you?  "]:
+        sink.feed(token)
+    assert sink.finish() == "Hello there. How are you?"
+    assert "".join(pasted) == "Hello there. How are you?"
+
+
+def test_newline_is_a_boundary(pasted):
+    sink = make_sink()
+    sink.feed("Item one\nItem")
+    assert sink.finish() == "Item one\nItem"
+
+
+def test_quoted_answer_is_held_back_and_unwrapped(pasted):
+    sink = make_sink()
+    for token in ['"Hello', ' there. ', 'Bye."']:
+        sink.feed(token)
+    assert sink.finish() == "Hello there. Bye."
+    assert pasted == ["Hello there. Bye."]
+
+
+def test_fenced_email_is_held_back_and_unwrapped(pasted):
+    sink = make_sink("email")
+    for token in ["```email\n", "Hi Bob,\n", "Thanks.\n", "```"]:
+        sink.feed(token)
+    assert sink.finish() == "Hi Bob,\nThanks."
+
+
+def test_failed_stream_drops_the_unfinished_sentence(pasted):
+    stream = iter([{"type": "token", "content": "Hello there. How are"},
+                   {"type": "error", "content": "connection reset"}])
+    app = SimpleNamespace(config={"output_config": {"coalesce_ms": 0}})
+    typed_text, completed = stream_to_focused_window(app, stream, "typer")
+    assert (typed_text, completed) == ("Hello there.", False)
+
+
+def test_untyped_remainder_follows_the_typed_prefix():
+    assert untyped_remainder("Hello there.", "Hello there! How are you?") == " How are you?"
+    assert untyped_remainder("Something else entirely.", "Hello there! How are you?") is None
@@ -0,0 +1,109 @@
+from types import SimpleNamespace
+
+from backend import response_cache
+from backend.llm_providers import LLMProvider, refine_transcript
+from backend.response_cache import ResponseCache, make_cache_key, response_cache_for
+
+LANGUAGE = {"target_language": "en", "preserve_original_languages": True}
+
+
+def test_key_ignores_whitespace_and_case():
+    assert make_cache_key("Mistral", "m", "typer", LANGUAGE, "Hello  there") == \
+        make_cache_key("Mistral", "m", "typer", LANGUAGE, " hello there ")
+
+
+def test_key_depends_on_every_setting():
+    base = make_cache_key("Mistral", "m", "typer", LANGUAGE, "hello")
+    assert make_cache_key("Gemini", "m", "typer", LANGUAGE, "hello") != base
+    assert make_cache_key("Mistral", "other", "typer", LANGUAGE, "hello") != base
+    assert make_cache_key("Mistral", "m", "email", LANGUAGE, "hello") != base
+    assert make_cache_key("Mistral", "m", "typer", dict(LANGUAGE, target_language="de"), "hello") != base
+    assert make_cache_key("Mistral", "m", "typer", LANGUAGE, "hello again") != base
+
+
+def test_memory_lru_evicts_least_recently_used():
+    cache = ResponseCache(path=None, max_memory_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"
+    cache.put("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    cache = ResponseCache(path=None, ttl_seconds=60)
+    cache.put("a", "1")
+    now[0] += 59
+    assert cache.get("a") == "1"
+    now[0] += 2
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_disk_store_survives_a_restart(tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+    ResponseCache(path=path).put("a", "1")
+    cache = ResponseCache(path=path)
+    assert cache.get("a") == "1"
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_disk_store_is_opt_in(monkeypatch, tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+    monkeypatch.setattr(response_cache, "RESPONSE_CACHE_PATH", path)
+    response_cache_for(SimpleNamespace(config={})).put("a", "1")
+    assert not (tmp_path / "responses.sqlite3").exists()
+    response_cache_for(SimpleNamespace(config={"response_cache_config": {"persist": True}})).put("a", "1")
+    assert (tmp_path / "responses.sqlite3").exists()
+
+
+class FakeProvider(LLMProvider):
+    def __init__(self, name, reply=None):
+        super().__init__("fake-model")
+        self.name = name
+        self.reply = reply
+        self.calls = 0
+
+    async def complete(self, messages, model_name=None, temperature=0.0):
+        self.calls += 1
+        if self.reply is None:
+            raise ConnectionError("down")
+        return self.reply
+
+    async def stream(self, messages, model_name=None, temperature=0.0):
+        yield await self.complete(messages, model_name, temperature)
+
+
+def test_fallback_answers_are_not_cached_as_the_requested_service():
+    app = SimpleNamespace(config={
+        "models_config": {"text_processing_service": "Mistral", "ollama_model_name": "fake-model"},
+        "long_input_config": {"enabled": False},
+    })
+    mistral, ollama = FakeProvider("Mistral"), FakeProvider("Ollama", "from ollama")
+    app.llm_providers = {"Mistral": mistral, "Ollama": ollama}
+    assert refine_transcript(app, "hello there", mode="typer") == "from ollama"
+
+    mistral.reply = "from mistral"
+    assert refine_transcript(app, "hello there", mode="typer") == "from mistral"
+    assert refine_transcript(app, "hello there", mode="typer") == "from mistral"
+    assert mistral.calls == 2
+
+
+def test_cache_hits_are_not_recorded_as_llm_complete():
+    from backend.metrics import latency
+
+    app = SimpleNamespace(config={
+        "models_config": {"text_processing_service": "Mistral"},
+        "fallback_config": {"enabled": False},
+        "long_input_config": {"enabled": False},
+    })
+    app.llm_providers = {"Mistral": FakeProvider("Mistral", "from mistral")}
+    recorded = len(latency.samples("llm_complete"))
+    refine_transcript(app, "good morning", mode="typer", record_latency=True)
+    assert len(latency.samples("llm_complete")) == recorded + 1
+    refine_transcript(app, "good morning", mode="typer", record_latency=True)
+    assert len(latency.samples("llm_complete")) == recorded + 1
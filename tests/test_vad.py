@@ -0,0 +1,32 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from backend.ai import transcribe_recording
+from backend.vad import SAMPLE_RATE, speech_segments
+
+
+def tone(seconds, level_db):
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    amplitude = 10 ** (level_db / 20) * np.sqrt(2)
+    return (np.sin(2 * np.pi * 220 * t) * amplitude * 32767).astype(np.int16)
+
+
+def test_low_gain_speech_is_detected_by_default():
+    silence = np.zeros(SAMPLE_RATE, dtype=np.int16)
+    audio = np.concatenate([silence, tone(1.0, -50.0), silence])
+    segments = speech_segments(audio)
+    assert len(segments) == 1
+    start, end = segments[0]
+    assert abs(start - SAMPLE_RATE) < SAMPLE_RATE * 0.05
+    assert abs(end - 2 * SAMPLE_RATE) < SAMPLE_RATE * 0.05
+
+
+def test_silence_keeps_the_committed_windows():
+    class FakeTranscriber:
+        def finish(self, audio_data, decode_tail=True):
+            return "committed words" + (" and the tail" if decode_tail else "")
+
+    app = SimpleNamespace(config={"vad_config": {"enabled": True}}, streaming_transcriber=FakeTranscriber())
+    assert transcribe_recording(app, np.zeros(SAMPLE_RATE, dtype=np.int16)) == "committed words"
+    assert app.streaming_transcriber is None
@@ -0,0 +1,55 @@
+import numpy as np
+
+from backend.visualizer import BLOCK_FRAMES, SAMPLE_RATE, SpectralAnalyzer, SpectralVisualizer
+
+
+def sine_block(frequency, amplitude=8000.0):
+    t = np.arange(BLOCK_FRAMES) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.int16)
+
+
+def test_every_band_gets_at_least_one_bin():
+    for num_bands in (9, 12, 32):
+        analyzer = SpectralAnalyzer(num_bands)
+        assert analyzer.band_matrix.shape[1] == num_bands
+        assert np.all(analyzer.band_matrix.sum(axis=0) >= 1)
+        # No bin is counted in two bands
+        assert np.all(analyzer.band_matrix.sum(axis=1) <= 1)
+
+
+def test_tones_land_in_increasing_bands():
+    analyzer = SpectralAnalyzer(12)
+    loudest = [int(np.argmax(analyzer.analyze(sine_block(f)[None, :])[0])) for f in (100, 600, 2400, 7000)]
+    assert loudest == sorted(set(loudest))
+    assert loudest[0] <= 1 and loudest[-1] == 11
+
+
+def test_silence_is_zero():
+    levels = SpectralAnalyzer(12).analyze(np.zeros((2, BLOCK_FRAMES), dtype=np.int16))
+    assert levels.shape == (2, 12)
+    assert np.all(levels == 0.0)
+
+
+class Buffer:
+    def __init__(self, audio):
+        self.audio = audio
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    def view(self, start=0, end=None):
+        return self.audio[start:self.length if end is None else min(end, self.length)]
+
+
+def test_visualizer_analyzes_only_new_blocks_and_resets():
+    buffer = Buffer(np.tile(sine_block(1000), 4))
+    visualizer = SpectralVisualizer(buffer)
+    assert np.all(visualizer.band_levels(12) == 0.0)
+    buffer.length = BLOCK_FRAMES
+    first = visualizer.band_levels(12)
+    assert first.max() > 0.0
+    assert visualizer.band_levels(12) is first
+    visualizer.reset()
+    buffer.length = 0
+    assert np.all(visualizer.band_levels(12) == 0.0)
@@ -2,6 +2,69 @@ import tkinter as tk
 import math
 import numpy as np
 
+from ui.frame_scheduler import CanvasWriter
+
+# Classic UI rendering is retained-mode: every state owns a fixed set of canvas
+# items, created on first use and afterwards only moved/recoloured (through a
+# CanvasWriter, so unchanged values cost nothing) and shown or hidden on state
+# changes. Animated states reschedule a single frame job.
+
+ANIMATION_INTERVAL_MS = {"loading_model": 100, "listening": 35, "processing": 65}
+NUM_PROCESSING_DOTS = 4
+BAR_MAX_HEIGHT = 24; BAR_WIDTH = 4; BAR_SEPARATION = 3
+BAR_SMOOTHING_FACTOR = 0.4
+
+
+class ClassicCanvasItems:
+    """Persistent canvas items of the classic UI, grouped by app state."""
+
+    def __init__(self, app):
+        self.canvas = app.drawing_canvas
+        self.writer = CanvasWriter(self.canvas)
+        self.items = {}
+        self.shown_state = None
+        self.dot_offsets = np.arange(NUM_PROCESSING_DOTS)
+
+    def for_state(self, app, state):
+        if state not in self.items:
+            self.items[state] = create_state_items(app, self.canvas, state)
+        return self.items[state]
+
+    def show(self, app, state):
+        """Show the items of state and hide everything else."""
+        items = self.for_state(app, state)
+        if state != self.shown_state:
+            for other_state, other_items in self.items.items():
+                for item in other_items:
+                    self.writer.itemconfig(item, state="normal" if other_state == state else "hidden")
+            self.shown_state = state
+        return items
+
+
+def create_state_items(app, canvas, state):
+    if state == "loading_model":
+        return [canvas.create_text(0, 0, text="Loading Model...", fill=app.animation_visual_color, font=("Arial", 10))]
+    if state == "initial":
+        return [canvas.create_line(0, 0, 0, 0, fill=app.indicator_line_color, width=5, capstyle=tk.ROUND)]
+    if state == "listening":
+        circle = canvas.create_oval(0, 0, 0, 0, fill=app.accent_color, outline="")
+        bars = [canvas.create_line(0, 0, 0, 0, fill=app.animation_visual_color, width=BAR_WIDTH, capstyle=tk.ROUND)
+                for _ in range(app.num_audio_bars)]
+        return [circle] + bars
+    if state == "processing":
+        return [canvas.create_oval(0, 0, 0, 0, fill=app.accent_color, outline="") for _ in range(NUM_PROCESSING_DOTS)]
+    if state == "error_loading":
+        return [
+            canvas.create_line(0, 0, 0, 0, fill="red", width=5, capstyle=tk.ROUND),
+            canvas.create_text(0, 0, text="Error Loading", fill="red", font=("Arial", 8))
+        ]
+    return []
+
+def _classic_items(app):
+    if getattr(app, 'classic_canvas_items', None) is None:
+        app.classic_canvas_items = ClassicCanvasItems(app)
+    return app.classic_canvas_items
+
 def update_ui_elements(app):
     # Check if modern UI is active
     if hasattr(app, 'modern_ui') and app.modern_ui is not None:
@@ -10,88 +73,89 @@ def update_ui_elements(app):
 
     # Default UI updates
     if not app.master.winfo_exists() or not app.drawing_canvas.winfo_exists(): return
-    app.drawing_canvas.delete("all"); app.master.update_idletasks()
     if not app.is_window_visible: return
 
-    if app.current_state == "loading_model": draw_loading_model_state_ui(app)
-    elif app.current_state == "initial": draw_initial_state_ui(app)
-    elif app.current_state == "listening": draw_listening_state_ui(app)
-    elif app.current_state == "processing": draw_processing_state_ui(app)
-    elif app.current_state == "error_loading": draw_error_loading_state_ui(app)
-
-def draw_loading_model_state_ui(app):
     canvas_width = app.drawing_canvas.winfo_width(); canvas_height = app.drawing_canvas.winfo_height()
-    if canvas_width <=1 or canvas_height <=1: return
-    app.drawing_canvas.create_text(
-        canvas_width / 2, canvas_height / 2,
-        text="Loading Model...", fill=app.animation_visual_color,
-        font=("Arial", 10)
-    )
-    if app.current_state == "loading_model":
-         app.master.after(100, update_ui_elements, app)
+    if canvas_width <= 1 or canvas_height <= 1:
+        # Not laid out yet; settle the geometry once instead of on every frame
+        app.master.update_idletasks()
+        canvas_width = app.drawing_canvas.winfo_width(); canvas_height = app.drawing_canvas.winfo_height()
 
-def draw_initial_state_ui(app):
-    canvas_width = app.drawing_canvas.winfo_width(); canvas_height = app.drawing_canvas.winfo_height()
-    if canvas_width <=1 or canvas_height <=1: return
-    line_width, line_thickness = 40, 5; line_y_pos = canvas_height * 0.5
-    app.drawing_canvas.create_line(
-        (canvas_width-line_width)/2, line_y_pos,
-        (canvas_width+line_width)/2, line_y_pos,
-        fill=app.indicator_line_color, width=line_thickness, capstyle=tk.ROUND
-    )
+    if canvas_width > 1 and canvas_height > 1:
+        if app.current_state == "loading_model": draw_loading_model_state_ui(app, canvas_width, canvas_height)
+        elif app.current_state == "initial": draw_initial_state_ui(app, canvas_width, canvas_height)
+        elif app.current_state == "listening": draw_listening_state_ui(app, canvas_width, canvas_height)
+        elif app.current_state == "processing": draw_processing_state_ui(app, canvas_width, canvas_height)
+        elif app.current_state == "error_loading": draw_error_loading_state_ui(app, canvas_width, canvas_height)
+    _schedule_next_frame(app)
 
-def draw_listening_state_ui(app):
-    canvas_width = app.drawing_canvas.winfo_width(); canvas_height = app.drawing_canvas.winfo_height()
-    if canvas_width <= 1 or canvas_height <= 1: return
+def _schedule_next_frame(app):
+    """Keep exactly one pending frame while the current state is animated."""
+    pending_job = getattr(app, 'classic_animation_job', None)
+    if pending_job is not None:
+        app.master.after_cancel(pending_job)
+        app.classic_animation_job = None
+    interval_ms = ANIMATION_INTERVAL_MS.get(app.current_state)
+    if interval_ms is not None:
+        app.classic_animation_job = app.master.after(interval_ms, _animation_frame, app)
+
+def _animation_frame(app):
+    app.classic_animation_job = None
+    update_ui_elements(app)
+
+def draw_loading_model_state_ui(app, canvas_width, canvas_height):
+    items = _classic_items(app)
+    loading_text, = items.show(app, "loading_model")
+    items.writer.coords(loading_text, canvas_width / 2, canvas_height / 2)
+
+def draw_initial_state_ui(app, canvas_width, canvas_height):
+    items = _classic_items(app)
+    line, = items.show(app, "initial")
+    line_width = 40; line_y_pos = canvas_height * 0.5
+    items.writer.coords(line, (canvas_width-line_width)/2, line_y_pos, (canvas_width+line_width)/2, line_y_pos)
+
+def draw_listening_state_ui(app, canvas_width, canvas_height):
+    items = _classic_items(app)
+    circle, *bars = items.show(app, "listening")
     anim_center_y = canvas_height / 2
     circle_max_radius = 7
     circle_x_offset = 20
     pulsing_radius = circle_max_radius * (0.65 + 0.35 * abs(math.sin(app.animation_step * 0.38)))
-    app.drawing_canvas.create_oval(
+    items.writer.coords(
+        circle,
         circle_x_offset - pulsing_radius, anim_center_y - pulsing_radius,
-        circle_x_offset + pulsing_radius, anim_center_y + pulsing_radius,
-        fill=app.accent_color, outline=""
+        circle_x_offset + pulsing_radius, anim_center_y + pulsing_radius
     )
-    bar_max_h = 24; bar_w = 4; bar_sep = 3
-    total_bars_width = (app.num_audio_bars * (bar_w + bar_sep)) - bar_sep
+
+    # All bar heights in one vector update from the band levels of the newest audio
+    spectral_visualizer = getattr(app, 'spectral_visualizer', None)
+    levels = spectral_visualizer.band_levels(app.num_audio_bars) if spectral_visualizer is not None else 0.0
+    app.bar_target_heights[:] = BAR_MAX_HEIGHT * (0.15 + 0.85 * levels)
+    app.bar_current_heights += (app.bar_target_heights - app.bar_current_heights) * BAR_SMOOTHING_FACTOR
+    half_heights = np.maximum(2, app.bar_current_heights) / 2
+
+    total_bars_width = (app.num_audio_bars * (BAR_WIDTH + BAR_SEPARATION)) - BAR_SEPARATION
     bars_start_x_centered = (canvas_width - total_bars_width) / 2
-    smoothing_factor = 0.4
-    for i in range(app.num_audio_bars):
-        phase_shift = i * 0.65
-        amplitude_modulation_factor = 0.6 + 0.4 * abs(math.sin(app.animation_step * 0.15 + phase_shift))
-        effective_normalized_amplitude = app.current_normalized_amplitude * amplitude_modulation_factor
-        target_h_factor = 0.15 + 0.85 * min(effective_normalized_amplitude, 1.0)
-        app.bar_target_heights[i] = bar_max_h * target_h_factor
-        app.bar_current_heights[i] += (app.bar_target_heights[i] - app.bar_current_heights[i]) * smoothing_factor
-        bar_dynamic_height = max(2, app.bar_current_heights[i])
-        current_bar_x_center = bars_start_x_centered + i * (bar_w + bar_sep) + (bar_w / 2)
-        app.drawing_canvas.create_line(
-            current_bar_x_center, anim_center_y - bar_dynamic_height / 2,
-            current_bar_x_center, anim_center_y + bar_dynamic_height / 2,
-            fill=app.animation_visual_color, width=bar_w, capstyle=tk.ROUND
-        )
+    bar_x_centers = bars_start_x_centered + np.arange(app.num_audio_bars) * (BAR_WIDTH + BAR_SEPARATION) + BAR_WIDTH / 2
+    for bar, x, half_height in zip(bars, bar_x_centers.tolist(), half_heights.tolist()):
+        items.writer.coords(bar, x, anim_center_y - half_height, x, anim_center_y + half_height)
     app.animation_step += 1
-    if app.current_state == "listening": app.master.after(35, update_ui_elements, app)
 
-def draw_processing_state_ui(app):
-    canvas_width = app.drawing_canvas.winfo_width(); canvas_height = app.drawing_canvas.winfo_height()
-    if canvas_width <=1 or canvas_height <=1: return
+def draw_processing_state_ui(app, canvas_width, canvas_height):
+    items = _classic_items(app)
+    dots = items.show(app, "processing")
     anim_center_x, anim_center_y = canvas_width/2, canvas_height/2
-    dot_max_radius = 3.5; orbit_dist = 12 * 1.3; num_processing_dots = 4
-    for i in range(num_processing_dots):
-        angle = (app.animation_step*0.075 + (2*math.pi/num_processing_dots)*i)
-        dot_center_x = anim_center_x + orbit_dist*math.cos(angle)
-        dot_center_y = anim_center_y + orbit_dist*math.sin(angle)
-        current_dot_size = dot_max_radius * (0.65 + 0.35 * abs(math.sin(app.animation_step*0.12 + i*2)))
-        app.drawing_canvas.create_oval(dot_center_x-current_dot_size, dot_center_y-current_dot_size, dot_center_x+current_dot_size, dot_center_y+current_dot_size, fill=app.accent_color, outline="")
+    dot_max_radius = 3.5; orbit_dist = 12 * 1.3
+    angles = app.animation_step*0.075 + (2*math.pi/NUM_PROCESSING_DOTS)*items.dot_offsets
+    dot_center_xs = anim_center_x + orbit_dist*np.cos(angles)
+    dot_center_ys = anim_center_y + orbit_dist*np.sin(angles)
+    dot_sizes = dot_max_radius * (0.65 + 0.35 * np.abs(np.sin(app.animation_step*0.12 + items.dot_offsets*2)))
+    for dot, x, y, size in zip(dots, dot_center_xs.tolist(), dot_center_ys.tolist(), dot_sizes.tolist()):
+        items.writer.coords(dot, x-size, y-size, x+size, y+size)
     app.animation_step += 1
-    if app.current_state == "processing": app.master.after(65, update_ui_elements, app)
 
-def draw_error_loading_state_ui(app):
-    canvas_width = app.drawing_canvas.winfo_width(); canvas_height = app.drawing_canvas.winfo_height()
-    if canvas_width <=1 or canvas_height <=1: return
-    app.drawing_canvas.create_line(canvas_width/2 - 10, canvas_height/2, canvas_width/2 + 10, canvas_height/2, fill="red", width=5, capstyle=tk.ROUND)
-    app.drawing_canvas.create_text(
-        canvas_width / 2, canvas_height / 2 + 10,
-        text="Error Loading", fill="red", font=("Arial", 8)
-    ) 
\ No newline at end of file
+def draw_error_loading_state_ui(app, canvas_width, canvas_height):
+    items = _classic_items(app)
+    line, text = items.show(app, "error_loading")
+    items.writer.coords(line, canvas_width/2 - 10, canvas_height/2, canvas_width/2 + 10, canvas_height/2)
+    items.writer.coords(text, canvas_width / 2, canvas_height / 2 + 10)
@@ -0,0 +1,152 @@
+"""
+Demand-driven frame scheduling for the canvas UIs.
+
+FrameScheduler calls a render callback at the full frame rate only while the
+UI is active (recording, processing, loading). When idle it drops to a low
+tick, or with idle_interval_ms=0 to no tick at all, redrawing only when
+request_frame() is called. CanvasWriter remembers what was last written to
+every canvas item and skips itemconfig/coords calls that would not change
+anything, so a steady frame costs no Tk work.
+
+Both keep counters (frames, idle wake-ups, frame times, skipped writes) that
+stats() reports for profiling.
+"""
+import time
+from collections import deque
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+ACTIVE_INTERVAL_MS = 16  # ~60 fps
+IDLE_INTERVAL_MS = 200  # 5 fps
+FRAME_TIME_SAMPLES = 600
+
+
+class FrameScheduler:
+    """Runs render() on the Tk loop at an active or idle rate."""
+
+    def __init__(self, master, render: Callable[[], None], active_interval_ms: int = ACTIVE_INTERVAL_MS,
+                 idle_interval_ms: int = IDLE_INTERVAL_MS):
+        self.master = master
+        self.render = render
+        self.active_interval_ms = active_interval_ms
+        self.idle_interval_ms = idle_interval_ms
+        self.active = False
+        self.frames = 0
+        self.idle_wakeups = 0
+        self.frame_times: deque = deque(maxlen=FRAME_TIME_SAMPLES)
+        self._job = None
+        self._job_due = 0.0
+        self._running = False
+
+    def start(self):
+        self._running = True
+        self.request_frame()
+
+    def stop(self):
+        self._running = False
+        self._cancel()
+
+    def set_active(self, active: bool):
+        """Switch between the full and the idle frame rate."""
+        if active == self.active:
+            return
+        self.active = active
+        # Going active must not wait out a pending idle tick
+        self.request_frame()
+
+    def request_frame(self):
+        """Render as soon as possible (within one active frame interval)."""
+        if not self._running:
+            return
+        due = time.monotonic() + self.active_interval_ms / 1000
+        if self._job is not None and self._job_due <= due:
+            return
+        self._schedule(0)
+
+    def _schedule(self, delay_ms: int):
+        self._cancel()
+        self._job_due = time.monotonic() + delay_ms / 1000
+        self._job = self.master.after(delay_ms, self._tick)
+
+    def _cancel(self):
+        if self._job is not None:
+            try:
+                self.master.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    def _tick(self):
+        self._job = None
+        if not self._running:
+            return
+        if not self.active:
+            self.idle_wakeups += 1
+        started = time.perf_counter()
+        try:
+            self.render()
+        finally:
+            self.frames += 1
+            self.frame_times.append(time.perf_counter() - started)
+        if not self._running or self._job is not None:
+            return
+        if self.active:
+            self._schedule(self.active_interval_ms)
+        elif self.idle_interval_ms > 0:
+            self._schedule(self.idle_interval_ms)
+
+    def stats(self) -> Dict[str, float]:
+        frame_ms = np.array(self.frame_times, dtype=np.float64) * 1000
+        stats = {"frames": self.frames, "idle_wakeups": self.idle_wakeups, "active": self.active}
+        if frame_ms.size:
+            stats.update(mean_frame_ms=float(frame_ms.mean()), p95_frame_ms=float(np.percentile(frame_ms, 95)),
+                         max_frame_ms=float(frame_ms.max()))
+        return stats
+
+
+class CanvasWriter:
+    """itemconfig/coords front-end for a Tk canvas that only forwards changes."""
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.writes = 0
+        self.skipped = 0
+        self._options: Dict[Tuple[int, str], object] = {}
+        self._coords: Dict[int, Tuple[float, ...]] = {}
+
+    def itemconfig(self, item, **options):
+        changed = {}
+        for option, value in options.items():
+            key = (item, option)
+            if self._options.get(key) != value:
+                self._options[key] = value
+                changed[option] = value
+        if changed:
+            self.canvas.itemconfig(item, **changed)
+            self.writes += 1
+        else:
+            self.skipped += 1
+
+    def coords(self, item, *coords, precision: float = 0.5):
+        """Move item unless every coordinate is within precision pixels of the last write."""
+        rounded = tuple(round(c / precision) * precision for c in coords)
+        if self._coords.get(item) == rounded:
+            self.skipped += 1
+            return
+        self._coords[item] = rounded
+        self.canvas.coords(item, *coords)
+        self.writes += 1
+
+    def forget(self, item: Optional[int] = None):
+        """Drop remembered values (e.g. after the item was changed directly on the canvas)."""
+        if item is None:
+            self._options.clear()
+            self._coords.clear()
+            return
+        self._coords.pop(item, None)
+        for key in [key for key in self._options if key[0] == item]:
+            del self._options[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {"canvas_writes": self.writes, "canvas_writes_skipped": self.skipped}
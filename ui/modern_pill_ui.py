@@ -3,9 +3,31 @@ from tkinter import Canvas
 import math
 import random
 import time
+from functools import lru_cache
 from threading import Thread
 import sys
 
+from ui.frame_scheduler import CanvasWriter, FrameScheduler
+
+# States animated at the full frame rate; the others run on the idle tick
+ACTIVE_STATES = ("listening", "processing", "loading")
+# Animation step sizes below were tuned per 16 ms frame; they are scaled by elapsed time
+REFERENCE_FRAME_SECONDS = 0.016
+
+
+@lru_cache(maxsize=512)
+def _hex_color(r, g, b):
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def _grey(value):
+    return _hex_color(value, value, value)
+
+
+def _glow_blue(alpha):
+    """The accent blue (#4a9eff) dimmed to alpha."""
+    return _hex_color(int(74 * alpha), int(158 * alpha), int(255 * alpha))
+
 
 class ModernPillUI:
     def __init__(self, app):
@@ -41,11 +63,14 @@ class ModernPillUI:
         self.pulse_radius = 12
         self.pulse_direction = 1
         self.audio_bars = [0] * 12
+        self.audio_bar_targets = [0.1] * 12
         self.processing_angle = 0
         self.pulse_alpha = 0
         self.bar_pulse = 0
         self.bar_direction = 1
         self.animation_time = 0
+        self._animation_epoch = time.monotonic()
+        self._last_frame = self._animation_epoch
 
         # Create the main canvas with a specific background color
         self.canvas = Canvas(
@@ -148,6 +173,26 @@ class ModernPillUI:
             tags="loading_text"
         )
 
+        # Create live partial transcript line (shown under the audio bars)
+        self.partial_transcript = ""
+        self.partial_text = self.canvas.create_text(
+            self.width//2 + 20, self.height - 7,
+            text="",
+            fill="#808080",
+            font=("Segoe UI", 7),
+            tags="partial_text"
+        )
+
+        # Canvas writes go through the writer so unchanged values cost nothing;
+        # frames run at full rate only in the animated states
+        self.writer = CanvasWriter(self.canvas)
+        ui_config = app.config.get("ui_config", {}) if hasattr(app, 'config') else {}
+        idle_fps = ui_config.get("idle_fps", 5)
+        self.scheduler = FrameScheduler(
+            app.master, self.animate,
+            idle_interval_ms=int(1000 / idle_fps) if idle_fps > 0 else 0
+        )
+
         # Set initial state based on app's current state
         self.update_state_from_app()
 
@@ -157,7 +202,7 @@ class ModernPillUI:
         self.canvas.bind("<ButtonRelease-1>", self.on_release)
 
         # Start the animation loop
-        self.animate()
+        self.scheduler.start()
 
     def draw_pill_background(self):
         """Draw the pill-shaped background with anti-aliasing"""
@@ -224,110 +269,119 @@ class ModernPillUI:
         """Update visibility of elements based on current state"""
         if self.state == "loading":
             # Show loading text, hide others
-            self.canvas.itemconfig(self.ready_bar, state="hidden")
+            self.writer.itemconfig(self.ready_bar, state="hidden")
             for bar in self.audio_bar_objects:
-                self.canvas.itemconfig(bar, state="hidden")
+                self.writer.itemconfig(bar, state="hidden")
             for part in self.spinner_parts:
-                self.canvas.itemconfig(part, state="hidden")
-            self.canvas.itemconfig(self.error_x1, state="hidden")
-            self.canvas.itemconfig(self.error_x2, state="hidden")
-            self.canvas.itemconfig(self.processing_text, state="hidden")
-            self.canvas.itemconfig(self.error_text, state="hidden")
-            self.canvas.itemconfig(self.loading_text, state="normal")
+                self.writer.itemconfig(part, state="hidden")
+            self.writer.itemconfig(self.error_x1, state="hidden")
+            self.writer.itemconfig(self.error_x2, state="hidden")
+            self.writer.itemconfig(self.processing_text, state="hidden")
+            self.writer.itemconfig(self.error_text, state="hidden")
+            self.writer.itemconfig(self.loading_text, state="normal")
 
         elif self.state == "ready":
             # Show ready bar, hide others
-            self.canvas.itemconfig(self.ready_bar, state="normal")
+            self.writer.itemconfig(self.ready_bar, state="normal")
             for bar in self.audio_bar_objects:
-                self.canvas.itemconfig(bar, state="hidden")
+                self.writer.itemconfig(bar, state="hidden")
             for part in self.spinner_parts:
-                self.canvas.itemconfig(part, state="hidden")
-            self.canvas.itemconfig(self.error_x1, state="hidden")
-            self.canvas.itemconfig(self.error_x2, state="hidden")
-            self.canvas.itemconfig(self.processing_text, state="hidden")
-            self.canvas.itemconfig(self.error_text, state="hidden")
-            self.canvas.itemconfig(self.loading_text, state="hidden")
+                self.writer.itemconfig(part, state="hidden")
+            self.writer.itemconfig(self.error_x1, state="hidden")
+            self.writer.itemconfig(self.error_x2, state="hidden")
+            self.writer.itemconfig(self.processing_text, state="hidden")
+            self.writer.itemconfig(self.error_text, state="hidden")
+            self.writer.itemconfig(self.loading_text, state="hidden")
 
         elif self.state == "listening":
             # Show audio bars, hide others
-            self.canvas.itemconfig(self.ready_bar, state="hidden")
+            self.writer.itemconfig(self.ready_bar, state="hidden")
             for bar in self.audio_bar_objects:
-                self.canvas.itemconfig(bar, state="normal")
+                self.writer.itemconfig(bar, state="normal")
             for part in self.spinner_parts:
-                self.canvas.itemconfig(part, state="hidden")
-            self.canvas.itemconfig(self.error_x1, state="hidden")
-            self.canvas.itemconfig(self.error_x2, state="hidden")
-            self.canvas.itemconfig(self.processing_text, state="hidden")
-            self.canvas.itemconfig(self.error_text, state="hidden")
-            self.canvas.itemconfig(self.loading_text, state="hidden")
+                self.writer.itemconfig(part, state="hidden")
+            self.writer.itemconfig(self.error_x1, state="hidden")
+            self.writer.itemconfig(self.error_x2, state="hidden")
+            self.writer.itemconfig(self.processing_text, state="hidden")
+            self.writer.itemconfig(self.error_text, state="hidden")
+            self.writer.itemconfig(self.loading_text, state="hidden")
 
         elif self.state == "processing":
             # Show spinner, hide others
-            self.canvas.itemconfig(self.ready_bar, state="hidden")
+            self.writer.itemconfig(self.ready_bar, state="hidden")
             for bar in self.audio_bar_objects:
-                self.canvas.itemconfig(bar, state="hidden")
+                self.writer.itemconfig(bar, state="hidden")
             for part in self.spinner_parts:
-                self.canvas.itemconfig(part, state="normal")
-            self.canvas.itemconfig(self.error_x1, state="hidden")
-            self.canvas.itemconfig(self.error_x2, state="hidden")
-            self.canvas.itemconfig(self.processing_text, state="normal")
-            self.canvas.itemconfig(self.error_text, state="hidden")
-            self.canvas.itemconfig(self.loading_text, state="hidden")
+                self.writer.itemconfig(part, state="normal")
+            self.writer.itemconfig(self.error_x1, state="hidden")
+            self.writer.itemconfig(self.error_x2, state="hidden")
+            self.writer.itemconfig(self.processing_text, state="normal")
+            self.writer.itemconfig(self.error_text, state="hidden")
+            self.writer.itemconfig(self.loading_text, state="hidden")
 
         elif self.state == "error":
             # Show error, hide others
-            self.canvas.itemconfig(self.ready_bar, state="hidden")
+            self.writer.itemconfig(self.ready_bar, state="hidden")
             for bar in self.audio_bar_objects:
-                self.canvas.itemconfig(bar, state="hidden")
+                self.writer.itemconfig(bar, state="hidden")
             for part in self.spinner_parts:
-                self.canvas.itemconfig(part, state="hidden")
-            self.canvas.itemconfig(self.error_x1, state="normal")
-            self.canvas.itemconfig(self.error_x2, state="normal")
-            self.canvas.itemconfig(self.processing_text, state="hidden")
-            self.canvas.itemconfig(self.error_text, state="normal")
-            self.canvas.itemconfig(self.loading_text, state="hidden")
+                self.writer.itemconfig(part, state="hidden")
+            self.writer.itemconfig(self.error_x1, state="normal")
+            self.writer.itemconfig(self.error_x2, state="normal")
+            self.writer.itemconfig(self.processing_text, state="hidden")
+            self.writer.itemconfig(self.error_text, state="normal")
+            self.writer.itemconfig(self.loading_text, state="hidden")
+
+        # Partial transcripts belong to the current recording only
+        if self.state not in ("listening", "processing"):
+            self.partial_transcript = ""
+            self.writer.itemconfig(self.partial_text, text="")
+        self.writer.itemconfig(
+            self.partial_text,
+            state="normal" if self.state == "listening" and self.partial_transcript else "hidden"
+        )
+
+        self.scheduler.set_active(self.state in ACTIVE_STATES)
+        self.scheduler.request_frame()
 
     def animate(self):
-        """Main animation loop with smooth 60fps rendering"""
-        self.animation_time += 0.016  # ~60fps
+        """Render one animation frame; called by the frame scheduler"""
+        now = time.monotonic()
+        # Frame-based animation steps scaled to the time since the last frame,
+        # so the animations keep their speed at any frame rate
+        steps = min((now - self._last_frame) / REFERENCE_FRAME_SECONDS, 30.0)
+        self._last_frame = now
+        self.animation_time = now - self._animation_epoch
 
         if self.state == "loading":
             # Animate loading text with subtle pulsing effect
             loading_alpha = 0.6 + 0.4 * abs(math.sin(self.animation_time * 2))
-            loading_color_value = int(160 * loading_alpha)
-            loading_color = f"#{loading_color_value:02x}{loading_color_value:02x}{loading_color_value:02x}"
-            self.canvas.itemconfig(self.loading_text, fill=loading_color)
+            self.writer.itemconfig(self.loading_text, fill=_grey(int(160 * loading_alpha)))
 
             # Update state circle to show loading state with glow effect
             circle_alpha = 0.5 + 0.3 * abs(math.sin(self.animation_time * 1.5))
-            circle_color_value = int(128 * circle_alpha)
-            circle_color = f"#{circle_color_value:02x}{circle_color_value:02x}{circle_color_value:02x}"
-            self.canvas.itemconfig(self.state_circle, fill=circle_color)
+            self.writer.itemconfig(self.state_circle, fill=_grey(int(128 * circle_alpha)))
 
         elif self.state == "ready":
             # Animate the ready bar with smooth pulsing
-            self.bar_pulse += 0.02 * self.bar_direction
+            self.bar_pulse += 0.02 * self.bar_direction * steps
             if self.bar_pulse > 1 or self.bar_pulse < 0:
+                self.bar_pulse = min(1.0, max(0.0, self.bar_pulse))
                 self.bar_direction *= -1
 
             # Update bar color with smooth transition
             bar_alpha = 0.5 + self.bar_pulse * 0.5
-            bar_color_value = int(160 * bar_alpha)
-            bar_color = f"#{bar_color_value:02x}{bar_color_value:02x}{bar_color_value:02x}"
-            self.canvas.itemconfig(self.ready_bar, fill=bar_color)
+            self.writer.itemconfig(self.ready_bar, fill=_grey(int(160 * bar_alpha)))
 
             # Update state circle color with glow effect
             circle_alpha = 0.7 + 0.3 * abs(math.sin(self.animation_time * 2))
-            circle_r = int(74 * circle_alpha)
-            circle_g = int(158 * circle_alpha)
-            circle_b = int(255 * circle_alpha)
-            circle_color = f"#{circle_r:02x}{circle_g:02x}{circle_b:02x}"
-            self.canvas.itemconfig(self.state_circle, fill=circle_color)
+            self.writer.itemconfig(self.state_circle, fill=_glow_blue(circle_alpha))
 
         elif self.state == "listening":
             # Update pulse animation
-            self.pulse_radius += 0.2 * self.pulse_direction
+            self.pulse_radius += 0.2 * self.pulse_direction * steps
             if self.pulse_radius > 16 or self.pulse_radius < 12:
+                self.pulse_radius = min(16.0, max(12.0, self.pulse_radius))
                 self.pulse_direction *= -1
 
             # Update pulse alpha
@@ -335,11 +389,16 @@ class ModernPillUI:
 
             # Update state circle with glow effect
             circle_alpha = 0.8 + 0.2 * abs(math.sin(self.animation_time * 3))
-            circle_r = int(74 * circle_alpha)
-            circle_g = int(158 * circle_alpha)
-            circle_b = int(255 * circle_alpha)
-            circle_color = f"#{circle_r:02x}{circle_g:02x}{circle_b:02x}"
-            self.canvas.itemconfig(self.state_circle, fill=circle_color)
+            self.writer.itemconfig(self.state_circle, fill=_glow_blue(circle_alpha))
+
+            # Bars show the spectrum of the newest audio (low to high frequency), analyzed
+            # here on the Tk thread
+            spectral_visualizer = getattr(self.app, 'spectral_visualizer', None)
+            if spectral_visualizer is not None:
+                self.update_audio_bars(spectral_visualizer.band_levels(len(self.audio_bars)).tolist())
+            easing = min(1.0, 0.35 * steps)
+            for i, target in enumerate(self.audio_bar_targets):
+                self.audio_bars[i] += (target - self.audio_bars[i]) * easing
 
             # Update audio bars with smooth animation and glow
             bar_width = 6
@@ -352,63 +411,48 @@ class ModernPillUI:
                 x = start_x + i * (bar_width + bar_spacing)
                 bar_height = height * max_height * 0.8
 
-                # Create pill-shaped bars with rounded ends
-                # Calculate the new oval dimensions
-                new_y1 = center_y - bar_height/2
-                new_y2 = center_y + bar_height/2
-
-                # Update the oval to create a pill shape
-                self.canvas.coords(
+                # Update the oval to create a pill shape with rounded ends
+                self.writer.coords(
                     self.audio_bar_objects[i],
-                    x, new_y1, x + bar_width, new_y2
+                    x, center_y - bar_height/2, x + bar_width, center_y + bar_height/2
                 )
 
                 # Add glow effect to audio bar color
                 bar_alpha = min(1.0, 0.6 + 0.4 * height + 0.2 * abs(math.sin(self.animation_time * 5 + i * 0.5)))
-                bar_color_value = min(255, int(240 * bar_alpha))
-                bar_color = f"#{bar_color_value:02x}{bar_color_value:02x}{bar_color_value:02x}"
-                self.canvas.itemconfig(self.audio_bar_objects[i], fill=bar_color)
+                self.writer.itemconfig(self.audio_bar_objects[i], fill=_grey(min(255, int(240 * bar_alpha))))
 
         elif self.state == "processing":
             # Update spinner animation
-            self.processing_angle = (self.processing_angle + 5) % 360
+            self.processing_angle = (self.processing_angle + 5 * steps) % 360
 
             # Update spinner parts
             for i, part in enumerate(self.spinner_parts):
-                start_angle = self.processing_angle + i * 30
-                extent = 90 - i * 20
-                self.canvas.itemconfig(part, start=start_angle)
+                self.writer.itemconfig(part, start=int(self.processing_angle + i * 30))
 
             # Update state circle color with glow effect
             circle_alpha = 0.7 + 0.3 * abs(math.sin(self.animation_time * 2.5))
-            circle_r = int(74 * circle_alpha)
-            circle_g = int(158 * circle_alpha)
-            circle_b = int(255 * circle_alpha)
-            circle_color = f"#{circle_r:02x}{circle_g:02x}{circle_b:02x}"
-            self.canvas.itemconfig(self.state_circle, fill=circle_color)
-            # Add to processing state animation:
+            self.writer.itemconfig(self.state_circle, fill=_glow_blue(circle_alpha))
             text_alpha = 0.6 + 0.4 * abs(math.sin(self.animation_time * 2))
-            text_color_value = int(160 * text_alpha)
-            text_color = f"#{text_color_value:02x}{text_color_value:02x}{text_color_value:02x}"
-            self.canvas.itemconfig(self.processing_text, fill=text_color)
+            self.writer.itemconfig(self.processing_text, fill=_grey(int(160 * text_alpha)))
 
         elif self.state == "error":
             # Update state circle to red
-            self.canvas.itemconfig(self.state_circle, fill="#ff5555")
+            self.writer.itemconfig(self.state_circle, fill="#ff5555")
 
             # Animate error state with subtle shake
             shake_offset = math.sin(self.animation_time * 10) * 2
-            self.canvas.coords(
+            self.writer.coords(
                 self.error_x1,
                 24 + shake_offset, 24, 36 + shake_offset, 36
             )
-            self.canvas.coords(
+            self.writer.coords(
                 self.error_x2,
                 36 + shake_offset, 24, 24 + shake_offset, 36
             )
 
-        # Schedule the next animation frame
-        self.animation_job = self.app.master.after(16, self.animate)  # ~60fps
+    def frame_stats(self):
+        """Frame-time, idle wake-up and canvas write counters"""
+        return {**self.scheduler.stats(), **self.writer.stats()}
 
     def on_click(self, event):
         """Handle mouse click - only for dragging, no recording functionality"""
@@ -452,26 +496,27 @@ class ModernPillUI:
             self.app.current_state = "processing"
             self.app._stop_audio_recording_and_process()
 
-    def update_audio_bars(self, amplitude):
-        """Update audio bars based on actual audio input"""
-        # Map the amplitude to audio bar heights
-        for i in range(len(self.audio_bars)):
-            # Create variation across bars based on position
-            phase_shift = i * 0.5
-            time_value = time.time()
-
-            # Create natural variation pattern
-            base_pattern = math.sin(time_value * 3 + phase_shift) * 0.3
-            variation = math.sin(time_value * 7 + i * 0.8) * 0.2
-
-            # Apply amplitude and variations
-            self.audio_bars[i] = max(0.1, min(1.0, amplitude * 0.8 + base_pattern + variation + 0.2))
+    def update_audio_bars(self, levels):
+        """Set bar targets from measured levels (0..1, one per bar, left to right)"""
+        num_bars = len(self.audio_bar_targets)
+        levels = list(levels)[-num_bars:]
+        padded = [0.0] * (num_bars - len(levels)) + levels
+        self.audio_bar_targets = [max(0.1, min(1.0, level)) for level in padded]
+
+    def update_partial_transcript(self, text):
+        """Show the tail of the live ASR hypothesis while recording"""
+        self.partial_transcript = text
+        max_chars = 34
+        display_text = text if len(text) <= max_chars else "…" + text[-(max_chars - 1):]
+        self.writer.itemconfig(self.partial_text, text=display_text)
+        self.update_visibility()
 
     def finish_processing(self):
         """Transition from processing to ready state"""
         self.state = "ready"
         self.update_visibility()
         self.audio_bars = [0] * 12
+        self.audio_bar_targets = [0.1] * 12
 
         # Map to app's state system
         self.app.current_state = "initial"
@@ -498,9 +543,8 @@ class ModernPillUI:
     def destroy(self):
         """Clean up modern UI components"""
         # Cancel animation loop first to prevent accessing destroyed canvas
-        if hasattr(self, 'animation_job'):
-            self.app.master.after_cancel(self.animation_job)
-            self.animation_job = None
+        if hasattr(self, 'scheduler'):
+            self.scheduler.stop()
 
         if hasattr(self, 'canvas'):
             self.canvas.destroy()
\ No newline at end of file
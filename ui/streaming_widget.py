@@ -1,9 +1,15 @@
 import customtkinter as ctk
 import tkinter as tk
 from typing import Dict, Any, Optional
+from collections import deque
 import threading
 import time
 
+from backend.metrics import latency
+
+# Pending stream updates are rendered at most once per frame
+RENDER_FRAME_MS = 16
+
 class StreamingWidget:
     """
     A streaming widget that appears above the main button and moves with it.
@@ -17,6 +23,8 @@ class StreamingWidget:
         self.is_streaming = False
         self.accumulated_text = ""
         self.corrections_count = 0
+        # True once the text was typed into the focused window while streaming
+        self.auto_pasted = False
         self.streaming_active = False
         self.is_resizable = False
         self.resize_button = None
@@ -43,6 +51,14 @@ class StreamingWidget:
         # Position tracking for button connection
         self.position_update_job = None
         self.first_token_received = False
+
+        # Stream updates from the worker thread, drained by one frame-paced Tk callback
+        self.pending_updates = deque()  # (stream_data, enqueued_at)
+        self.pending_lock = threading.Lock()
+        self.drain_scheduled = False
+        self.render_frames = 0
+        self.max_queue_depth = 0
+        self.queue_depths = deque(maxlen=1000)
         
     def show_streaming_widget(self, original_text: str):
         """
@@ -160,6 +176,7 @@ class StreamingWidget:
         # Initialize state
         self.accumulated_text = ""
         self.corrections_count = 0
+        self.auto_pasted = False
         self.is_streaming = True
         self.streaming_active = True
         
@@ -169,6 +186,22 @@ class StreamingWidget:
         # Start position tracking
         self.start_position_tracking()
         
+    def show_partial_transcript(self, partial_text: str):
+        """
+        Show the live ASR hypothesis while the hotkey is still held.
+        """
+        if self.streaming_frame is None or not self.streaming_active:
+            self.show_streaming_widget(partial_text)
+
+        try:
+            self.text_widget.delete("1.0", tk.END)
+            self.text_widget.insert("1.0", partial_text)
+            self.text_widget.see(tk.END)
+            if self.confidence_indicator:
+                self.confidence_indicator.configure(text="● Listening...", text_color="#4A9EFF")
+        except Exception as e:
+            print(f"Error updating partial transcript: {e}")
+
     def update_widget_position(self):
         """Update widget position relative to main button."""
         if not self.streaming_frame or not self.streaming_active:
@@ -363,6 +396,56 @@ class StreamingWidget:
             self.streaming_frame.configure(cursor="sizing")
         self.resize_mode = None
         
+    def enqueue_stream_data(self, stream_data: Dict[str, Any]):
+        """
+        Queue a stream update from any thread.
+
+        Only the first update after a drain schedules a Tk callback, so a fast
+        model does not flood the event queue with one closure per token.
+        """
+        with self.pending_lock:
+            self.pending_updates.append((stream_data, time.perf_counter()))
+            if self.drain_scheduled:
+                return
+            self.drain_scheduled = True
+        self.parent_app.master.after(RENDER_FRAME_MS, self.drain_pending_updates)
+
+    def drain_pending_updates(self):
+        """Render everything queued since the last frame; consecutive tokens go in with one insert."""
+        with self.pending_lock:
+            updates = list(self.pending_updates)
+            self.pending_updates.clear()
+            self.drain_scheduled = False
+        if not updates:
+            return
+
+        self.render_frames += 1
+        self.queue_depths.append(len(updates))
+        self.max_queue_depth = max(self.max_queue_depth, len(updates))
+        # Time from the oldest queued update to its render
+        latency.record("stream_render_lag", time.perf_counter() - updates[0][1])
+
+        pending_tokens = []
+        for stream_data, _ in updates:
+            if stream_data.get("type") == "token":
+                pending_tokens.append(stream_data.get("content", ""))
+                continue
+            if pending_tokens:
+                self.update_streaming_content({"type": "token", "content": "".join(pending_tokens)})
+                pending_tokens = []
+            self.update_streaming_content(stream_data)
+        if pending_tokens:
+            self.update_streaming_content({"type": "token", "content": "".join(pending_tokens)})
+
+    def render_stats(self) -> Dict[str, Any]:
+        """Frames rendered and the number of updates each frame had to render."""
+        depths = list(self.queue_depths)
+        return {
+            "render_frames": self.render_frames,
+            "mean_queue_depth": sum(depths) / len(depths) if depths else 0.0,
+            "max_queue_depth": self.max_queue_depth,
+        }
+
     def update_streaming_content(self, stream_data: Dict[str, Any]):
         """Update the streaming widget with native API streaming content."""
         if not self.streaming_frame or not self.streaming_active:
@@ -382,9 +465,7 @@ class StreamingWidget:
                     self.accumulated_text += content
                     self.text_widget.insert(tk.END, content)
                     self.text_widget.see(tk.END)
-                    # Force the UI to update to show the token immediately
-                    self.streaming_frame.update_idletasks()
-                    
+
             elif data_type == "final":
                 # Display final content if this is the first final message
                 if not self.first_token_received:
@@ -395,18 +476,19 @@ class StreamingWidget:
                     self.accumulated_text += content
                     self.text_widget.insert(tk.END, content)
                     self.text_widget.see(tk.END)
-                    # Force the UI to update
-                    self.streaming_frame.update_idletasks()
 
                 # Mark streaming as complete
+                self.auto_pasted = stream_data.get("pasted", False)
                 if self.confidence_indicator:
                     self.confidence_indicator.configure(
-                        text="● Complete",
+                        text="● Typed" if self.auto_pasted else "● Complete",
                         text_color="#4CAF50"
                     )
                 self.is_streaming = False
                 
             elif data_type == "error":
+                # Sentences typed before the stream failed must not be pasted again on close
+                self.auto_pasted = stream_data.get("pasted", False)
                 if self.confidence_indicator:
                     self.confidence_indicator.configure(
                         text="● Error", 
@@ -490,7 +572,7 @@ class StreamingWidget:
     
     def paste_and_close(self):
         """Paste the accumulated text and close the widget."""
-        if self.accumulated_text and self.streaming_active:
+        if self.accumulated_text and self.streaming_active and not self.auto_pasted:
             try:
                 import pyperclip
                 import pyautogui